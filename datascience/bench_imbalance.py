@@ -0,0 +1,82 @@
+"""Side-by-side cost and quality of the imbalance strategies.
+
+    python bench_imbalance.py               # the Kaggle CSV as is
+    python bench_imbalance.py --copies 10   # the CSV 10x, for cost at scale
+
+Each strategy (SMOTE oversampling, class weights / scale_pos_weight, or
+nothing) runs in a fresh interpreter: split, scale, resample if asked,
+then fit all candidates. Reported per model: the time to prepare the
+training matrix (SMOTE's k-NN included), fit time, ROC AUC / AP on the
+same held-out split, and the run's peak RSS above its post-import
+baseline (one figure per strategy, covering all the models). With
+--copies the held-out rows repeat training rows, so compare quality at
+--copies 1 and cost at larger sizes.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import pandas as pd
+
+from bench_loading import replicate
+from churn_pipeline import DATA_PATH
+from churn_training import IMBALANCE
+
+CHILD = """
+import json, resource, sys, time
+from churn_training import imbalance_params, prepare_data, train_candidates
+# imported up front so the baseline covers the libraries, not the data
+from imblearn.over_sampling import SMOTE
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from xgboost import XGBClassifier
+path, imbalance, cores = sys.argv[1], sys.argv[2], int(sys.argv[3])
+before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+start = time.perf_counter()
+X_train, y_train, X_test, y_test, pipeline = prepare_data(imbalance=imbalance, path=path)
+prepare = time.perf_counter() - start
+models, results = train_candidates(X_train, y_train, X_test, y_test, cores=cores, executor="thread",
+                                   params=imbalance_params(imbalance, y_train))
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+results['prepare_s'] = prepare
+results['train_rows'] = len(X_train)
+results['peak_mb'] = (peak - before) / 1024
+print(results.reset_index().to_json(orient="records"))
+"""
+
+
+def run(path, imbalance, cores):
+    out = subprocess.run([sys.executable, "-c", CHILD, path, imbalance, str(cores)],
+                         capture_output=True, text=True, check=True)
+    return pd.DataFrame(json.loads(out.stdout.splitlines()[-1])).assign(imbalance=imbalance)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--copies", type=int, default=1, help="times to replicate the Kaggle CSV")
+    parser.add_argument("--strategies", nargs="+", choices=IMBALANCE, default=list(IMBALANCE))
+    parser.add_argument("--cores", type=int, default=os.cpu_count())
+    parser.add_argument("--results", help="also write the table to this CSV")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = DATA_PATH
+        if args.copies > 1:
+            path = os.path.join(tmp, "telco.csv")
+            replicate(DATA_PATH, args.copies, path)
+        table = pd.concat([run(path, imbalance, args.cores) for imbalance in args.strategies])
+
+    table = table.set_index(['model', 'imbalance']).sort_index()[
+        ['train_rows', 'prepare_s', 'fit_s', 'peak_mb', 'roc_auc', 'ap']]
+    with pd.option_context('display.width', 160, 'display.max_columns', None,
+                           'display.float_format', '{:.3f}'.format):
+        print(table)
+    if args.results:
+        table.to_csv(args.results)
+
+
+if __name__ == "__main__":
+    main()
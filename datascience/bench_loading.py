@@ -0,0 +1,109 @@
+"""Peak memory and time of loading the churn data, old way vs typed.
+
+    python bench_loading.py                 # the Kaggle CSV replicated 10x
+    python bench_loading.py --copies 50
+
+Each case runs in a fresh interpreter, from the CSV to SMOTE'd training
+arrays: "inferred" is what telecomePredictor.py used to do (read_csv with
+inferred object columns, to_numeric, LabelEncoder column by column, drop,
+split, StandardScaler, SMOTE); "typed" is churn_training.prepare_data's
+path through read_customers/load_arrays, without and then with the
+feature cache. Peak RSS is reported above the interpreter's RSS after
+imports, so it is the loading itself.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from churn_pipeline import DATA_PATH
+
+SETUP = """
+import json, resource, sys, time
+import numpy as np, pandas as pd
+from imblearn.over_sampling import SMOTE
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import LabelEncoder, StandardScaler
+import churn_pipeline
+from churn_pipeline import CAT_COLS, NUM_COLS
+path, cache_dir = sys.argv[1], sys.argv[2]
+before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+start = time.perf_counter()
+"""
+
+INFERRED = """
+df = pd.read_csv(path)
+df['TotalCharges'] = pd.to_numeric(df['TotalCharges'], errors='coerce')
+df['TotalCharges'] = df['TotalCharges'].fillna(df['TotalCharges'].median())
+le = LabelEncoder()
+df[CAT_COLS] = df[CAT_COLS].apply(le.fit_transform)
+df = df.drop('customerID', axis=1)
+df['Churn'] = df['Churn'].map({'Yes': 1, 'No': 0})
+X = df.drop('Churn', axis=1)
+y = df['Churn']
+X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+scaler = StandardScaler()
+X_train[NUM_COLS] = scaler.fit_transform(X_train[NUM_COLS])
+X_test[NUM_COLS] = scaler.transform(X_test[NUM_COLS])
+X_train, y_train = SMOTE(random_state=42).fit_resample(X_train, y_train)
+X_train = np.asarray(X_train)
+"""
+
+TYPED = """
+X, y, pipeline = churn_pipeline.load_arrays(path, cache_dir)
+X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+del X
+pipeline.fit_scaler(X_train)
+pipeline.scale_array(X_train)
+pipeline.scale_array(X_test)
+X_train, y_train = SMOTE(random_state=42).fit_resample(X_train, y_train)
+"""
+
+REPORT = """
+seconds = time.perf_counter() - start
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({'seconds': seconds, 'baseline_mb': before / 1024, 'peak_mb': (peak - before) / 1024,
+                  'rows': len(X_train), 'dtype': str(X_train.dtype), 'mb': X_train.nbytes / 2**20,
+                  'contiguous': bool(X_train.flags['C_CONTIGUOUS'])}))
+"""
+
+
+def run(body, path, cache_dir):
+    out = subprocess.run([sys.executable, "-c", SETUP + body + REPORT, path, cache_dir],
+                         capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.splitlines()[-1])
+
+
+def replicate(source, copies, target):
+    with open(source) as f:
+        header, *rows = f.read().splitlines(keepends=True)
+    with open(target, "w") as f:
+        f.write(header)
+        for _ in range(copies):
+            f.writelines(rows)
+    return len(rows) * copies
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--copies", type=int, default=10, help="times to replicate the Kaggle CSV")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "telco.csv")
+        rows = replicate(DATA_PATH, args.copies, path)
+        print(f"{rows:,} rows, {os.path.getsize(path) / 2**20:.1f} MB CSV "
+              f"(interpreter baseline after imports ~{run('X_train = np.zeros((1, 1))', path, tmp)['baseline_mb']:.0f} MB)")
+        cache_dir = os.path.join(tmp, "cache")
+        cases = [("inferred dtypes", INFERRED), ("typed", TYPED), ("typed, feature cache hit", TYPED)]
+        print(f"{'path':26} {'peak RSS':>9} {'time':>7}  training matrix")
+        for label, body in cases:
+            r = run(body, path, cache_dir)
+            print(f"{label:26} {r['peak_mb']:6.0f} MB {r['seconds']:6.2f}s  {r['rows']:,} x {r['dtype']}, "
+                  f"{r['mb']:.1f} MB, {'C-contiguous' if r['contiguous'] else 'not contiguous'}")
+
+
+if __name__ == "__main__":
+    main()
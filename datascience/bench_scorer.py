@@ -0,0 +1,115 @@
+"""Rows/sec of ChurnScorer against the old per-call predict_churn.
+
+    python bench_scorer.py                  # uses best_churn_model.pkl + churn_pipeline.pkl
+    python bench_scorer.py --train          # fit a quick XGBoost first if they are missing
+
+Times single-row calls and a 10k-row batch (as a DataFrame and as a list
+of dicts), checks the scorer agrees with model.predict_proba on the
+training-time preprocessing, and times the old function, which reloaded
+the model and refitted a LabelEncoder on every call.
+"""
+import argparse
+import os
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import LabelEncoder
+
+from churn_pipeline import CAT_COLS, NUM_COLS, DATA_PATH, MODEL_PATH, PIPELINE_PATH, load_arrays
+from churn_scorer import ChurnScorer
+
+
+def train_quick_model(model_path, pipeline_path):
+    from sklearn.model_selection import train_test_split
+    from xgboost import XGBClassifier
+
+    X, y, pipeline = load_arrays()
+    X_train, _, y_train, _ = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+    pipeline.fit_scaler(X_train)
+    model = XGBClassifier(random_state=42, eval_metric='logloss')
+    model.fit(pipeline.scale_array(X_train), y_train)
+    joblib.dump(model, model_path)
+    pipeline.save(pipeline_path)
+
+
+def legacy_predict_churn(customer_data, pipeline, model_path):
+    """predict_churn as it was: reload, one-row frame, LabelEncoder refit per call."""
+    model = joblib.load(model_path)
+    customer_df = pd.DataFrame([customer_data])
+    le = LabelEncoder()
+    customer_df[CAT_COLS] = customer_df[CAT_COLS].apply(le.fit_transform)
+    customer_df[NUM_COLS] = (customer_df[NUM_COLS] - pipeline.mean) / pipeline.scale
+    if not hasattr(model, "feature_names_in_"):
+        customer_df = customer_df.to_numpy(dtype=float)
+    prediction = model.predict(customer_df)
+    probability = model.predict_proba(customer_df)[0][1]
+    return {'Will Churn': 'Yes' if prediction[0] == 1 else 'No', 'Probability': f"{probability:.2%}"}
+
+
+def rate(fn, rows, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return rows / best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--pipeline", default=PIPELINE_PATH)
+    parser.add_argument("--train", action="store_true", help="fit a quick model if none is saved")
+    parser.add_argument("--batch", type=int, default=10_000)
+    parser.add_argument("--single", type=int, default=500, help="single-row calls to time")
+    parser.add_argument("--legacy", type=int, default=50, help="calls of the old function to time")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    if args.train and not (os.path.exists(args.model) and os.path.exists(args.pipeline)):
+        print("Training a quick XGBoost model...")
+        train_quick_model(args.model, args.pipeline)
+
+    start = time.perf_counter()
+    scorer = ChurnScorer(args.model, args.pipeline)
+    print(f"ChurnScorer loaded in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    raw = pd.read_csv(DATA_PATH)
+    batch = raw.sample(args.batch, replace=True, random_state=0).reset_index(drop=True)
+    # numeric TotalCharges, as predict_churn callers pass it
+    batch['TotalCharges'] = pd.to_numeric(batch['TotalCharges'], errors='coerce').fillna(
+        scorer.pipeline.total_charges_median)
+    records = batch[scorer.features].to_dict("records")
+    singles = records[:args.single]
+
+    features = scorer.pipeline.transform(batch)
+    if not hasattr(scorer.model, "feature_names_in_"):
+        features = features.to_numpy()  # fitted on load_arrays() matrices
+    expected = scorer.model.predict_proba(features)[:, 1]
+    got = scorer.predict_proba(batch)
+    print(f"max |scorer - model.predict_proba| over {len(batch):,} rows: {np.abs(got - expected).max():.2e}, "
+          f"labels agree on {np.mean((got > 0.5) == (expected > 0.5)):.2%}")
+
+    sample = singles[:args.legacy]
+    wrong = sum(legacy_predict_churn(r, scorer.pipeline, args.model) != scorer.score_one(r) for r in sample)
+    print(f"old predict_churn differs from the trained encoding on {wrong} of {len(sample)} rows")
+
+    results = [
+        ("old predict_churn, 1 row/call",
+         rate(lambda: [legacy_predict_churn(r, scorer.pipeline, args.model) for r in sample], len(sample), 1)),
+        ("ChurnScorer.score_one, 1 row/call",
+         rate(lambda: [scorer.score_one(r) for r in singles], len(singles), args.repeat)),
+        (f"ChurnScorer, {len(batch):,}-row DataFrame",
+         rate(lambda: scorer.predict_proba(batch), len(batch), args.repeat)),
+        (f"ChurnScorer, {len(records):,} dicts",
+         rate(lambda: scorer.predict_proba(records), len(records), args.repeat)),
+    ]
+    baseline = results[0][1]
+    for label, rows_per_sec in results:
+        print(f"{label:38} {rows_per_sec:12,.0f} rows/s  x{rows_per_sec / baseline:,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Cold-start time of the churn scoring path, each case in a fresh interpreter.
+
+    python bench_startup.py             # needs a trained model (python -m churn train)
+    python bench_startup.py --runs 10
+
+For each case, times the imports and the first predict_churn() call, and
+lists which heavy libraries ended up loaded.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from churn_compiled import compiled_path
+from churn_pipeline import MODEL_PATH
+from telecomePredictor import EXAMPLE_CUSTOMER
+
+HEAVY = ("sklearn", "xgboost", "imblearn", "matplotlib", "seaborn", "scipy")
+
+CASES = {
+    "import churn": ("import churn", ""),
+    "telecomePredictor.predict_churn": ("from telecomePredictor import predict_churn",
+                                        "predict_churn(CUSTOMER)"),
+    "churn.predict_churn, compiled model": ("from churn import predict_churn", "predict_churn(CUSTOMER)"),
+    "ChurnScorer on the pickle": ("from churn_scorer import ChurnScorer",
+                                  "ChurnScorer().score_one(CUSTOMER)"),
+}
+
+CHILD = """
+import json, sys, time
+start = time.perf_counter()
+{imports}
+imported = time.perf_counter()
+CUSTOMER = json.loads({customer!r})
+first = time.perf_counter()
+{call}
+done = time.perf_counter()
+print(json.dumps({{'import': imported - start, 'first': done - first, 'total': imported - start + done - first,
+                  'heavy': [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def run(imports, call):
+    code = CHILD.format(imports=imports, call=call, heavy=HEAVY, customer=json.dumps(EXAMPLE_CUSTOMER))
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args(argv)
+    if not os.path.exists(compiled_path(MODEL_PATH)):
+        print(f"No {compiled_path(MODEL_PATH)}: run `python -m churn train` first")
+        return
+
+    print(f"{'case':38} {'import':>8} {'1st call':>9} {'total':>8}  heavy modules loaded")
+    for label, (imports, call) in CASES.items():
+        runs = [run(imports, call) for _ in range(args.runs)]
+        median = {key: statistics.median(r[key] for r in runs) for key in ("import", "first", "total")}
+        print(f"{label:38} {median['import'] * 1000:6.0f}ms {median['first'] * 1000:7.0f}ms "
+              f"{median['total'] * 1000:6.0f}ms  {', '.join(runs[-1]['heavy']) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
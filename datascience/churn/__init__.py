@@ -0,0 +1,33 @@
+"""Telco churn model: train, evaluate and score.
+
+    python -m churn train [--cores N] [--metric ap] [--imbalance weight] [--params tuned_params.json]
+                          [--plots plots/]
+    python -m churn evaluate [--plots plots/]
+    python -m churn predict customers.json
+
+    from churn import predict_churn     # nothing heavy is imported until needed
+
+Run from datascience/, next to the churn_* modules this package builds on.
+Importing the package is cheap: train, evaluate and predict_churn are
+loaded on first use, and only training and evaluation pull in
+scikit-learn, imblearn and xgboost. Plotting is optional and writes PNGs
+with matplotlib's Agg backend instead of opening windows.
+"""
+import importlib
+
+_LAZY = {
+    'train': 'churn.training',
+    'evaluate': 'churn.evaluation',
+    'predict_churn': 'churn.prediction',
+    'load_scorer': 'churn.prediction',
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module 'churn' has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY[name]), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,55 @@
+import argparse
+import json
+import os
+import sys
+
+from churn_pipeline import MODEL_PATH, PIPELINE_PATH
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m churn", description="Train, evaluate or score the churn model.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    train = commands.add_parser("train", help="fit the candidates and save the best")
+    train.add_argument("--cores", type=int, default=os.cpu_count(), help="total thread budget")
+    train.add_argument("--metric", choices=("roc_auc", "ap"), default="roc_auc", help="how to pick the best")
+    train.add_argument("--imbalance", choices=("smote", "weight", "none"), default="smote",
+                       help="oversample with SMOTE, reweight the classes, or neither")
+    train.add_argument("--params", help="per-model parameters from churn_tuning.py")
+    train.add_argument("--plots", metavar="DIR", help="save feature importance to DIR (needs matplotlib)")
+
+    evaluate = commands.add_parser("evaluate", help="score the saved model on the held-out split")
+    evaluate.add_argument("--plots", metavar="DIR", help="save churn distribution and ROC/PR curves to DIR")
+
+    predict = commands.add_parser("predict", help="score customers from a JSON object or list")
+    predict.add_argument("input", nargs="?", default="-", help="JSON file, or - for stdin")
+
+    for command in (train, evaluate, predict):
+        command.add_argument("--model", default=MODEL_PATH)
+        command.add_argument("--pipeline", default=PIPELINE_PATH)
+    args = parser.parse_args(argv)
+
+    if args.command == "train":
+        from churn.training import train
+        params = None
+        if args.params:
+            with open(args.params) as f:
+                params = json.load(f)
+        train(args.cores, args.metric, plots_dir=args.plots, model_path=args.model, pipeline_path=args.pipeline,
+              params=params, imbalance=args.imbalance)
+    elif args.command == "evaluate":
+        from churn.evaluation import evaluate
+        evaluate(args.model, args.pipeline, plots_dir=args.plots)
+    else:
+        from churn.prediction import load_scorer
+        with (sys.stdin if args.input == "-" else open(args.input)) as f:
+            customers = json.load(f)
+        if isinstance(customers, dict):
+            customers = [customers]
+        scorer = load_scorer(args.model, args.pipeline)
+        for customer in customers:
+            print(json.dumps({'customerID': customer.get('customerID'), **scorer.score_one(customer)}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""Evaluation entry point: score the saved model on the held-out split."""
+from sklearn.metrics import (average_precision_score, classification_report, confusion_matrix,
+                             roc_auc_score)
+from sklearn.model_selection import train_test_split
+
+from churn_pipeline import MODEL_PATH, PIPELINE_PATH, load_arrays
+from churn_scorer import ChurnScorer
+
+
+def evaluate(model_path=MODEL_PATH, pipeline_path=PIPELINE_PATH, test_size=0.2, random_state=42,
+             plots_dir=None):
+    """Print the classification report, ROC AUC, AP and confusion matrix of
+    the saved model on the split train() held out; returns the metrics."""
+    X, y, _ = load_arrays()
+    _, X_test, _, y_test = train_test_split(X, y, test_size=test_size, random_state=random_state,
+                                            stratify=y)
+    scorer = ChurnScorer(model_path, pipeline_path)
+    y_pred, probability = scorer.predict(X_test)
+
+    metrics = {
+        'roc_auc': roc_auc_score(y_test, probability),
+        'ap': average_precision_score(y_test, probability),
+    }
+    print(f"Model: {type(scorer.model).__name__}")
+    print(f"ROC AUC: {metrics['roc_auc']:.3f}")
+    print(f"Average Precision: {metrics['ap']:.3f}")
+    print("\nClassification Report:")
+    print(classification_report(y_test, y_pred))
+    print("Confusion Matrix:")
+    print(confusion_matrix(y_test, y_pred))
+
+    if plots_dir:
+        from churn import plots
+        print(f"Saved {plots.churn_distribution(y, plots_dir)}")
+        print(f"Saved {plots.roc_pr_curves(y_test, probability, plots_dir, type(scorer.model).__name__)}")
+    return metrics
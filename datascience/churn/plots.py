@@ -0,0 +1,70 @@
+"""Optional, headless plots: each function saves a PNG and returns its path.
+
+matplotlib is imported on the first call, with the Agg backend, so
+nothing here needs a display and the rest of the package does not need
+matplotlib at all.
+"""
+import os
+
+
+def available():
+    try:
+        import matplotlib  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _pyplot():
+    try:
+        import matplotlib
+    except ImportError:
+        raise ImportError("Plots need matplotlib: pip install matplotlib") from None
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def _save(plt, fig, out_dir, name):
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, name)
+    fig.tight_layout()
+    fig.savefig(path)
+    plt.close(fig)
+    return path
+
+
+def churn_distribution(y, out_dir):
+    plt = _pyplot()
+    fig, ax = plt.subplots(figsize=(8, 5))
+    import pandas as pd
+
+    counts = pd.Series(y).map({1: 'Yes', 0: 'No'}).value_counts()
+    ax.bar(counts.index, counts.to_numpy())
+    ax.set_title("Customer Churn Distribution")
+    return _save(plt, fig, out_dir, "churn_distribution.png")
+
+
+def feature_importance(model, features, out_dir, top=10, title="Random Forest"):
+    plt = _pyplot()
+    importance = sorted(zip(model.feature_importances_, features), reverse=True)[:top]
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ax.barh([f for _, f in importance][::-1], [v for v, _ in importance][::-1])
+    ax.set_xlabel("Importance")
+    ax.set_title(f"Top {top} Important Features ({title})")
+    return _save(plt, fig, out_dir, "feature_importance.png")
+
+
+def roc_pr_curves(y_true, probability, out_dir, title=""):
+    from sklearn.metrics import precision_recall_curve, roc_curve
+
+    plt = _pyplot()
+    fig, (roc, pr) = plt.subplots(1, 2, figsize=(12, 5))
+    fpr, tpr, _ = roc_curve(y_true, probability)
+    roc.plot(fpr, tpr)
+    roc.plot([0, 1], [0, 1], linestyle="--", color="grey")
+    roc.set(xlabel="False positive rate", ylabel="True positive rate", title=f"ROC {title}".strip())
+    precision, recall, _ = precision_recall_curve(y_true, probability)
+    pr.plot(recall, precision)
+    pr.set(xlabel="Recall", ylabel="Precision", title=f"Precision-recall {title}".strip())
+    return _save(plt, fig, out_dir, "roc_pr.png")
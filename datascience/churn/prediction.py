@@ -0,0 +1,19 @@
+"""Scoring entry point; imports numpy, pandas and joblib, and xgboost or
+scikit-learn only when the saved model has no compiled copy."""
+from churn_pipeline import MODEL_PATH, PIPELINE_PATH
+from churn_scorer import ChurnScorer
+
+_scorer = None
+
+
+def load_scorer(model_path=MODEL_PATH, pipeline_path=PIPELINE_PATH):
+    """The shared scorer, loaded on first use."""
+    global _scorer
+    if _scorer is None:
+        _scorer = ChurnScorer.load(model_path, pipeline_path)
+    return _scorer
+
+
+def predict_churn(customer_data):
+    """Predict churn for new customer data"""
+    return load_scorer().score_one(customer_data)
@@ -0,0 +1,30 @@
+"""Training entry point: fit the candidates, save the best and its preprocessing."""
+import pandas as pd
+
+from churn_pipeline import MODEL_PATH, PIPELINE_PATH
+from churn_training import imbalance_params, prepare_data, save_best, train_candidates
+
+
+def train(cores=None, metric="roc_auc", executor="process", plots_dir=None,
+          model_path=MODEL_PATH, pipeline_path=PIPELINE_PATH, params=None, imbalance="smote"):
+    """Fit every candidate, print the results table and save the best one;
+    returns (best name, results). params: per-model overrides from churn_tuning;
+    imbalance: "smote", "weight" or "none" (see churn_training.imbalance_params)."""
+    X_train, y_train, X_test, y_test, pipeline = prepare_data(imbalance=imbalance)
+    print(f"Training class distribution ({imbalance}):")
+    print(pd.Series(y_train).value_counts())
+
+    models, results = train_candidates(X_train, y_train, X_test, y_test, cores=cores, executor=executor,
+                                       params=imbalance_params(imbalance, y_train, params))
+    with pd.option_context('display.width', 160, 'display.max_columns', None,
+                           'display.float_format', '{:.3f}'.format):
+        print(results.sort_values(metric, ascending=False))
+
+    best = save_best(models, results, pipeline, metric, model_path, pipeline_path)
+    print(f"\nBest by {metric}: {best} ({results.loc[best, metric]:.3f})")
+    print(f"Model saved as '{model_path}', preprocessing as '{pipeline_path}'")
+
+    if plots_dir and "Random Forest" in models:
+        from churn import plots
+        print(f"Saved {plots.feature_importance(models['Random Forest'], pipeline.feature_names, plots_dir)}")
+    return best, results
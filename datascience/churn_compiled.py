@@ -0,0 +1,173 @@
+"""Numpy-only copies of the fitted churn models, for fast startup.
+
+Unpickling an XGBClassifier or a scikit-learn model imports xgboost and
+scikit-learn, which takes over a second before the first prediction.
+compile_model() copies what predict_proba needs (coefficients, or the
+nodes of every tree) into plain arrays saved as a .npz next to the
+pickle; CompiledModel scores with numpy alone and gives the same
+probabilities.
+
+    compile_model(model, source=file_hash(MODEL_PATH)).save(compiled_path(MODEL_PATH))
+    CompiledModel.load(compiled_path(MODEL_PATH)).proba(X)
+"""
+import json
+import os
+
+import numpy as np
+
+
+def compiled_path(model_path):
+    return os.path.splitext(model_path)[0] + ".npz"
+
+
+def _sigmoid(margin):
+    return 1.0 / (1.0 + np.exp(-margin))
+
+
+class CompiledModel:
+    """Linear or tree-ensemble binary classifier held as numpy arrays.
+
+    Trees are stored as one flat node table (feature, threshold, left,
+    right, value, default_left for NaN; left is -1 at a leaf) with a
+    root index per tree, so every row walks every tree at once, one level
+    per step.
+    """
+
+    BLOCK = 10_000  # rows per pass through the trees
+
+    def __init__(self, kind, arrays, source=""):
+        if kind not in ("linear", "xgboost", "forest"):
+            raise ValueError(f"Unknown compiled model kind: {kind!r}")
+        self.kind = kind
+        self.arrays = arrays
+        self.source = source
+
+    def _leaves(self, X):
+        a = self.arrays
+        node = np.repeat(a['roots'][None, :], len(X), axis=0)
+        rows = np.arange(len(X))[:, None]
+        while True:
+            left = a['left'][node]
+            inner = left >= 0
+            if not inner.any():
+                return node
+            x = X[rows, a['feature'][node]]
+            threshold = a['threshold'][node]
+            # a missing value takes the branch the model learnt for it
+            if self.kind == "xgboost":
+                go_left = (x < threshold) | (np.isnan(x) & a['default_left'][node])
+            else:
+                go_left = (x <= threshold) | (np.isnan(x) & a['default_left'][node])
+            node = np.where(inner, np.where(go_left, left, a['right'][node]), node)
+
+    def proba(self, X):
+        """Churn probability per row of model-ready features."""
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X[None, :]
+        if self.kind == "linear":
+            return _sigmoid(X.astype(np.float64) @ self.arrays['coef'] + self.arrays['intercept'])
+        out = np.empty(len(X))
+        for start in range(0, len(X), self.BLOCK):
+            values = self.arrays['value'][self._leaves(X[start:start + self.BLOCK])]
+            if self.kind == "xgboost":
+                out[start:start + self.BLOCK] = _sigmoid(values.sum(axis=1) + self.arrays['base_margin'])
+            else:
+                out[start:start + self.BLOCK] = values.mean(axis=1)
+        return out
+
+    def predict_proba(self, X):
+        probability = self.proba(X)
+        return np.column_stack([1.0 - probability, probability])
+
+    def save(self, path):
+        np.savez(path, kind=self.kind, source=self.source, **self.arrays)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            arrays = {name: data[name] for name in data.files if name not in ("kind", "source")}
+            source = str(data['source'])
+            if str(data['kind']) != "linear" and 'default_left' not in arrays:
+                source = ""  # saved before forests kept NaN routing: never up to date
+            return cls(str(data['kind']), arrays, source)
+
+
+def _stack_trees(trees):
+    """Concatenate per-tree node arrays into one table with absolute child indices."""
+    roots, offset = [], 0
+    columns = {name: [] for name in trees[0]}
+    for tree in trees:
+        roots.append(offset)
+        for name, values in tree.items():
+            if name in ("left", "right"):
+                values = np.where(values >= 0, values + offset, -1)
+            columns[name].append(values)
+        offset += len(tree['left'])
+    arrays = {name: np.concatenate(values) for name, values in columns.items()}
+    arrays['roots'] = np.array(roots, dtype=np.int64)
+    return arrays
+
+
+def _compile_xgboost(model):
+    learner = json.loads(model.get_booster().save_raw("json"))['learner']
+    if learner['objective']['name'] != "binary:logistic":
+        raise TypeError(f"Unsupported XGBoost objective: {learner['objective']['name']}")
+    trees = []
+    for tree in learner['gradient_booster']['model']['trees']:
+        if any(tree['split_type']):
+            raise TypeError("Categorical XGBoost splits are not supported")
+        left = np.array(tree['left_children'], dtype=np.int64)
+        conditions = np.array(tree['split_conditions'], dtype=np.float32)
+        trees.append({
+            'left': left,
+            'right': np.array(tree['right_children'], dtype=np.int64),
+            'feature': np.where(left >= 0, tree['split_indices'], 0).astype(np.int64),
+            'threshold': conditions.astype(np.float64),
+            'value': np.where(left >= 0, 0.0, conditions).astype(np.float64),  # leaves hold their weight
+            'default_left': np.array(tree['default_left'], dtype=bool),
+        })
+    arrays = _stack_trees(trees)
+    base_score = float(learner['learner_model_param']['base_score'].strip("[]"))
+    arrays['base_margin'] = np.array(np.log(base_score / (1.0 - base_score)))
+    return CompiledModel("xgboost", arrays)
+
+
+def _compile_forest(model):
+    trees = []
+    for estimator in model.estimators_:
+        tree = estimator.tree_
+        if not hasattr(tree, "missing_go_to_left"):
+            # scikit-learn < 1.3 keeps no NaN routing to copy
+            raise TypeError("Compiling a forest needs scikit-learn 1.3 or later")
+        left = tree.children_left.astype(np.int64)
+        counts = tree.value[:, 0, :]
+        trees.append({
+            'left': left,
+            'right': tree.children_right.astype(np.int64),
+            'feature': np.where(left >= 0, tree.feature, 0).astype(np.int64),
+            'threshold': tree.threshold.astype(np.float64),
+            'value': counts[:, 1] / counts.sum(axis=1),
+            'default_left': tree.missing_go_to_left.astype(bool),
+        })
+    return CompiledModel("forest", _stack_trees(trees))
+
+
+def compile_model(model, source=""):
+    """CompiledModel for a fitted LogisticRegression, RandomForestClassifier
+    or XGBClassifier; TypeError for anything else."""
+    if hasattr(model, "get_booster"):
+        compiled = _compile_xgboost(model)
+    elif hasattr(model, "estimators_") and hasattr(model.estimators_[0], "tree_"):
+        compiled = _compile_forest(model)
+    elif hasattr(model, "coef_") and np.shape(model.coef_)[0] == 1:
+        compiled = CompiledModel("linear", {
+            'coef': np.asarray(model.coef_[0], dtype=np.float64),
+            'intercept': np.array(float(model.intercept_[0])),
+        })
+    else:
+        raise TypeError(f"Can't compile a {type(model).__name__}")
+    if list(getattr(model, "classes_", [0, 1])) != [0, 1]:
+        raise TypeError("Expected classes [0, 1]")
+    compiled.source = source
+    return compiled
@@ -0,0 +1,240 @@
+"""Fitted preprocessing for the churn model, plus an on-disk feature cache.
+
+ChurnPreprocessor does what telecomePredictor.py used to do inline:
+TotalCharges cleaning, label-encoding cat_cols and scaling num_cols. It
+is fitted once and saved next to best_churn_model.pkl, so scoring uses
+the same encodings the model was trained on. Categories are encoded by
+their sorted position, exactly like LabelEncoder, so existing model
+files keep working.
+
+read_customers() reads a CSV with an explicit schema: category dtypes on
+the fixed CATEGORIES lists, int8/int16/float32 numerics and TotalCharges
+parsed as it is read. load_arrays() turns that into one C-contiguous
+float32 feature matrix and an int8 target, ready for XGBoost and
+scikit-learn without conversion copies, and caches both as .npy files
+keyed by the CSV's hash and the preprocessing parameters; a re-run on the
+same file skips parsing and encoding.
+"""
+import hashlib
+import json
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DATA_PATH = os.path.join(HERE, "WA_Fn-UseC_-Telco-Customer-Churn.csv")
+MODEL_PATH = "best_churn_model.pkl"
+PIPELINE_PATH = "churn_pipeline.pkl"
+CACHE_DIR = os.path.join(HERE, ".feature_cache")
+
+CAT_COLS = ['gender', 'Partner', 'Dependents', 'PhoneService', 'MultipleLines',
+            'InternetService', 'OnlineSecurity', 'OnlineBackup', 'DeviceProtection',
+            'TechSupport', 'StreamingTV', 'StreamingMovies', 'Contract',
+            'PaperlessBilling', 'PaymentMethod']
+NUM_COLS = ['tenure', 'MonthlyCharges', 'TotalCharges']
+ID_COL = 'customerID'
+TARGET = 'Churn'
+
+# every value the Telco data uses, sorted so codes match LabelEncoder's
+CATEGORIES = {
+    'gender': ['Female', 'Male'],
+    'Partner': ['No', 'Yes'],
+    'Dependents': ['No', 'Yes'],
+    'PhoneService': ['No', 'Yes'],
+    'MultipleLines': ['No', 'No phone service', 'Yes'],
+    'InternetService': ['DSL', 'Fiber optic', 'No'],
+    'OnlineSecurity': ['No', 'No internet service', 'Yes'],
+    'OnlineBackup': ['No', 'No internet service', 'Yes'],
+    'DeviceProtection': ['No', 'No internet service', 'Yes'],
+    'TechSupport': ['No', 'No internet service', 'Yes'],
+    'StreamingTV': ['No', 'No internet service', 'Yes'],
+    'StreamingMovies': ['No', 'No internet service', 'Yes'],
+    'Contract': ['Month-to-month', 'One year', 'Two year'],
+    'PaperlessBilling': ['No', 'Yes'],
+    'PaymentMethod': ['Bank transfer (automatic)', 'Credit card (automatic)',
+                      'Electronic check', 'Mailed check'],
+    TARGET: ['No', 'Yes'],
+}
+NUM_DTYPES = {'SeniorCitizen': 'int8', 'tenure': 'int16', 'MonthlyCharges': 'float32',
+              'TotalCharges': 'float32'}
+
+# bump when encode() changes, so old cache entries are not reused
+CACHE_VERSION = 2
+
+
+class ChurnPreprocessor:
+    """Cleans, encodes and scales raw customer rows into model features."""
+
+    def __init__(self, cat_cols=CAT_COLS, num_cols=NUM_COLS):
+        self.cat_cols = list(cat_cols)
+        self.num_cols = list(num_cols)
+        self.feature_names = None
+        self.categories = None
+        self.total_charges_median = None
+        self.mean = None
+        self.scale = None
+
+    def fit(self, df):
+        """Learn the columns, category lists and TotalCharges fill value from
+        the full raw frame. The scaler is fitted separately, on the training
+        split only (fit_scaler)."""
+        self.feature_names = [c for c in df.columns if c not in (ID_COL, TARGET)]
+        self.categories = {col: list(df[col].cat.categories) if isinstance(df[col].dtype, pd.CategoricalDtype)
+                           else sorted(df[col].astype(str).unique()) for col in self.cat_cols}
+        self.total_charges_median = float(pd.to_numeric(df['TotalCharges'], errors='coerce').median())
+        return self
+
+    @property
+    def num_index(self):
+        return [self.feature_names.index(col) for col in self.num_cols]
+
+    def fit_scaler(self, X):
+        """Fit on a training split, as a frame or a load_arrays() matrix."""
+        if isinstance(X, np.ndarray):
+            values = X[:, self.num_index].astype(np.float64)
+        else:
+            values = X[self.num_cols].to_numpy(dtype=float)
+        self.mean = values.mean(axis=0)
+        self.scale = values.std(axis=0)
+        self.scale[self.scale == 0] = 1.0
+        return self
+
+    def _codes(self, column, col):
+        if isinstance(column.dtype, pd.CategoricalDtype) and list(column.cat.categories) == self.categories[col]:
+            codes = column.cat.codes.to_numpy()
+        else:
+            codes = pd.Categorical(column.astype(str), categories=self.categories[col]).codes
+        if (codes < 0).any():
+            unknown = sorted(set(column.astype(str)) - set(self.categories[col]))
+            raise ValueError(f"Unknown {col} value(s): {unknown}")
+        return codes
+
+    def _total_charges(self, column):
+        return pd.to_numeric(column, errors='coerce').fillna(self.total_charges_median)
+
+    def encode(self, df):
+        """Raw rows -> encoded, unscaled features in training column order."""
+        out = df[self.feature_names].copy()
+        out['TotalCharges'] = self._total_charges(out['TotalCharges'])
+        for col in self.cat_cols:
+            out[col] = self._codes(out[col], col)
+        return out
+
+    def encode_array(self, df, dtype=np.float32):
+        """Like encode(), but written column by column straight into one
+        C-contiguous array, without an intermediate frame."""
+        X = np.empty((len(df), len(self.feature_names)), dtype=dtype)
+        for j, col in enumerate(self.feature_names):
+            if col in self.categories:
+                X[:, j] = self._codes(df[col], col)
+            elif col == 'TotalCharges':
+                X[:, j] = self._total_charges(df[col]).to_numpy()
+            else:
+                X[:, j] = df[col].to_numpy()
+        return X
+
+    def scale_numeric(self, X):
+        X = X.copy()
+        X[self.num_cols] = (X[self.num_cols].to_numpy(dtype=float) - self.mean) / self.scale
+        return X
+
+    def scale_array(self, X):
+        """Scale a load_arrays() matrix in place (in float64, stored back as X's dtype)."""
+        index = self.num_index
+        X[:, index] = (X[:, index].astype(np.float64) - self.mean) / self.scale
+        return X
+
+    def transform(self, df):
+        return self.scale_numeric(self.encode(df))
+
+    def params(self):
+        """Everything encode() depends on, for cache keys."""
+        return {
+            'version': CACHE_VERSION,
+            'features': self.feature_names,
+            'categories': self.categories,
+            'total_charges_median': self.total_charges_median,
+        }
+
+    def save(self, path=PIPELINE_PATH):
+        joblib.dump(self, path)
+
+    @classmethod
+    def load(cls, path=PIPELINE_PATH):
+        return joblib.load(path)
+
+
+def file_hash(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _cache_key(data_hash, preprocessor):
+    params = json.dumps(preprocessor.params(), sort_keys=True)
+    return hashlib.sha256((data_hash + params).encode()).hexdigest()[:24]
+
+
+def read_customers(path, with_id=False):
+    """Raw customer CSV read with the fixed schema. Category columns come
+    back on the CATEGORIES lists (codes are the model's codes); a value
+    outside them is an error. The target is included when the file has it."""
+    dtypes = {col: 'category' for col in CATEGORIES}
+    dtypes.update(NUM_DTYPES)
+    df = pd.read_csv(path, dtype=dtypes, usecols=lambda col: with_id or col != ID_COL,
+                     na_values={'TotalCharges': [" ", ""]}, keep_default_na=False)
+    for col, values in CATEGORIES.items():
+        if col not in df:
+            continue
+        unknown = set(df[col].cat.categories) - set(values)
+        if unknown:
+            raise ValueError(f"Unknown {col} value(s): {sorted(unknown)}")
+        df[col] = df[col].cat.set_categories(values)
+    return df
+
+
+def load_arrays(path=DATA_PATH, cache_dir=CACHE_DIR, use_cache=True):
+    """(X, y, preprocessor) for a labelled CSV: X is a C-contiguous float32
+    matrix of encoded, unscaled features, y an int8 array.
+
+    The fitted preprocessor is stored with the cached matrices, so a hit
+    needs neither the CSV parse nor the encoding pass.
+    """
+    data_hash = file_hash(path)
+    index_path = os.path.join(cache_dir, f"{data_hash}.json")
+    if use_cache and os.path.exists(index_path):
+        with open(index_path) as f:
+            key = json.load(f)['key']
+        stem = os.path.join(cache_dir, key)
+        if all(os.path.exists(stem + ext) for ext in (".X.npy", ".y.npy", ".pipeline.pkl")):
+            preprocessor = ChurnPreprocessor.load(stem + ".pipeline.pkl")
+            if _cache_key(data_hash, preprocessor) == key:
+                return np.load(stem + ".X.npy"), np.load(stem + ".y.npy"), preprocessor
+
+    df = read_customers(path)
+    preprocessor = ChurnPreprocessor().fit(df)
+    X = preprocessor.encode_array(df)
+    y = df[TARGET].cat.codes.to_numpy().astype(np.int8)
+    del df
+
+    if use_cache:
+        os.makedirs(cache_dir, exist_ok=True)
+        key = _cache_key(data_hash, preprocessor)
+        stem = os.path.join(cache_dir, key)
+        np.save(stem + ".X.npy", X)
+        np.save(stem + ".y.npy", y)
+        preprocessor.save(stem + ".pipeline.pkl")
+        with open(index_path, "w") as f:
+            json.dump({'key': key, 'source': os.path.basename(path)}, f)
+    return X, y, preprocessor
+
+
+def load_features(path=DATA_PATH, cache_dir=CACHE_DIR, use_cache=True):
+    """load_arrays() as a (DataFrame, Series, preprocessor), for callers
+    that want column names."""
+    X, y, preprocessor = load_arrays(path, cache_dir, use_cache)
+    return pd.DataFrame(X, columns=preprocessor.feature_names), pd.Series(y, name=TARGET), preprocessor
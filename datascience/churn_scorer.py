@@ -0,0 +1,181 @@
+"""Load-once, vectorized churn scoring.
+
+    scorer = ChurnScorer()                      # reads the model and pipeline once
+    scorer.predict_proba(customers_df)          # DataFrame of raw rows
+    scorer.predict_proba([customer, ...])       # list of dicts
+    scorer.score_one(customer)                  # same result as predict_churn()
+    ChurnScorer.load()                          # numpy-only compiled model when there is one
+
+Categories are encoded through lookup tables built from the fitted
+ChurnPreprocessor, and numeric columns are scaled with its saved
+mean/scale, so any batch size takes one pass and one predict_proba call.
+"""
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from churn_compiled import CompiledModel, compiled_path
+from churn_pipeline import MODEL_PATH, PIPELINE_PATH, ChurnPreprocessor, file_hash
+
+
+class ChurnScorer:
+    def __init__(self, model_path=MODEL_PATH, pipeline_path=PIPELINE_PATH, model=None, pipeline=None):
+        self.model = model if model is not None else joblib.load(model_path)
+        self.pipeline = pipeline if pipeline is not None else ChurnPreprocessor.load(pipeline_path)
+        if self.pipeline.mean is None:
+            raise ValueError("The preprocessing pipeline has no fitted scaler")
+
+        self.features = list(self.pipeline.feature_names)
+        self.tables = {col: {value: code for code, value in enumerate(values)}
+                       for col, values in self.pipeline.categories.items()}
+        self.cat_index = [(self.features.index(col), col) for col in self.pipeline.cat_cols]
+        self.num_index = np.array([self.features.index(col) for col in self.pipeline.num_cols])
+        self.total_charges = self.features.index('TotalCharges')
+        self._booster = self.model.get_booster() if hasattr(self.model, "get_booster") else None
+
+    @classmethod
+    def load(cls, model_path=MODEL_PATH, pipeline_path=PIPELINE_PATH):
+        """Scorer on the compiled copy of model_path if it is up to date
+        (no xgboost/scikit-learn import), else on the pickle itself."""
+        path = compiled_path(model_path)
+        if os.path.exists(path):
+            compiled = CompiledModel.load(path)
+            if compiled.source == file_hash(model_path):
+                return cls(model=compiled, pipeline=ChurnPreprocessor.load(pipeline_path))
+        return cls(model_path, pipeline_path)
+
+    def _code(self, col, value):
+        try:
+            return self.tables[col][str(value)]
+        except KeyError:
+            raise ValueError(f"Unknown {col} value: {value!r}") from None
+
+    def _number(self, col, value):
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            number = np.nan
+        if np.isnan(number) and col == 'TotalCharges':
+            # blank TotalCharges for brand new customers, as in the training data
+            return self.pipeline.total_charges_median
+        if not np.isfinite(number):
+            raise ValueError(f"Missing or invalid {col} value: {value!r}")
+        return number
+
+    def _encode_records(self, records):
+        X = np.empty((len(records), len(self.features)))
+        cats = dict(self.cat_index)
+        for i, record in enumerate(records):
+            for j, col in enumerate(self.features):
+                value = record[col]
+                X[i, j] = self._code(col, value) if j in cats else self._number(col, value)
+        return X
+
+    def _same_categories(self, column, col):
+        return (isinstance(column.dtype, pd.CategoricalDtype)
+                and list(column.cat.categories) == self.pipeline.categories[col])
+
+    def read_dtypes(self):
+        """read_csv dtypes for raw customer files; follow with align_categories()
+        and numbers(). Numeric columns are read as text, so one blank or
+        malformed value rejects its row rather than failing the read."""
+        dtypes = {col: 'category' for col in self.pipeline.categories}
+        dtypes.update({col: 'string' for col in self.features if col not in self.tables})
+        dtypes['customerID'] = 'string'
+        return dtypes
+
+    def align_categories(self, df):
+        """Re-point category columns at the training categories in place, so
+        their codes are the model's codes (unknown values become code -1)."""
+        for col, values in self.pipeline.categories.items():
+            df[col] = df[col].cat.set_categories(values)
+        return df
+
+    def numbers(self, df):
+        """Parse the numeric columns of a read_dtypes() frame to float64 in
+        place; returns a mask of the rows whose values are all usable (a
+        blank TotalCharges is, as in training)."""
+        valid = np.ones(len(df), dtype=bool)
+        for col in self.features:
+            if col in self.tables:
+                continue
+            values = pd.to_numeric(df[col], errors='coerce').astype('float64').to_numpy(na_value=np.nan)
+            df[col] = values
+            usable = np.isfinite(values)
+            if col == 'TotalCharges':
+                usable |= np.isnan(values)
+            valid &= usable
+        return valid
+
+    def _encode_frame(self, df):
+        X = np.empty((len(df), len(self.features)))
+        for j, col in enumerate(self.features):
+            column = df[col]
+            if col in self.tables and self._same_categories(column, col):
+                # aligned with the training categories (align_categories): codes are already right
+                codes = column.cat.codes.to_numpy()
+                if (codes < 0).any():
+                    raise ValueError(f"Unknown or missing {col} value(s)")
+                X[:, j] = codes
+            elif col in self.tables:
+                codes = column.astype(str).map(self.tables[col])
+                if codes.isna().any():
+                    unknown = sorted(set(column[codes.isna()].astype(str)))
+                    raise ValueError(f"Unknown {col} value(s): {unknown}")
+                X[:, j] = codes.to_numpy()
+            else:
+                values = pd.to_numeric(column, errors='coerce').astype('float64').to_numpy(na_value=np.nan)
+                if j == self.total_charges:
+                    # blank TotalCharges for brand new customers, as in the training data
+                    values = np.where(np.isnan(values), self.pipeline.total_charges_median, values)
+                bad = ~np.isfinite(values)
+                if bad.any():
+                    raise ValueError(f"Missing or invalid {col} value(s): {sorted(set(column[bad].astype(str)))}")
+                X[:, j] = values
+        return X
+
+    def encode(self, data):
+        """Model-ready float32 features for raw rows.
+
+        `data` is a DataFrame, a dict or list of dicts keyed by column name,
+        or a 2-D array of raw values in `features` order (an array with a
+        numeric dtype is taken as already encoded, just not scaled).
+        """
+        if isinstance(data, pd.DataFrame):
+            X = self._encode_frame(data)
+        elif isinstance(data, dict):
+            X = self._encode_records([data])
+        elif isinstance(data, np.ndarray) and data.dtype != object:
+            X = np.array(data, dtype=np.float64, ndmin=2)
+        elif isinstance(data, np.ndarray):
+            X = self._encode_records([dict(zip(self.features, row)) for row in data])
+        else:
+            X = self._encode_records(list(data))
+        # scale in float64 like training did, then hand the model float32
+        X[:, self.num_index] = (X[:, self.num_index] - self.pipeline.mean) / self.pipeline.scale
+        return X.astype(np.float32)
+
+    def predict_proba(self, data):
+        """Churn probability per row."""
+        X = self.encode(data)
+        if self._booster is not None:
+            return self._booster.inplace_predict(X, validate_features=False)
+        if isinstance(self.model, CompiledModel):
+            return self.model.proba(X)
+        if hasattr(self.model, "feature_names_in_"):
+            X = pd.DataFrame(X, columns=self.features)
+        return self.model.predict_proba(X)[:, 1]
+
+    def predict(self, data, threshold=0.5):
+        """(churn flags, probabilities); the flag matches model.predict at 0.5."""
+        probability = self.predict_proba(data)
+        return (probability > threshold).astype(np.int8), probability
+
+    def score_one(self, customer):
+        probability = float(self.predict_proba(customer)[0])
+        return {
+            'Will Churn': 'Yes' if probability > 0.5 else 'No',
+            'Probability': f"{probability:.2%}"
+        }
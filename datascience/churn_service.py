@@ -0,0 +1,265 @@
+"""Churn scoring over HTTP, with concurrent requests micro-batched.
+
+    python churn_service.py                          # 127.0.0.1:8080
+    python churn_service.py --port 9000 --max-batch 512 --max-wait-ms 2
+
+    POST /score    a customer object or a list of them (training columns)
+                   -> {"scores": [{"customerID", "churn", "probability"}]}
+    GET  /metrics  request/row/batch counts, batch sizes, latency, rows/s
+    GET  /health
+
+The model and encoders are loaded once (ChurnScorer.load). Requests are
+queued; a single batching task takes whatever is waiting, keeps adding
+until --max-batch rows or --max-wait-ms after the first one (a single
+request larger than --max-batch is a batch on its own), and scores the
+lot with one predict_proba call in a worker thread, so the event loop
+keeps accepting requests meanwhile. A request with a bad value only fails
+itself: if the batch does not encode, its requests are scored one by one.
+
+Plain asyncio and HTTP/1.1 with keep-alive; no web framework needed.
+See load_test_service.py for a load generator.
+"""
+import argparse
+import asyncio
+import json
+import time
+from collections import deque
+
+import numpy as np
+
+from churn_pipeline import ID_COL, MODEL_PATH, PIPELINE_PATH
+from churn_scorer import ChurnScorer
+
+MAX_BODY = 8 << 20
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class Metrics:
+    """Counters plus a window of recent latencies and batches."""
+
+    def __init__(self, window=10_000, rate_seconds=10.0):
+        self.started = time.monotonic()
+        self.requests = self.rows = self.batches = self.errors = 0
+        self.latencies = deque(maxlen=window)
+        self.batch_sizes = deque(maxlen=window)
+        self.batch_seconds = deque(maxlen=window)
+        self.recent = deque()  # (finished at, rows) of batches in the last rate_seconds
+        self.rate_seconds = rate_seconds
+
+    def batch(self, rows, seconds):
+        now = time.monotonic()
+        self.batches += 1
+        self.rows += rows
+        self.batch_sizes.append(rows)
+        self.batch_seconds.append(seconds)
+        self.recent.append((now, rows))
+        while self.recent and self.recent[0][0] < now - self.rate_seconds:
+            self.recent.popleft()
+
+    def request(self, seconds, ok=True):
+        self.requests += 1
+        self.errors += not ok
+        self.latencies.append(seconds)
+
+    def snapshot(self):
+        now = time.monotonic()
+        recent = [rows for at, rows in self.recent if at >= now - self.rate_seconds]
+        latencies = np.array(self.latencies) * 1000
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if len(latencies) else (0.0, 0.0, 0.0)
+        return {
+            'uptime_s': round(now - self.started, 1),
+            'requests': self.requests,
+            'errors': self.errors,
+            'rows': self.rows,
+            'batches': self.batches,
+            'mean_batch_rows': round(float(np.mean(self.batch_sizes)), 2) if self.batch_sizes else 0.0,
+            'max_batch_rows': max(self.batch_sizes, default=0),
+            'mean_batch_ms': round(float(np.mean(self.batch_seconds)) * 1000, 3) if self.batch_seconds else 0.0,
+            'latency_ms': {'p50': round(p50, 3), 'p95': round(p95, 3), 'p99': round(p99, 3),
+                           'window': len(latencies)},
+            f'rows_per_s_last_{self.rate_seconds:g}s': round(
+                sum(recent) / max(min(self.rate_seconds, now - self.started), 1e-3), 1),
+        }
+
+
+class MicroBatcher:
+    """Collects requests' rows and scores them in batches."""
+
+    def __init__(self, scorer, metrics, max_batch=256, max_wait=0.005):
+        self.scorer = scorer
+        self.metrics = metrics
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.queue = asyncio.Queue()
+        self.task = None
+
+    def start(self):
+        self.task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+
+    async def score(self, records):
+        """Probabilities for a list of customer dicts; ValueError for bad values."""
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((records, future))
+        return await future
+
+    async def _collect(self):
+        batch = [await self.queue.get()]
+        rows = len(batch[0][0])
+        deadline = time.monotonic() + self.max_wait
+        while rows < self.max_batch:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self.queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            batch.append(item)
+            rows += len(item[0])
+        return batch, rows
+
+    def _predict(self, batch):
+        """Runs in the worker thread: one predict_proba for the whole batch,
+        or per request if some request's values don't encode."""
+        try:
+            probability = self.scorer.predict_proba([r for records, _ in batch for r in records])
+        except (ValueError, KeyError, TypeError):
+            results = []
+            for records, _ in batch:
+                try:
+                    results.append(self.scorer.predict_proba(records))
+                except (ValueError, KeyError, TypeError) as e:
+                    results.append(e if isinstance(e, ValueError) else ValueError(f"Bad customer data: {e}"))
+            return results
+        bounds = np.cumsum([len(records) for records, _ in batch])[:-1]
+        return np.split(probability, bounds)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch, rows = await self._collect()
+            start = time.monotonic()
+            try:
+                results = await loop.run_in_executor(None, self._predict, batch)
+            except Exception as e:  # anything unexpected fails the batch, not the service
+                results = [e] * len(batch)
+            self.metrics.batch(rows, time.monotonic() - start)
+            for (_, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+
+class ChurnService:
+    def __init__(self, scorer, max_batch=256, max_wait=0.005):
+        self.metrics = Metrics()
+        self.batcher = MicroBatcher(scorer, self.metrics, max_batch, max_wait)
+
+    async def _score(self, body):
+        started = time.monotonic()
+        try:
+            data = json.loads(body)
+            records = [data] if isinstance(data, dict) else data
+            if not isinstance(records, list) or not records or not all(isinstance(r, dict) for r in records):
+                raise ValueError("Expected a customer object or a non-empty list of them")
+            probability = await self.batcher.score(records)
+        except ValueError as e:  # json.JSONDecodeError included
+            self.metrics.request(time.monotonic() - started, ok=False)
+            return 400, {'error': str(e)}
+        except Exception as e:
+            self.metrics.request(time.monotonic() - started, ok=False)
+            return 500, {'error': f"{type(e).__name__}: {e}"}
+        scores = [{'customerID': record.get(ID_COL), 'churn': "Yes" if p > 0.5 else "No",
+                   'probability': round(float(p), 6)} for record, p in zip(records, probability)]
+        self.metrics.request(time.monotonic() - started)
+        return 200, {'scores': scores}
+
+    async def route(self, method, path, body):
+        if path == "/score":
+            return await self._score(body) if method == "POST" else (405, {'error': "POST only"})
+        if path == "/metrics":
+            return 200, self.metrics.snapshot()
+        if path == "/health":
+            return 200, {'status': "ok"}
+        return 404, {'error': f"No route for {path}"}
+
+    async def handle(self, reader, writer):
+        """One connection: HTTP/1.1 requests until the client closes or asks to."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, version = request_line.decode("latin-1").split()
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                if length > MAX_BODY:
+                    status, payload = 413, {'error': f"Body over {MAX_BODY} bytes"}
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    status, payload = await self.route(method, path.split("?")[0], body)
+                    keep_alive = (headers.get("connection", "").lower() != "close"
+                                  and version == "HTTP/1.1")
+                data = json.dumps(payload).encode()
+                writer.write(f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                             f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n"
+                             f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ValueError, asyncio.IncompleteReadError, ConnectionError):
+            pass  # malformed request or client went away
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=8080, ready=None):
+        self.batcher.start()
+        server = await asyncio.start_server(self.handle, host, port)
+        if ready is not None:
+            ready(server)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.batcher.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--max-batch", type=int, default=256, help="rows per predict_proba call at most")
+    parser.add_argument("--max-wait-ms", type=float, default=5.0,
+                        help="how long a batch waits for more requests after its first")
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--pipeline", default=PIPELINE_PATH)
+    args = parser.parse_args(argv)
+
+    scorer = ChurnScorer.load(args.model, args.pipeline)
+    service = ChurnService(scorer, args.max_batch, args.max_wait_ms / 1000)
+    ready = lambda server: print(f"Scoring {type(scorer.model).__name__} on http://{args.host}:{args.port} "
+                                 f"(batches of up to {args.max_batch} rows, {args.max_wait_ms:g} ms wait)",
+                                 flush=True)
+    try:
+        asyncio.run(service.serve(args.host, args.port, ready))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
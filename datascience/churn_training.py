@@ -0,0 +1,214 @@
+"""Fit the candidate churn models concurrently and keep the best one.
+
+    python churn_training.py                    # all cores, process pool
+    python churn_training.py --cores 8 --metric ap --results results.csv
+    python churn_training.py --imbalance weight  # class weights instead of SMOTE
+
+Each candidate is fitted in its own worker with a share of the cores
+(n_jobs for the forest, n_jobs/nthread for XGBoost, one for logistic
+regression), and no more workers than cores run at once, so together
+they never ask for more threads than --cores.
+Every model is scored on the same held-out split; the results table has
+ROC AUC, average precision, the confusion matrix and fit/predict times,
+and the best model by --metric is saved with its preprocessing.
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.metrics import average_precision_score, confusion_matrix, roc_auc_score
+from sklearn.model_selection import train_test_split
+
+from churn_compiled import compile_model, compiled_path
+from churn_pipeline import DATA_PATH, MODEL_PATH, PIPELINE_PATH, file_hash, load_arrays
+
+
+def _logistic_regression(threads, **params):
+    from sklearn.linear_model import LogisticRegression
+    return LogisticRegression(**{'max_iter': 1000, **params})
+
+
+def _random_forest(threads, **params):
+    from sklearn.ensemble import RandomForestClassifier
+    return RandomForestClassifier(random_state=42, n_jobs=threads, **params)
+
+
+def _xgboost(threads, **params):
+    from xgboost import XGBClassifier
+    return XGBClassifier(random_state=42, eval_metric='logloss', n_jobs=threads, **params)
+
+
+# name -> (factory taking a thread budget and constructor overrides,
+#          whether it can use more than one thread)
+CANDIDATES = {
+    "Logistic Regression": (_logistic_regression, False),
+    "Random Forest": (_random_forest, True),
+    "XGBoost": (_xgboost, True),
+}
+
+
+def split_cores(names, cores):
+    """Thread budget per model: single-threaded models get 1, the rest share what's left."""
+    budget = {name: 1 for name in names}
+    parallel = [name for name in names if CANDIDATES[name][1]]
+    spare = cores - len(names)
+    for i, name in enumerate(parallel):
+        budget[name] += max(0, spare // len(parallel) + (i < spare % len(parallel)))
+    return budget
+
+
+IMBALANCE = ("smote", "weight", "none")
+
+
+def imbalance_params(imbalance, y_train, tuned=None):
+    """Per-model constructor parameters for an imbalance strategy, merged
+    with tuned ones. "weight" reweights the classes instead of resampling:
+    scikit-learn gets the 'balanced' class weights (spelled out, so they
+    also hold for the forest's warm-start growth in tuning), XGBoost gets
+    scale_pos_weight = negatives/positives. "smote" and "none" add nothing."""
+    params = {name: dict(values) for name, values in (tuned or {}).items()}
+    if imbalance == "weight":
+        positives = int(np.count_nonzero(y_train))
+        negatives = len(y_train) - positives
+        balanced = {0: len(y_train) / (2 * negatives), 1: len(y_train) / (2 * positives)}
+        weights = {
+            "Logistic Regression": {'class_weight': balanced},
+            "Random Forest": {'class_weight': balanced},
+            "XGBoost": {'scale_pos_weight': negatives / positives},
+        }
+        for name, values in weights.items():
+            params[name] = {**values, **params.get(name, {})}
+    return params
+
+
+def prepare_data(test_size=0.2, random_state=42, imbalance="smote", path=DATA_PATH):
+    """(X_train, y_train, X_test, y_test, pipeline), scaled; with imbalance="smote"
+    the training split is oversampled with SMOTE.
+
+    The splits are contiguous float32 arrays (scaled in place), which the
+    models take as they are.
+    """
+    if imbalance not in IMBALANCE:
+        raise ValueError(f"Unknown imbalance strategy: {imbalance!r}")
+    X, y, pipeline = load_arrays(path)
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=test_size, random_state=random_state, stratify=y)
+    del X
+    pipeline.fit_scaler(X_train)
+    pipeline.scale_array(X_train)
+    pipeline.scale_array(X_test)
+    if imbalance == "smote":
+        from imblearn.over_sampling import SMOTE
+        X_train, y_train = SMOTE(random_state=random_state).fit_resample(X_train, y_train)
+    return X_train, y_train, X_test, y_test, pipeline
+
+
+def fit_and_score(name, threads, X_train, y_train, X_test, y_test, params=None):
+    """Fit one candidate and score it; runs in a worker."""
+    factory, _ = CANDIDATES[name]
+    model = factory(threads, **(params or {}))
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    y_prob = model.predict_proba(X_test)[:, 1]
+    predict_seconds = time.perf_counter() - start
+    y_pred = (y_prob > 0.5).astype(int)
+    (tn, fp), (fn, tp) = confusion_matrix(y_test, y_pred, labels=[0, 1])
+    metrics = {
+        'model': name,
+        'roc_auc': roc_auc_score(y_test, y_prob),
+        'ap': average_precision_score(y_test, y_prob),
+        'tn': tn, 'fp': fp, 'fn': fn, 'tp': tp,
+        'fit_s': fit_seconds,
+        'predict_s': predict_seconds,
+        'threads': threads,
+    }
+    return model, metrics
+
+
+def train_candidates(X_train, y_train, X_test, y_test, names=None, cores=None, executor="process",
+                     params=None):
+    """Fit the candidates concurrently; returns ({name: model}, results table).
+
+    executor="thread" avoids starting processes, for callers that can't
+    be re-imported safely (e.g. a script without a __main__ guard).
+    params maps a name to constructor overrides (churn_tuning's output).
+    """
+    params = params or {}
+    names = list(names or CANDIDATES)
+    cores = cores or os.cpu_count() or 1
+    budget = split_cores(names, cores)
+    pool_class = ProcessPoolExecutor if executor == "process" else ThreadPoolExecutor
+    with pool_class(max_workers=min(len(names), cores)) as pool:
+        futures = {name: pool.submit(fit_and_score, name, budget[name], X_train, y_train, X_test, y_test,
+                                     params.get(name))
+                   for name in names}
+        outcomes = {name: future.result() for name, future in futures.items()}
+    models = {name: model for name, (model, _) in outcomes.items()}
+    results = pd.DataFrame([metrics for _, metrics in outcomes.values()]).set_index('model')
+    return models, results
+
+
+def pick_best(results, metric="roc_auc"):
+    return results[metric].idxmax()
+
+
+def save_best(models, results, pipeline, metric="roc_auc", model_path=MODEL_PATH, pipeline_path=PIPELINE_PATH):
+    """Save the best model, its numpy-only compiled copy and the preprocessing."""
+    best = pick_best(results, metric)
+    joblib.dump(models[best], model_path)
+    pipeline.save(pipeline_path)
+    try:
+        compile_model(models[best], source=file_hash(model_path)).save(compiled_path(model_path))
+    except TypeError:
+        pass  # ChurnScorer.load() falls back to the pickle
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cores", type=int, default=os.cpu_count(), help="total thread budget")
+    parser.add_argument("--models", nargs="+", choices=list(CANDIDATES), help="candidates to fit")
+    parser.add_argument("--metric", choices=("roc_auc", "ap"), default="roc_auc", help="how to pick the best")
+    parser.add_argument("--executor", choices=("process", "thread"), default="process")
+    parser.add_argument("--imbalance", choices=IMBALANCE, default="smote",
+                        help="oversample with SMOTE, reweight the classes, or neither")
+    parser.add_argument("--params", help="JSON of constructor overrides per model, e.g. from churn_tuning.py")
+    parser.add_argument("--results", help="also write the results table to this CSV")
+    parser.add_argument("--model-path", default=MODEL_PATH)
+    parser.add_argument("--pipeline-path", default=PIPELINE_PATH)
+    args = parser.parse_args(argv)
+
+    tuned = None
+    if args.params:
+        with open(args.params) as f:
+            tuned = json.load(f)
+
+    X_train, y_train, X_test, y_test, pipeline = prepare_data(imbalance=args.imbalance)
+    params = imbalance_params(args.imbalance, y_train, tuned)
+    start = time.perf_counter()
+    models, results = train_candidates(X_train, y_train, X_test, y_test, args.models, args.cores,
+                                       args.executor, params)
+    wall = time.perf_counter() - start
+
+    with pd.option_context('display.width', 160, 'display.max_columns', None,
+                           'display.float_format', '{:.3f}'.format):
+        print(results.sort_values(args.metric, ascending=False))
+    print(f"\nWall time {wall:.1f}s for {results['fit_s'].sum():.1f}s of fitting")
+    if args.results:
+        results.to_csv(args.results)
+
+    best = save_best(models, results, pipeline, args.metric, args.model_path, args.pipeline_path)
+    print(f"Best by {args.metric}: {best} ({results.loc[best, args.metric]:.3f}) "
+          f"saved to '{args.model_path}', preprocessing to '{args.pipeline_path}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+"""Budgeted hyperparameter search for the tree models, by successive halving.
+
+    python churn_tuning.py --budget 600     # 10 minutes, all cores
+    python churn_tuning.py --models XGBoost --configs 81 --eta 3
+    python churn_training.py --params tuned_params.json   # train with it
+
+Each model starts with --configs random configurations (the first is the
+library defaults) trained with a small number of trees/boosting rounds.
+Every rung keeps the best 1/eta by mean cross-validated --metric and
+multiplies the rounds by eta; the defaults are kept every rung as the
+baseline. XGBoost stops early on each validation fold, and the forest
+grows in steps until the validation score stops improving, so the final
+n_estimators is learned too.
+
+The training split is cut into --folds stratified folds once (scaled,
+and SMOTE'd or class-weighted per --imbalance, like training) and cached
+as .npy files that every trial memory-maps. Trials run in a process
+pool, one core each. New trials stop starting when the --budget seconds
+are spent (trials already running finish). Every finished trial is
+appended to --log; a re-run with the same data and settings reuses
+logged trials instead of repeating them, so an interrupted or
+budget-limited search can be resumed.
+"""
+import argparse
+import copy
+import hashlib
+import json
+import math
+import os
+import shutil
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+from sklearn.metrics import average_precision_score, roc_auc_score
+from sklearn.model_selection import StratifiedKFold, train_test_split
+
+from churn_pipeline import CACHE_DIR, DATA_PATH, _cache_key, file_hash, load_arrays
+from churn_training import IMBALANCE, imbalance_params
+
+LOG_PATH = "tuning_trials.jsonl"
+PARAMS_PATH = "tuned_params.json"
+
+# (kind, low, high) or ('choice', options); 'log' samples uniformly in log space
+SPACES = {
+    "XGBoost": {
+        'max_depth': ('int', 2, 8),
+        'learning_rate': ('log', 0.01, 0.3),
+        'subsample': ('float', 0.6, 1.0),
+        'colsample_bytree': ('float', 0.5, 1.0),
+        'min_child_weight': ('log', 1.0, 20.0),
+        'reg_lambda': ('log', 0.1, 10.0),
+    },
+    "Random Forest": {
+        'max_depth': ('choice', [None, 6, 8, 12, 16, 24]),
+        'min_samples_leaf': ('int', 1, 20),
+        'max_features': ('choice', ['sqrt', 0.3, 0.5, 0.7]),
+    },
+}
+# trees / boosting rounds in the first rung
+MIN_RESOURCE = {"XGBoost": 50, "Random Forest": 25}
+EARLY_STOPPING_ROUNDS = 30
+METRICS = {'roc_auc': roc_auc_score, 'ap': average_precision_score}
+
+
+def sample_configs(name, n, seed=0):
+    """n parameter dicts for `name`; the first is {} (library defaults).
+    The same (name, n, seed) always gives the same list, which is what
+    lets a re-run match its logged trials."""
+    rng = np.random.default_rng([seed, sorted(SPACES).index(name)])
+    configs = [{}]
+    for _ in range(n - 1):
+        params = {}
+        for param, spec in SPACES[name].items():
+            if spec[0] == 'choice':
+                params[param] = spec[1][rng.integers(len(spec[1]))]
+            elif spec[0] == 'int':
+                params[param] = int(rng.integers(spec[1], spec[2] + 1))
+            elif spec[0] == 'log':
+                params[param] = float(np.exp(rng.uniform(np.log(spec[1]), np.log(spec[2]))))
+            else:
+                params[param] = float(rng.uniform(spec[1], spec[2]))
+        configs.append(params)
+    return configs
+
+
+def fold_matrices(n_folds=3, imbalance="smote", test_size=0.2, random_state=42, cache_dir=CACHE_DIR):
+    """(folder, key) of the cached per-fold matrices of the training split,
+    building them on the first call. The key changes with the data and
+    the fold settings, so logged trials are only reused on the same folds."""
+    X, y, pipeline = load_arrays()
+    settings = json.dumps([n_folds, test_size, random_state, imbalance])
+    key = hashlib.sha256((_cache_key(file_hash(DATA_PATH), pipeline) + settings).encode()).hexdigest()[:24]
+    folder = os.path.join(cache_dir, f"folds-{key}")
+    if os.path.isdir(folder):
+        return folder, key
+
+    X_train, _, y_train, _ = train_test_split(X, y, test_size=test_size, random_state=random_state,
+                                              stratify=y)
+    building = f"{folder}.{os.getpid()}.tmp"
+    os.makedirs(building, exist_ok=True)
+    splits = StratifiedKFold(n_folds, shuffle=True, random_state=random_state).split(X_train, y_train)
+    for i, (fit_rows, val_rows) in enumerate(splits):
+        X_fit, y_fit = X_train[fit_rows], y_train[fit_rows]
+        X_val, y_val = X_train[val_rows], y_train[val_rows]
+        fold_pipeline = copy.copy(pipeline).fit_scaler(X_fit)
+        fold_pipeline.scale_array(X_fit)
+        fold_pipeline.scale_array(X_val)
+        if imbalance == "smote":
+            from imblearn.over_sampling import SMOTE
+            X_fit, y_fit = SMOTE(random_state=random_state).fit_resample(X_fit, y_fit)
+        for part, values, dtype in (("X_fit", X_fit, np.float32), ("y_fit", y_fit, np.int8),
+                                    ("X_val", X_val, np.float32), ("y_val", y_val, np.int8)):
+            np.save(os.path.join(building, f"{i}.{part}.npy"), np.ascontiguousarray(values, dtype=dtype))
+    try:
+        os.rename(building, folder)
+    except OSError:
+        shutil.rmtree(building)  # another process built it first
+    return folder, key
+
+
+def load_fold(folder, i):
+    return tuple(np.load(os.path.join(folder, f"{i}.{part}.npy"), mmap_mode='r')
+                 for part in ("X_fit", "y_fit", "X_val", "y_val"))
+
+
+def _fit_xgboost(params, rounds, X_fit, y_fit, X_val, y_val, score):
+    from xgboost import XGBClassifier
+
+    model = XGBClassifier(n_estimators=rounds, early_stopping_rounds=EARLY_STOPPING_ROUNDS,
+                          eval_metric='logloss', random_state=42, n_jobs=1, **params)
+    model.fit(X_fit, y_fit, eval_set=[(X_val, y_val)], verbose=False)
+    used = model.best_iteration + 1
+    return score(y_val, model.predict_proba(X_val, iteration_range=(0, used))[:, 1]), used
+
+
+def _fit_forest(params, trees, X_fit, y_fit, X_val, y_val, score, patience=2):
+    from sklearn.ensemble import RandomForestClassifier
+
+    step = MIN_RESOURCE["Random Forest"]
+    model = RandomForestClassifier(n_estimators=0, warm_start=True, random_state=42, n_jobs=1, **params)
+    best, used, stale = -math.inf, 0, 0
+    while model.n_estimators < trees and stale < patience:
+        model.n_estimators = min(trees, model.n_estimators + step)
+        model.fit(X_fit, y_fit)
+        value = score(y_val, model.predict_proba(X_val)[:, 1])
+        if value > best + 1e-4:
+            best, used, stale = value, model.n_estimators, 0
+        else:
+            stale += 1
+    return best, used
+
+
+def run_trial(name, params, resource, folder, n_folds, metric, imbalance="smote"):
+    """Mean validation score of one configuration over the cached folds."""
+    fit = _fit_xgboost if name == "XGBoost" else _fit_forest
+    start = time.perf_counter()
+    scores, used = [], []
+    for i in range(n_folds):
+        X_fit, y_fit, X_val, y_val = load_fold(folder, i)
+        fold_params = imbalance_params(imbalance, y_fit, {name: params})[name]
+        value, n = fit(fold_params, resource, X_fit, y_fit, X_val, y_val, METRICS[metric])
+        scores.append(value)
+        used.append(n)
+    return {
+        'score': float(np.mean(scores)),
+        'fold_scores': [float(s) for s in scores],
+        'n_estimators': int(round(np.mean(used))),
+        'seconds': time.perf_counter() - start,
+    }
+
+
+class TrialLog:
+    """Append-only JSON-lines record of finished trials."""
+
+    def __init__(self, path):
+        self.path = path
+        self.done = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        self.done[self._key(record)] = record
+
+    @staticmethod
+    def _key(record):
+        return (record['folds'], record['metric'], record['model'],
+                json.dumps(record['params'], sort_keys=True), record['resource'])
+
+    def get(self, record):
+        return self.done.get(self._key(record))
+
+    def add(self, record):
+        self.done[self._key(record)] = record
+        with open(self.path, "a") as f:
+            f.write(json.dumps(record) + "\n")
+
+
+def successive_halving(name, pool, log, folder, folds_key, n_folds=3, configs=27, eta=3,
+                       metric="roc_auc", seed=0, deadline=math.inf, progress=print, imbalance="smote"):
+    """Best logged record for `name` (highest rung reached, then best score)."""
+    candidates = list(enumerate(sample_configs(name, configs, seed)))
+    resource = MIN_RESOURCE[name]
+    rungs = int(math.log(configs, eta) + 1e-9) + 1
+    best = None
+    for rung in range(rungs):
+        records, pending = [], {}
+        for config, params in candidates:
+            record = {'folds': folds_key, 'metric': metric, 'model': name, 'config': config,
+                      'params': params, 'rung': rung, 'resource': resource}
+            logged = log.get(record)
+            if logged is not None:
+                records.append(logged)
+            elif time.monotonic() < deadline:
+                pending[pool.submit(run_trial, name, params, resource, folder, n_folds, metric,
+                                    imbalance)] = record
+
+        while pending:
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                record = {**pending.pop(future), **future.result()}
+                log.add(record)
+                records.append(record)
+                progress(f"  {name} rung {rung} config {record['config']:3d} "
+                         f"{resource:4d} rounds: {metric} {record['score']:.4f} ({record['seconds']:.1f}s)")
+            if time.monotonic() >= deadline:
+                for future in pending:
+                    future.cancel()
+                # trials already running still finish and are logged
+                for future in wait(pending).done:
+                    if not future.cancelled():
+                        record = {**pending[future], **future.result()}
+                        log.add(record)
+                        records.append(record)
+                pending = {}
+
+        if not records:
+            break
+        ranked = sorted(records, key=lambda r: r['score'], reverse=True)
+        best = ranked[0]
+        if len(records) < len(candidates) or len(candidates) == 1:
+            progress(f"  {name}: budget spent in rung {rung} ({len(records)}/{len(candidates)} trials)")
+            break
+        # the defaults (config 0) ride along as the baseline to beat
+        keep = {r['config'] for r in ranked[:max(1, len(ranked) // eta)]} | {0}
+        candidates = [(config, params) for config, params in candidates if config in keep]
+        resource *= eta
+    return best
+
+
+def tune(models=tuple(SPACES), configs=27, eta=3, n_folds=3, metric="roc_auc", budget=math.inf,
+         cores=None, log_path=LOG_PATH, seed=0, progress=print, imbalance="smote"):
+    """{model name: best record}; each model gets an equal share of what is
+    left of the wall-clock budget when its search starts."""
+    started = time.monotonic()
+    folder, folds_key = fold_matrices(n_folds, imbalance)
+    log = TrialLog(log_path)
+    best = {}
+    with ProcessPoolExecutor(max_workers=cores or os.cpu_count() or 1) as pool:
+        for i, name in enumerate(models):
+            remaining = budget - (time.monotonic() - started)
+            deadline = time.monotonic() + remaining / (len(models) - i)
+            best[name] = successive_halving(name, pool, log, folder, folds_key, n_folds, configs, eta,
+                                            metric, seed, deadline, progress, imbalance)
+    return best
+
+
+def tuned_params(best):
+    """Constructor parameters for churn_training, from tune()'s records."""
+    return {name: {**record['params'], 'n_estimators': record['n_estimators']}
+            for name, record in best.items() if record is not None}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--models", nargs="+", choices=list(SPACES), default=list(SPACES))
+    parser.add_argument("--configs", type=int, default=27, help="configurations per model in the first rung")
+    parser.add_argument("--eta", type=int, default=3, help="keep 1/eta per rung, eta times the rounds")
+    parser.add_argument("--folds", type=int, default=3)
+    parser.add_argument("--metric", choices=list(METRICS), default="roc_auc")
+    parser.add_argument("--budget", type=float, default=math.inf, help="wall-clock seconds")
+    parser.add_argument("--cores", type=int, default=os.cpu_count(), help="trials run in parallel")
+    parser.add_argument("--imbalance", choices=IMBALANCE, default="smote",
+                        help="as for churn_training.py; tune with the strategy you will train with")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--log", default=LOG_PATH, help="trial log; re-runs resume from it")
+    parser.add_argument("--output", default=PARAMS_PATH, help="best parameters, for churn_training --params")
+    args = parser.parse_args(argv)
+
+    start = time.monotonic()
+    best = tune(args.models, args.configs, args.eta, args.folds, args.metric, args.budget, args.cores,
+                args.log, args.seed, imbalance=args.imbalance)
+    print(f"\nSearched in {time.monotonic() - start:.0f}s")
+    for name, record in best.items():
+        if record is None:
+            print(f"{name}: no trials finished")
+            continue
+        defaults = [r for r in TrialLog(args.log).done.values()
+                    if r['folds'] == record['folds'] and r['metric'] == args.metric
+                    and r['model'] == name and r['config'] == 0]
+        baseline = max(defaults, key=lambda r: r['rung'])['score'] if defaults else float('nan')
+        print(f"{name}: cv {args.metric} {record['score']:.4f} (defaults {baseline:.4f}) "
+              f"with {record['n_estimators']} trees, {record['params']}")
+
+    with open(args.output, "w") as f:
+        json.dump(tuned_params(best), f, indent=2)
+    print(f"Parameters saved to '{args.output}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Load test for churn_service.py on localhost.
+
+    python load_test_service.py --spawn   # start a service, test it, stop it
+    python load_test_service.py --port 8080 --concurrency 64 --requests 5000
+    python load_test_service.py --spawn --max-batch 1   # without batching
+
+--concurrency keep-alive connections each send POST /score requests of
+--rows customers back to back, with rows sampled from the Kaggle CSV.
+Reports client-side latency percentiles and throughput, then the
+service's own /metrics (batch sizes, server latency).
+"""
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from churn_pipeline import DATA_PATH
+
+
+async def request(reader, writer, method, path, body=b""):
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while (line := await reader.readline()) not in (b"\r\n", b""):
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+async def client(host, port, bodies, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for body in bodies:
+            start = time.perf_counter()
+            status, _ = await request(reader, writer, "POST", "/score", body)
+            latencies.append(time.perf_counter() - start)
+            errors[status != 200] += 1
+    finally:
+        writer.close()
+
+
+async def wait_until_up(host, port, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+            await request(reader, writer, "GET", "/health")
+            writer.close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+
+
+async def run(args):
+    customers = pd.read_csv(DATA_PATH).drop(columns="Churn")
+    customers['TotalCharges'] = pd.to_numeric(customers['TotalCharges'], errors='coerce')
+    customers = customers.astype(object).where(customers.notna(), None)
+    sample = customers.sample(args.requests * args.rows, replace=True, random_state=0).to_dict("records")
+    bodies = [json.dumps(sample[i:i + args.rows] if args.rows > 1 else sample[i]).encode()
+              for i in range(0, len(sample), args.rows)]
+
+    await wait_until_up(args.host, args.port)
+    latencies, errors = [], [0, 0]
+    start = time.perf_counter()
+    await asyncio.gather(*(client(args.host, args.port, bodies[i::args.concurrency], latencies, errors)
+                           for i in range(args.concurrency)))
+    elapsed = time.perf_counter() - start
+
+    reader, writer = await asyncio.open_connection(args.host, args.port)
+    _, metrics = await request(reader, writer, "GET", "/metrics")
+    writer.close()
+
+    ms = np.array(latencies) * 1000
+    print(f"{len(bodies):,} requests ({len(sample):,} rows) over {args.concurrency} connections "
+          f"in {elapsed:.2f}s: {len(bodies) / elapsed:,.0f} req/s, {len(sample) / elapsed:,.0f} rows/s, "
+          f"{errors[1]} errors")
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    print(f"client latency ms: p50 {p50:.2f}  p95 {p95:.2f}  p99 {p99:.2f}  max {ms.max():.2f}")
+    print("service /metrics:", json.dumps(metrics, indent=2))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--rows", type=int, default=1, help="customers per request")
+    parser.add_argument("--spawn", action="store_true", help="run churn_service.py for the test")
+    parser.add_argument("--max-batch", type=int, default=256, help="with --spawn")
+    parser.add_argument("--max-wait-ms", type=float, default=5.0, help="with --spawn")
+    args = parser.parse_args(argv)
+
+    service = None
+    if args.spawn:
+        service = subprocess.Popen([sys.executable, "churn_service.py", "--host", args.host,
+                                    "--port", str(args.port), "--max-batch", str(args.max_batch),
+                                    "--max-wait-ms", str(args.max_wait_ms)])
+    try:
+        asyncio.run(run(args))
+    finally:
+        if service is not None:
+            service.terminate()
+            service.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Score a customer CSV of any size with the saved churn model.
+
+    python score_customers.py customers.csv scores.csv
+    python score_customers.py customers.csv.gz scores.csv --chunk-size 200000 --workers 4
+
+Reads the input a chunk at a time with explicit dtypes (category columns
+are re-coded to the training codes), scores each chunk with ChurnScorer and
+appends customerID, the churn flag and probability to the output as it
+goes, so memory is bounded by the chunk size. With --workers, chunks are
+scored in a process pool (each worker loads the model once) and written
+in input order. Rows with an unknown category or a missing or malformed
+number are written with an empty score and counted as rejected.
+"""
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from churn_pipeline import MODEL_PATH, PIPELINE_PATH, ID_COL
+from churn_scorer import ChurnScorer
+
+_scorer = None
+
+
+def _load(model_path, pipeline_path):
+    global _scorer
+    _scorer = ChurnScorer(model_path, pipeline_path)
+
+
+def score_chunk(chunk, scorer=None):
+    """Output frame for one input chunk: customerID, Churn, Probability."""
+    scorer = scorer or _scorer
+    scorer.align_categories(chunk)
+    valid = scorer.numbers(chunk)
+    for col in scorer.tables:
+        valid &= chunk[col].cat.codes.to_numpy() >= 0
+
+    out = pd.DataFrame({ID_COL: chunk[ID_COL].to_numpy() if ID_COL in chunk else np.arange(len(chunk))})
+    probability = np.full(len(chunk), np.nan)
+    if valid.any():
+        probability[valid] = scorer.predict_proba(chunk[valid] if not valid.all() else chunk)
+    out['Churn'] = np.where(valid, np.where(probability > 0.5, "Yes", "No"), "")
+    out['Probability'] = probability
+    return out
+
+
+def read_chunks(path, scorer, chunk_size):
+    return pd.read_csv(path, chunksize=chunk_size, dtype=scorer.read_dtypes(),
+                       na_values={'TotalCharges': [" ", ""]}, keep_default_na=False)
+
+
+def score_file(input_path, output_path, chunk_size=100_000, workers=0, model_path=MODEL_PATH,
+               pipeline_path=PIPELINE_PATH, progress=None):
+    """Score input_path into output_path; returns (rows, rejected)."""
+    scorer = ChurnScorer(model_path, pipeline_path)
+    rows = rejected = 0
+    partial = output_path + ".part"
+
+    def write(out, first):
+        nonlocal rows, rejected
+        out.to_csv(f, header=first, index=False, float_format="%.6f")
+        rows += len(out)
+        rejected += int((out['Churn'] == "").sum())
+        if progress is not None:
+            progress(rows, rejected)
+
+    try:
+        with open(partial, "w", newline="") as f:
+            chunks = read_chunks(input_path, scorer, chunk_size)
+            if workers <= 1:
+                for i, chunk in enumerate(chunks):
+                    write(score_chunk(chunk, scorer), i == 0)
+            else:
+                # at most 2 chunks per worker in flight, written in submission order
+                with ProcessPoolExecutor(workers, initializer=_load,
+                                         initargs=(model_path, pipeline_path)) as pool:
+                    pending = deque()
+                    first = True
+                    for chunk in chunks:
+                        pending.append(pool.submit(score_chunk, chunk))
+                        while len(pending) >= 2 * workers:
+                            write(pending.popleft().result(), first)
+                            first = False
+                    while pending:
+                        write(pending.popleft().result(), first)
+                        first = False
+    except BaseException:
+        if os.path.exists(partial):
+            os.remove(partial)
+        raise
+    os.replace(partial, output_path)
+    return rows, rejected
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("input", help="customer CSV (may be .gz), same columns as the training data")
+    parser.add_argument("output", help="CSV of customerID, Churn, Probability")
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=0, help="score chunks in this many processes")
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--pipeline", default=PIPELINE_PATH)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    rows, rejected = score_file(
+        args.input, args.output, args.chunk_size, args.workers, args.model, args.pipeline,
+        progress=lambda done, bad: print(f"  {done:,} rows scored", end="\r", file=sys.stderr))
+    elapsed = time.perf_counter() - start
+    print(f"Scored {rows:,} rows in {elapsed:.1f}s ({rows / elapsed:,.0f} rows/s), "
+          f"{rejected:,} rejected -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+"""Attendance reads/writes shared by the dashboards (no Tk in here)."""
+from datetime import date as Date, timedelta
+
+import queries
+
+# Upserts and month bucketing differ by dialect; look these up with db.dialect.
+
+# A row someone else marked since _already_marked() is left alone; any
+# other error (unknown student, bad status or date) still raises.
+INSERT_ATTENDANCE = {
+    'mysql': """
+INSERT INTO attendance (student_id, date, status) VALUES (%s, %s, %s)
+ON DUPLICATE KEY UPDATE id = id
+""",
+    'sqlite': """
+INSERT INTO attendance (student_id, date, status) VALUES (%s, %s, %s)
+ON CONFLICT (student_id, date) DO NOTHING
+""",
+}
+
+UPSERT_SUMMARY = {
+    'mysql': """
+INSERT INTO attendance_summary (student_id, total, present, last_date) VALUES (%s, %s, %s, %s)
+ON DUPLICATE KEY UPDATE total = total + VALUES(total),
+                        present = present + VALUES(present),
+                        last_date = GREATEST(last_date, VALUES(last_date))
+""",
+    'sqlite': """
+INSERT INTO attendance_summary (student_id, total, present, last_date) VALUES (%s, %s, %s, %s)
+ON CONFLICT (student_id) DO UPDATE SET total = total + excluded.total,
+                                       present = present + excluded.present,
+                                       last_date = MAX(last_date, excluded.last_date)
+""",
+}
+
+REBUILD_SUMMARY = """
+INSERT INTO attendance_summary (student_id, total, present, last_date)
+SELECT student_id, COUNT(*), COUNT(CASE WHEN status = 'present' THEN 1 END), MAX(date)
+FROM attendance
+{where}
+GROUP BY student_id
+"""
+
+UPSERT_MONTHLY = {
+    'mysql': """
+INSERT INTO attendance_monthly (student_id, month, present, absent, total) VALUES (%s, %s, %s, %s, %s)
+ON DUPLICATE KEY UPDATE present = present + VALUES(present),
+                        absent = absent + VALUES(absent),
+                        total = total + VALUES(total)
+""",
+    'sqlite': """
+INSERT INTO attendance_monthly (student_id, month, present, absent, total) VALUES (%s, %s, %s, %s, %s)
+ON CONFLICT (month, student_id) DO UPDATE SET present = present + excluded.present,
+                                              absent = absent + excluded.absent,
+                                              total = total + excluded.total
+""",
+}
+
+MONTH_OF = {
+    'mysql': "DATE_FORMAT(date, '%Y-%m-01')",
+    'sqlite': "strftime('%Y-%m-01', date)",
+}
+
+REBUILD_MONTHLY = """
+INSERT INTO attendance_monthly (student_id, month, present, absent, total)
+SELECT student_id, {month},
+       COUNT(CASE WHEN status = 'present' THEN 1 END),
+       COUNT(CASE WHEN status = 'absent' THEN 1 END),
+       COUNT(*)
+FROM attendance
+{where}
+GROUP BY student_id, {month}
+"""
+
+
+# keys per lookup, keeping the bound parameters well under SQLite's 32766
+MARKED_CHUNK = 500
+
+
+def _already_marked(db, keys):
+    marked = set()
+    for start in range(0, len(keys), MARKED_CHUNK):
+        chunk = keys[start:start + MARKED_CHUNK]
+        placeholders = ", ".join(["(%s, %s)"] * len(chunk))
+        params = [value for key in chunk for value in key]
+        found = db.fetch_all(
+            f"SELECT student_id, date FROM attendance WHERE (student_id, date) IN ({placeholders})",
+            params)
+        marked.update((student_id, str(date)) for student_id, date in found)
+    return marked
+
+
+def _summary_deltas(rows):
+    deltas = {}
+    for student_id, date, status in rows:
+        total, present, last_date = deltas.get(student_id, (0, 0, date))
+        deltas[student_id] = (total + 1, present + (status == 'present'), max(last_date, date))
+    return [(student_id, *delta) for student_id, delta in deltas.items()]
+
+
+def _monthly_deltas(rows):
+    deltas = {}
+    for student_id, date, status in rows:
+        key = (student_id, date[:8] + "01")
+        present, absent, total = deltas.get(key, (0, 0, 0))
+        deltas[key] = (present + (status == 'present'), absent + (status == 'absent'), total + 1)
+    return [(*key, *delta) for key, delta in deltas.items()]
+
+
+def record_attendance(db, rows):
+    """Insert (student_id, date, status) rows, skipping ones already marked.
+
+    Relies on the unique (student_id, date) key. The batch runs in one
+    transaction: find rows already marked (one lookup per MARKED_CHUNK
+    rows), executemany the new ones, then add the per-student deltas to
+    attendance_summary and the per-month deltas to attendance_monthly.
+    The inserted rows are published on the 'attendance' topic at commit.
+    Returns (inserted, skipped).
+    """
+    rows = list(rows)
+    batch = {}
+    for student_id, date, status in rows:
+        batch.setdefault((student_id, str(date)), status)
+    if not batch:
+        return 0, 0
+
+    with db.transaction():
+        existing = _already_marked(db, list(batch))
+        new_rows = [(student_id, date, status) for (student_id, date), status in batch.items()
+                    if (student_id, date) not in existing]
+        inserted = 0
+        if new_rows:
+            inserted = db.execute_many(INSERT_ATTENDANCE[db.dialect], new_rows).rowcount
+            if inserted == len(new_rows):
+                db.execute_many(UPSERT_SUMMARY[db.dialect], _summary_deltas(new_rows))
+                db.execute_many(UPSERT_MONTHLY[db.dialect], _monthly_deltas(new_rows))
+                db.publish('attendance', new_rows)
+            else:
+                # someone else marked part of the batch meanwhile
+                student_ids = {row[0] for row in new_rows}
+                rebuild_summaries(db, student_ids)
+                rebuild_rollups(db, student_ids)
+                db.publish('attendance', None)
+    return inserted, len(rows) - inserted
+
+
+def student_stats(db, student_id):
+    """(total, present) for one student, from the summary row when there is one."""
+    row = db.fetch_one(queries.STUDENT_SUMMARY, (student_id,), cached=True)
+    if row is None:
+        row = db.fetch_one(queries.STUDENT_STATS, (student_id,), cached=True)
+    return row[0], row[1]
+
+
+def _rebuild(db, table, insert_select, student_ids):
+    with db.transaction():
+        if student_ids is None:
+            db.execute_query(f"DELETE FROM {table}")
+            db.execute_query(insert_select.format(where=""))
+        else:
+            ids = list(student_ids)
+            placeholders = ", ".join(["%s"] * len(ids))
+            db.execute_query(f"DELETE FROM {table} WHERE student_id IN ({placeholders})", ids)
+            db.execute_query(insert_select.format(where=f"WHERE student_id IN ({placeholders})"), ids)
+
+
+def rebuild_summaries(db, student_ids=None):
+    """Recompute attendance_summary from attendance in one grouped pass."""
+    _rebuild(db, "attendance_summary", REBUILD_SUMMARY, student_ids)
+
+
+def rebuild_rollups(db, student_ids=None):
+    """Recompute attendance_monthly from attendance in one grouped pass."""
+    insert_select = REBUILD_MONTHLY.replace("{month}", MONTH_OF[db.dialect])
+    _rebuild(db, "attendance_monthly", insert_select, student_ids)
+
+
+def _month_split(from_date, to_date):
+    """Split [from, to] into (first full month, last full month) plus edge-day ranges.
+
+    Returns None when the range holds no whole calendar month.
+    """
+    first = from_date if from_date.day == 1 else (from_date.replace(day=28) + timedelta(days=4)).replace(day=1)
+    after = to_date + timedelta(days=1)
+    end = to_date if after.day == 1 else to_date.replace(day=1) - timedelta(days=1)
+    if first > end:
+        return None
+    last = end.replace(day=1)
+    head = (from_date, first - timedelta(days=1))
+    tail = (end + timedelta(days=1), to_date)
+    return first, last, head, tail
+
+
+def report_query(from_date, to_date):
+    """(sql, params) for the date-range report.
+
+    Whole months come from attendance_monthly and only the partial months
+    at either end are read from raw attendance rows. Falls back to the raw
+    query when the range has no whole month or the dates don't parse.
+    """
+    try:
+        split = _month_split(Date.fromisoformat(from_date), Date.fromisoformat(to_date))
+    except (TypeError, ValueError):
+        split = None
+    if split is None:
+        return queries.REPORT, (from_date, to_date)
+
+    first, last, head, tail = split
+    return queries.REPORT_ROLLUP, (first, last, *head, *tail)
+
+
+def attendance_report(db, from_date, to_date):
+    """Rows of the report: (name, present, absent, total, percentage)."""
+    return db.fetch_all(*report_query(from_date, to_date))
+
+
+class KeysetSource:
+    """Attendance rows paged on (a.date, a.student_id), newest first.
+
+    `select` must read from `attendance a` and end with the two key
+    columns a.date, a.student_id after the displayed ones.
+    """
+
+    def __init__(self, db, select, condition="", params=()):
+        self.db = db
+        self.select = select
+        self.condition = condition
+        self.params = tuple(params)
+
+    def page(self, key, forward, limit):
+        conditions = [self.condition] if self.condition else []
+        params = list(self.params)
+        if key is not None:
+            op = "<" if forward else ">"
+            conditions.append(f"(a.date {op} %s OR (a.date = %s AND a.student_id {op} %s))")
+            params += [key[0], key[0], key[1]]
+        order = "DESC" if forward else "ASC"
+
+        query = self.select
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += f" ORDER BY a.date {order}, a.student_id {order} LIMIT %s"
+        params.append(limit)
+
+        rows = self.db.fetch_all(query, params)
+        if not forward:
+            rows.reverse()
+        return [(row[-2:], row[:-2]) for row in rows]
+
+
+class OffsetSource:
+    """Pages any ordered query with LIMIT/OFFSET; for small result sets."""
+
+    def __init__(self, db, query, params=(), cached=False):
+        self.db = db
+        self.query = query
+        self.params = tuple(params)
+        self.cached = cached
+
+    def page(self, key, forward, limit):
+        if forward:
+            start = 0 if key is None else key + 1
+        else:
+            start = max(0, key - limit)
+            limit = key - start
+        rows = self.db.fetch_all(self.query + " LIMIT %s OFFSET %s", self.params + (limit, start),
+                                 cached=self.cached)
+        return [(start + i, row) for i, row in enumerate(rows)]
@@ -0,0 +1,129 @@
+"""Password hashing and the login lookup.
+
+Passwords are stored as "pbkdf2_sha256$<iterations>$<salt>$<hash>" (salt
+and hash base64). ITERATIONS is the cost for new hashes; main.py reads it
+from DIGICAMPUS_KDF_ITERATIONS. Rows hashed at another cost, and legacy
+plaintext rows, are rehashed on the next successful login, or all at
+once with `python manage.py rehash-passwords`.
+
+The KDF takes tens of milliseconds by design, so the UI calls
+authenticate() and create_user() through the QueryExecutor.
+"""
+import base64
+import hashlib
+import hmac
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import queries
+
+ALGORITHM = "pbkdf2_sha256"
+ITERATIONS = 260_000
+SALT_BYTES = 16
+
+PREFIX = ALGORITHM + "$"
+
+UPDATE_PASSWORD = "UPDATE users SET password = %s WHERE id = %s AND password = %s"
+
+LEGACY_BATCH = """
+SELECT id, password FROM users
+WHERE id > %s AND SUBSTR(password, 1, 14) <> 'pbkdf2_sha256$'
+ORDER BY id LIMIT %s
+"""
+
+
+def _b64(raw):
+    return base64.b64encode(raw).decode("ascii")
+
+
+def hash_password(password, iterations=None, salt=None):
+    iterations = iterations or ITERATIONS
+    salt = salt or os.urandom(SALT_BYTES)
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations)
+    return f"{ALGORITHM}${iterations}${_b64(salt)}${_b64(digest)}"
+
+
+def is_hashed(stored):
+    return stored.startswith(PREFIX)
+
+
+def verify_password(password, stored):
+    """(matches, needs_rehash) for a stored hash or legacy plaintext value."""
+    if not is_hashed(stored):
+        matches = hmac.compare_digest(password.encode("utf-8"), stored.encode("utf-8"))
+        return matches, matches
+    try:
+        _, iterations, salt, expected = stored.split("$")
+        iterations = int(iterations)
+        salt = base64.b64decode(salt)
+        expected = base64.b64decode(expected)
+    except ValueError:
+        return False, False
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations)
+    matches = hmac.compare_digest(digest, expected)
+    return matches, matches and iterations != ITERATIONS
+
+
+# verified against when the email is unknown, so a miss costs the same as a wrong password
+_DUMMY = {}
+
+
+def _dummy_hash():
+    stored = _DUMMY.get(ITERATIONS)
+    if stored is None:
+        stored = _DUMMY[ITERATIONS] = hash_password("", salt=b"\0" * SALT_BYTES)
+    return stored
+
+
+def authenticate(db, email, password):
+    """The user as {'id', 'name', 'email', 'role'}, or None if the login fails.
+
+    One indexed, prepared lookup by email, then the KDF check. A legacy or
+    out-of-date hash is replaced on success.
+    """
+    row = db.fetch_one(queries.LOGIN, (email,), prepared=True)
+    if row is None:
+        verify_password(password, _dummy_hash())
+        return None
+
+    user_id, name, user_email, role, stored = row
+    matches, needs_rehash = verify_password(password, stored)
+    if not matches:
+        return None
+    if needs_rehash:
+        with db.transaction():
+            db.execute_query(UPDATE_PASSWORD, (hash_password(password), user_id, stored))
+    return {'id': user_id, 'name': name, 'email': user_email, 'role': role}
+
+
+def create_user(db, name, email, password):
+    """Insert a student account with a hashed password; raises db.IntegrityError
+    if the email is taken."""
+    with db.transaction():
+        cur = db.execute_query(queries.SIGNUP, (name, email, hash_password(password)))
+        db.publish('users', [(cur.lastrowid, name, 'student')])
+
+
+def rehash_plaintext(db, iterations=None, batch_size=500, workers=None, progress=None):
+    """Hash every legacy plaintext password in place; returns the number of rows.
+
+    Rows are read by id in batches and hashed on a thread pool (the KDF
+    releases the GIL), and each batch is written in one transaction. A row
+    changed meanwhile (e.g. rehashed by a login) is left alone.
+    """
+    done = 0
+    last_id = 0
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        while True:
+            rows = db.fetch_all(LEGACY_BATCH, (last_id, batch_size))
+            if not rows:
+                break
+            hashes = pool.map(lambda row: hash_password(row[1], iterations), rows)
+            with db.transaction():
+                db.execute_many(UPDATE_PASSWORD, [(new, user_id, old)
+                                                  for (user_id, old), new in zip(rows, hashes)])
+            done += len(rows)
+            last_id = rows[-1][0]
+            if progress is not None:
+                progress(done)
+    return done
@@ -0,0 +1,112 @@
+"""Database drivers behind Database: MySQL (the default) and embedded SQLite.
+
+The app's SQL is written for MySQL with %s placeholders. A backend opens
+connections and rewrites statement text for its dialect; statements that
+can't be rewritten mechanically (upserts, date formatting) are kept per
+dialect next to the code that uses them, keyed by `dialect`.
+"""
+import re
+import sqlite3
+import weakref
+from datetime import date, datetime
+from functools import lru_cache
+
+import mysql.connector
+
+
+class MySQLBackend:
+    dialect = "mysql"
+    IntegrityError = mysql.connector.errors.IntegrityError
+    # errors after which the connection can't be reused
+    ConnectionLost = mysql.connector.errors.OperationalError
+
+    def __init__(self, host="localhost", user="root", password="", database="attendance_system"):
+        self.config = {'host': host, 'user': user, 'password': password, 'database': database}
+        # connection -> {query: server-side prepared cursor}
+        self._prepared = weakref.WeakKeyDictionary()
+
+    def connect(self):
+        return mysql.connector.connect(**self.config)
+
+    def connection_lost(self, exc):
+        return True
+
+    def translate(self, query):
+        return query
+
+    def stream_cursor(self, conn):
+        # unbuffered: rows stay on the server until fetched
+        return conn.cursor(buffered=False)
+
+    def execute_prepared(self, conn, query, params):
+        """Rows of `query` run as a server-side prepared statement.
+
+        The statement is prepared once per connection and re-executed with
+        new parameters after that.
+        """
+        cursors = self._prepared.setdefault(conn, {})
+        cur = cursors.get(query)
+        if cur is None:
+            cur = cursors[query] = conn.cursor(prepared=True)
+        cur.execute(query, params)
+        return cur.fetchall()
+
+
+_AUTO_INCREMENT = re.compile(r"\bINT\s+AUTO_INCREMENT\s+PRIMARY\s+KEY\b", re.I)
+_INSERT_IGNORE = re.compile(r"\bINSERT\s+IGNORE\b", re.I)
+
+sqlite3.register_adapter(date, date.isoformat)
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(" "))
+
+
+@lru_cache(maxsize=512)
+def _sqlite_sql(query):
+    query = query.replace("%s", "?")
+    query = _INSERT_IGNORE.sub("INSERT OR IGNORE", query)
+    return _AUTO_INCREMENT.sub("INTEGER PRIMARY KEY AUTOINCREMENT", query)
+
+
+class SQLiteBackend:
+    """Local file database in WAL mode, for CI, kiosks and single-campus installs.
+
+    Statement text is translated once and cached, so repeated queries hit
+    sqlite3's per-connection prepared statement cache.
+    """
+    dialect = "sqlite"
+    IntegrityError = sqlite3.IntegrityError
+    # also raised for API misuse; connection_lost() tells the two apart
+    ConnectionLost = sqlite3.ProgrammingError
+
+    PRAGMAS = (
+        "PRAGMA journal_mode = WAL",
+        "PRAGMA synchronous = NORMAL",
+        "PRAGMA temp_store = MEMORY",
+        "PRAGMA cache_size = -32000",       # 32 MB page cache per connection
+        "PRAGMA mmap_size = 268435456",     # 256 MB memory-mapped reads
+        "PRAGMA busy_timeout = 5000",
+    )
+
+    def __init__(self, path="attendance_system.db", cached_statements=256):
+        self.path = path
+        self.cached_statements = cached_statements
+
+    def connect(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False, uri=self.path.startswith("file:"),
+                               cached_statements=self.cached_statements)
+        for pragma in self.PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def connection_lost(self, exc):
+        return "closed database" in str(exc)
+
+    def translate(self, query):
+        return _sqlite_sql(query)
+
+    def stream_cursor(self, conn):
+        # sqlite3 steps the statement as rows are fetched
+        return conn.cursor()
+
+    def execute_prepared(self, conn, query, params):
+        # sqlite3 already keeps prepared statements per connection (cached_statements)
+        return conn.execute(_sqlite_sql(query), params).fetchall()
@@ -0,0 +1,128 @@
+"""Runs database work off the Tk main thread.
+
+Workers never touch Tk: finished results go on a queue that the main
+thread drains with root.after, and the callbacks run there (progress
+updates from reporter() take the same route). Work submitted for a
+window is cancelled when that window is destroyed, so a late result
+never lands on a dead widget.
+"""
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from tkinter import messagebox
+
+import instrumentation
+
+
+class Task:
+    def __init__(self, owner=None):
+        self.owner = owner
+        self.future = None
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+        if self.future is not None:
+            self.future.cancel()
+
+
+class QueryExecutor:
+    def __init__(self, root, max_workers=4, poll_ms=25):
+        self.root = root
+        self.poll_ms = poll_ms
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db")
+        self.done = queue.Queue()
+        self.updates = queue.Queue()
+        self.owned = {}
+        self.root.after(self.poll_ms, self._poll)
+
+    def submit(self, fn, *args, on_done=None, on_error=None, owner=None, busy=None, **kwargs):
+        """Run fn(*args, **kwargs) on a worker thread.
+
+        on_done(result) / on_error(exc) run on the Tk thread. `owner` is a
+        widget whose destruction cancels the task; `busy` is a widget that
+        shows a watch cursor until the task finishes.
+        """
+        task = Task(owner)
+        if owner is not None:
+            self._track(owner, task)
+        if busy is not None:
+            busy.configure(cursor="watch")
+        caller = instrumentation.caller_name()
+
+        def run():
+            try:
+                with instrumentation.context(caller):
+                    outcome = (True, fn(*args, **kwargs))
+            except Exception as exc:
+                outcome = (False, exc)
+            self.done.put((task, outcome, on_done, on_error, busy))
+
+        task.future = self.pool.submit(run)
+        # a task cancelled before it started never runs run(); deliver it
+        # anyway so its busy cursor is reset
+        task.future.add_done_callback(
+            lambda future: future.cancelled() and self.done.put((task, (False, None), None, None, busy)))
+        return task
+
+    def reporter(self, fn, owner=None):
+        """A callable workers can use to report progress: each call runs
+        fn(*args) on the Tk thread, unless `owner` has been destroyed."""
+        def report(*args):
+            self.updates.put((fn, owner, args))
+        return report
+
+    def subscribe(self, events, topic, fn, owner):
+        """Run fn(delta) on the Tk thread for each change published on `topic`
+        (see events.py) until `owner` is destroyed."""
+        unsubscribe = events.subscribe(topic, self.reporter(fn, owner=owner))
+        owner.bind("<Destroy>", lambda e: unsubscribe() if e.widget is owner else None, add="+")
+
+    def _track(self, owner, task):
+        tasks = self.owned.get(owner)
+        if tasks is None:
+            tasks = self.owned[owner] = set()
+
+            def on_destroy(event, owner=owner):
+                if event.widget is owner:
+                    for pending in self.owned.pop(owner, ()):
+                        pending.cancel()
+
+            owner.bind("<Destroy>", on_destroy, add="+")
+        tasks.add(task)
+
+    def _poll(self):
+        try:
+            while True:
+                try:
+                    fn, owner, args = self.updates.get_nowait()
+                except queue.Empty:
+                    break
+                if owner is None or owner.winfo_exists():
+                    fn(*args)
+            while True:
+                try:
+                    item = self.done.get_nowait()
+                except queue.Empty:
+                    break
+                self._deliver(*item)
+        finally:
+            self.root.after(self.poll_ms, self._poll)
+
+    def _deliver(self, task, outcome, on_done, on_error, busy):
+        if task.owner is not None and task.owner in self.owned:
+            self.owned[task.owner].discard(task)
+        if busy is not None and busy.winfo_exists():
+            busy.configure(cursor="")
+        if task.cancelled:
+            return
+        ok, value = outcome
+        if ok:
+            if on_done is not None:
+                on_done(value)
+        elif on_error is not None:
+            on_error(value)
+        else:
+            messagebox.showerror("Database Error", str(value))
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,84 @@
+"""Login throughput at different password-hashing costs.
+
+    python bench_login.py --sqlite bench.db --costs 100000 260000 600000 --threads 4
+
+For each KDF cost it stores that hash for a set of benchmark users, then
+runs auth.authenticate from `--threads` threads at once (as the
+QueryExecutor workers would during the start-of-day rush) and prints
+logins/sec, p50/p95 latency and how long a rush of `--rush` logins
+would take. Use it to pick DIGICAMPUS_KDF_ITERATIONS.
+"""
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import auth
+from migrations import migrate
+from synthetic import add_database_arguments, open_database
+
+INSERT_USER = "INSERT INTO users (name, email, password, role) VALUES (%s, %s, %s, 'student')"
+
+EMAIL = "login{}@example.com"
+
+
+def ensure_users(db, count):
+    have = db.fetch_one("SELECT COUNT(*) FROM users WHERE email LIKE %s", ("login%@example.com",))[0]
+    if have < count:
+        with db.transaction():
+            db.execute_many(INSERT_USER, [(f"Login {i}", EMAIL.format(i), "password")
+                                          for i in range(have, count)])
+
+
+def run(db, users, logins, threads):
+    def login(n):
+        start = time.perf_counter()
+        user = auth.authenticate(db, EMAIL.format(n % users), "password")
+        assert user is not None
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        times = sorted(pool.map(login, range(logins)))
+    elapsed = time.perf_counter() - start
+    cuts = statistics.quantiles(times, n=100) if len(times) > 1 else times * 99
+    return logins / elapsed, cuts[49], cuts[94]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--costs", type=int, nargs="+", default=[100_000, 260_000, 600_000],
+                        help="PBKDF2 iteration counts to compare")
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--logins", type=int, default=200, help="logins per cost")
+    parser.add_argument("--threads", type=int, default=4, help="concurrent logins (QueryExecutor workers)")
+    parser.add_argument("--rush", type=int, default=1000, help="students logging in at the start of the day")
+    add_database_arguments(parser)
+    args = parser.parse_args(argv)
+
+    db = open_database(args, pool_size=args.threads)
+    migrate(db)
+    ensure_users(db, args.users)
+
+    print(f"{'iterations':>10} {'hash ms':>8} {'logins/s':>9} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'rush of ' + str(args.rush):>14}")
+    for cost in args.costs:
+        auth.ITERATIONS = cost
+        start = time.perf_counter()
+        stored = auth.hash_password("password")
+        hash_ms = (time.perf_counter() - start) * 1000
+        # one shared hash keeps setup cheap; verifying costs the same either way
+        with db.transaction():
+            db.execute_query("UPDATE users SET password = %s WHERE email LIKE %s",
+                             (stored, "login%@example.com"))
+
+        run(db, args.users, args.threads, args.threads)  # warm up connections
+        rate, p50, p95 = run(db, args.users, args.logins, args.threads)
+        print(f"{cost:>10} {hash_ms:8.1f} {rate:9.1f} {p50 * 1000:8.1f} {p95 * 1000:8.1f} "
+              f"{args.rush / rate:13.1f}s")
+
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Compare the raw date-range report with the monthly-rollup version.
+
+    python bench_report.py --rows 1000000 --students 5000
+
+Fills a scratch database with synthetic attendance (once), then runs the
+report as the dashboard originally issued it and the rollup version over
+a full-year range and a range with partial edge months, checks they
+return the same rows in the same order (up to rows tied on percentage,
+whose order the original query leaves open) and prints median latencies.
+"""
+import argparse
+import statistics
+import time
+
+from attendance import report_query
+from migrations import migrate
+from synthetic import populate, add_database_arguments, open_database
+
+# The report exactly as teacher_dashboard ran it before the rollup, the
+# output the rollup has to reproduce.
+ORIGINAL_REPORT = """
+        SELECT u.name, 
+               COUNT(CASE WHEN a.status = 'present' THEN 1 END) as present,
+               COUNT(CASE WHEN a.status = 'absent' THEN 1 END) as absent,
+               COUNT(*) as total,
+               ROUND(COUNT(CASE WHEN a.status = 'present' THEN 1 END) / COUNT(*) * 100, 2) as percentage
+        FROM attendance a
+        JOIN users u ON a.student_id = u.id
+        WHERE a.date BETWEEN %s AND %s
+        GROUP BY u.name
+        ORDER BY percentage DESC
+        """
+
+
+def original_report(db):
+    if db.dialect == 'sqlite':
+        # SQLite's "/" on integers truncates where MySQL's gives a decimal;
+        # a REAL divisor is the one change needed for the same numbers
+        return ORIGINAL_REPORT.replace("/ COUNT(*) * 100", "/ (COUNT(*) * 1.0) * 100")
+    return ORIGINAL_REPORT
+
+
+def timed(db, sql, params, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = db.fetch_all(sql, params)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), rows
+
+
+def same_report(a, b):
+    """'same order' when the rows match position by position, 'ties
+    reordered' when they only differ inside runs of equal percentage (the
+    original ORDER BY leaves that order to the engine), else None."""
+    a, b = list(map(tuple, a)), list(map(tuple, b))
+    if a == b:
+        return "same order"
+    if [row[-1] for row in a] != [row[-1] for row in b]:
+        return None
+    runs = {}
+    for rows, side in ((a, 0), (b, 1)):
+        for row in rows:
+            runs.setdefault(row[-1], ([], []))[side].append(row)
+    if all(sorted(x) == sorted(y) for x, y in runs.values()):
+        return "ties reordered"
+    return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--students", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    add_database_arguments(parser)
+    args = parser.parse_args(argv)
+
+    db = open_database(args)
+    migrate(db)
+    existing = db.fetch_one("SELECT COUNT(*) FROM attendance")[0]
+    if existing == 0:
+        print(f"Populating {args.rows:,} attendance rows for {args.students:,} students...")
+        populate(db, args.students, args.rows // args.students)
+    else:
+        print(f"Using existing {existing:,} attendance rows in {args.sqlite or args.database}.")
+
+    first, last = db.fetch_one("SELECT MIN(date), MAX(date) FROM attendance")
+    ranges = [
+        ("whole data set", str(first), str(last)),
+        ("partial edge months", f"{str(first)[:7]}-15", f"{str(last)[:7]}-10"),
+    ]
+
+    ok = True
+    for label, from_date, to_date in ranges:
+        old, old_rows = timed(db, original_report(db), (from_date, to_date), args.repeat)
+        new, new_rows = timed(db, *report_query(from_date, to_date), args.repeat)
+        match = same_report(old_rows, new_rows)
+        ok = ok and match is not None
+        print(f"{label:22} {from_date}..{to_date}  raw {old * 1000:8.1f} ms  "
+              f"rollup {new * 1000:8.1f} ms  x{old / new:5.1f}  "
+              f"{f'same rows, {match}' if match else 'MISMATCH'}")
+
+    db.close()
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,194 @@
+"""Headless latency benchmark for the DigiCampus query paths.
+
+    python benchmark.py --students 10000 --days 200 --out results.json
+    python benchmark.py --sqlite bench.db --compare results.json
+
+Populates users/attendance at the requested scale (once per database),
+then runs the same functions and SQL the login page and dashboards use,
+without Tk. For each operation it reports p50/p95 latency plus the
+statements (round trips) and rows returned per call, and can save the
+results as JSON to compare against another commit's run. Rows returned
+is what reaches the app, not what the server examined; use
+`manage.py check-plans` for the latter. Attendance submits are rolled
+back, so repeated runs leave the data set as populated.
+"""
+import argparse
+import json
+import random
+import statistics
+import subprocess
+import time
+from datetime import datetime, timedelta
+
+import queries
+from auth import authenticate
+from attendance import (record_attendance, student_stats, attendance_report,
+                        KeysetSource, OffsetSource)
+from migrations import migrate
+from synthetic import populate, add_database_arguments, open_database
+
+PAGE_SIZE = 200
+
+
+class _Discard(Exception):
+    """Raised to roll back a benchmarked write."""
+
+
+def operations(db, student_ids, days, class_size, rng):
+    """name -> zero-argument callable, one per screen action."""
+    first, last = str(days[0]), str(days[-1])
+    mid = str(days[len(days) // 2])
+    next_day = str(days[-1] + timedelta(days=1))
+
+    def login():
+        n = rng.randrange(len(student_ids))
+        return authenticate(db, f"student{n}@example.com", "password")
+
+    def display_stats():
+        return student_stats(db, rng.choice(student_ids))
+
+    def view_attendance():
+        source = KeysetSource(db, queries.STUDENT_RECORDS_SELECT, queries.STUDENT_RECORDS_CONDITION,
+                              (rng.choice(student_ids),))
+        return source.page(None, True, PAGE_SIZE)
+
+    def view_todays_status():
+        return db.fetch_one(queries.STUDENT_TODAY, (rng.choice(student_ids), mid))
+
+    def roster():
+        return db.fetch_all(queries.ROSTER)
+
+    def view_all_records():
+        return KeysetSource(db, queries.ALL_RECORDS_SELECT).page(None, True, PAGE_SIZE)
+
+    def view_todays_records():
+        return OffsetSource(db, queries.TODAYS_RECORDS, (mid,)).page(None, True, PAGE_SIZE)
+
+    def submit_attendance_batch():
+        # a day past the data, rolled back after, so every call is a real insert
+        students = rng.sample(student_ids, min(class_size, len(student_ids)))
+        try:
+            with db.transaction():
+                record_attendance(db, [(s, next_day, "present") for s in students])
+                raise _Discard
+        except _Discard:
+            pass
+
+    def display_report():
+        return attendance_report(db, first, last)
+
+    def display_report_partial():
+        return attendance_report(db, f"{first[:7]}-15", f"{last[:7]}-10")
+
+    return {
+        'login': login,
+        'display_stats': display_stats,
+        'view_attendance': view_attendance,
+        'view_todays_status': view_todays_status,
+        'roster': roster,
+        'view_all_records': view_all_records,
+        'view_todays_records': view_todays_records,
+        'submit_attendance_batch': submit_attendance_batch,
+        'display_report': display_report,
+        'display_report_partial': display_report_partial,
+    }
+
+
+def measure(db, fn, iterations):
+    times = []
+    before = db.counters()
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    after = db.counters()
+
+    times.sort()
+    cuts = statistics.quantiles(times, n=100) if len(times) > 1 else times * 99
+    return {
+        'iterations': iterations,
+        'p50_ms': cuts[49] * 1000,
+        'p95_ms': cuts[94] * 1000,
+        'max_ms': times[-1] * 1000,
+        'statements_per_call': (after['statements'] - before['statements']) / iterations,
+        'rows_per_call': (after['rows_returned'] - before['rows_returned']) / iterations,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results, baseline=None):
+    print(f"{'operation':26} {'p50 ms':>9} {'p95 ms':>9} {'stmts':>6} {'rows out':>8}"
+          + ("   p50 vs baseline" if baseline else ""))
+    for name, r in results.items():
+        line = (f"{name:26} {r['p50_ms']:9.2f} {r['p95_ms']:9.2f} "
+                f"{r['statements_per_call']:6.1f} {r['rows_per_call']:8.1f}")
+        old = (baseline or {}).get(name)
+        if old:
+            line += f"   {(r['p50_ms'] - old['p50_ms']) / old['p50_ms'] * 100:+7.1f}%"
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--students", type=int, default=10000)
+    parser.add_argument("--days", type=int, default=200)
+    parser.add_argument("--class-size", type=int, default=500, help="students per attendance submit")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--only", nargs="*", help="run just these operations")
+    parser.add_argument("--out", help="write results to this JSON file")
+    parser.add_argument("--compare", help="JSON file from an earlier run to compare against")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--no-cache", action="store_true", help="disable the Database result cache")
+    add_database_arguments(parser)
+    args = parser.parse_args(argv)
+
+    db = open_database(args)
+    if args.no_cache:
+        db.cache.max_entries = 0
+    migrate(db)
+    if db.fetch_one("SELECT COUNT(*) FROM attendance")[0] == 0:
+        print(f"Populating {args.students:,} students x {args.days} days...")
+        student_ids, days = populate(db, args.students, args.days)
+    else:
+        student_ids = [row[0] for row in db.fetch_all(queries.ROSTER)]
+        days = [datetime.strptime(str(row[0]), "%Y-%m-%d").date()
+                for row in db.fetch_all("SELECT DISTINCT date FROM attendance ORDER BY date")]
+        print(f"Using existing data: {len(student_ids):,} students, {len(days)} days.")
+
+    ops = operations(db, student_ids, days, args.class_size, random.Random(args.seed))
+    results = {}
+    for name, fn in ops.items():
+        if args.only and name not in args.only:
+            continue
+        fn()  # warm up caches and connections
+        results[name] = measure(db, fn, args.iterations)
+    db.close()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+    print_results(results, baseline)
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({
+                'commit': git_commit(),
+                'timestamp': datetime.now().isoformat(timespec="seconds"),
+                'backend': db.dialect,
+                'scale': {'students': len(student_ids), 'days': len(days)},
+                'cache': not args.no_cache,
+                'results': results,
+            }, f, indent=2)
+        print(f"Results written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""TTL + LRU result cache used by Database for opted-in reads.
+
+Entries are tagged with the tables their query reads. A write to a table
+drops only the entries tagged with it; entries also expire after `ttl`
+seconds so changes made by other processes show up eventually.
+"""
+import re
+import threading
+import time
+from collections import OrderedDict
+
+_READ_TABLES = re.compile(r"\b(?:FROM|JOIN)\s+`?(\w+)", re.I)
+_WRITE_TABLES = re.compile(r"^\s*(?:INSERT\s+(?:OR\s+\w+\s+|IGNORE\s+)?INTO|REPLACE\s+INTO|UPDATE|"
+                           r"DELETE\s+(?:\w+\s+)?FROM|ALTER\s+TABLE|DROP\s+TABLE|TRUNCATE(?:\s+TABLE)?)"
+                           r"\s+`?(\w+)", re.I)
+_SPACE = re.compile(r"\s+")
+
+
+def read_tables(sql):
+    return frozenset(name.lower() for name in _READ_TABLES.findall(sql))
+
+
+def written_table(sql):
+    match = _WRITE_TABLES.match(sql)
+    return match.group(1).lower() if match else None
+
+
+def cache_key(sql, params):
+    return _SPACE.sub(" ", sql).strip(), tuple(params or ())
+
+
+class QueryCache:
+    def __init__(self, max_entries=512, ttl=60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()    # key -> (expires, value, tags)
+        self._by_tag = {}
+        self._generations = {}           # tag -> times invalidated; see generation()
+        self._cleared = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key):
+        """(True, value) on a live hit, else (False, None)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+            if entry[0] < time.monotonic():
+                self._drop(key)
+                self.expirations += 1
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[1]
+
+    def generation(self, tags):
+        """Token for put(): take it before running the query, so a fill
+        that raced an invalidation of one of its tables is not stored."""
+        with self._lock:
+            return self._cleared, tuple(self._generations.get(tag, 0) for tag in sorted(tags))
+
+    def put(self, key, value, tags, generation=None):
+        with self._lock:
+            if generation is not None and generation != (
+                    self._cleared, tuple(self._generations.get(tag, 0) for tag in sorted(tags))):
+                return
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic() + self.ttl, value, tags)
+            for tag in tags:
+                self._by_tag.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, *tags):
+        with self._lock:
+            for tag in tags:
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+                for key in self._by_tag.pop(tag, ()):
+                    if key in self._entries:
+                        self._drop(key)
+                        self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_tag.clear()
+            self._cleared += 1
+
+    def _drop(self, key):
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_tag[tag]
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations,
+            }
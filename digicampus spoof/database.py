@@ -1,53 +1,381 @@
-import tkinter as tk
-from tkinter import ttk, messagebox
-from datetime import datetime
-import mysql.connector
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+from backends import MySQLBackend
+from cache import QueryCache, cache_key, read_tables, written_table
+from events import EventBus
+from instrumentation import QueryRecorder
+
+
+class ConnectionPool:
+    """Fixed-size pool that opens connections lazily, on first checkout."""
+
+    def __init__(self, connect, size=5, timeout=30):
+        self.connect = connect
+        self.size = size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+
+        # stats
+        self.checkouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def acquire(self):
+        start = time.perf_counter()
+        conn = None
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_open = self._opened < self.size
+                if can_open:
+                    self._opened += 1
+            if can_open:
+                try:
+                    conn = self.connect()
+                except Exception:
+                    with self._lock:
+                        self._opened -= 1
+                    raise
+            else:
+                try:
+                    conn = self._idle.get(timeout=self.timeout)
+                except queue.Empty:
+                    raise TimeoutError(f"No database connection free after {self.timeout}s") from None
+
+        waited = time.perf_counter() - start
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+        return conn
+
+    def release(self, conn, reset=True):
+        """Return a connection to the pool. Unless the caller just committed
+        or rolled back, end whatever transaction its reads opened: MySQL
+        connections don't autocommit, and a REPEATABLE READ snapshot left
+        open would hide other connections' commits from the next user."""
+        if reset:
+            try:
+                conn.rollback()
+            except Exception:
+                self.discard(conn)
+                return
+        self._idle.put(conn)
+
+    def discard(self, conn):
+        """Drop a broken connection so a fresh one is opened next time."""
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._lock:
+            self._opened -= 1
+
+    def close(self):
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self.discard(conn)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'size': self.size,
+                'opened': self._opened,
+                'idle': self._idle.qsize(),
+                'checkouts': self.checkouts,
+                'total_wait': self.total_wait,
+                'avg_wait': self.total_wait / self.checkouts if self.checkouts else 0.0,
+                'max_wait': self.max_wait,
+            }
+
 
 # Database Connection
 class Database:
-    def __init__(self):
-        self.db = mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password="your_password_here",  # <-- replace with your MySQL password
-            database="attendance_system"
-        )
-        self.cursor = self.db.cursor()
+    """Pooled database access (MySQL by default, see backends.py).
+
+    Nothing connects until the first query. Plain reads borrow a connection
+    for the single statement; writes keep the connection pinned to the
+    calling thread until commit()/rollback(), so the execute_query + commit
+    pattern used by the dashboards keeps working from any thread.
+    """
+
+    def __init__(self, host="localhost", user="root",
+                 password="your_password_here",  # <-- replace with your MySQL password
+                 database="attendance_system", pool_size=5, pool_timeout=30, backend=None,
+                 recorder=None, cache_size=512, cache_ttl=60):
+        self.backend = backend or MySQLBackend(host, user, password, database)
+        self.dialect = self.backend.dialect
+        self.IntegrityError = self.backend.IntegrityError
+        self.pool = ConnectionPool(self.backend.connect, size=pool_size, timeout=pool_timeout)
+        self._local = threading.local()
+
+        self.recorder = recorder or QueryRecorder()
+        self.cache = QueryCache(max_entries=cache_size, ttl=cache_ttl)
+        self.events = EventBus()
+
+        # round trips and rows returned, for benchmarks
+        self._count_lock = threading.Lock()
+        self.statements = 0
+        self.rows_returned = 0
+
+    def _record(self, query, start, rows=0, error=False):
+        self.recorder.record(query, time.perf_counter() - start, rows, error)
+        with self._count_lock:
+            self.statements += 1
+            self.rows_returned += rows
+
+    @contextmanager
+    def connection(self):
+        """Yield this thread's open transaction connection, or a pooled one."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            yield conn
+            return
+
+        conn = self.pool.acquire()
+        broken = False
+        try:
+            yield conn
+        except self.backend.ConnectionLost as exc:
+            broken = self.backend.connection_lost(exc)
+            raise
+        finally:
+            if broken:
+                self.pool.discard(conn)
+            else:
+                self.pool.release(conn)
+
+    @contextmanager
+    def cursor(self):
+        """Context-managed cursor on its own connection; the cursor is closed on exit."""
+        with self.connection() as conn:
+            cur = conn.cursor()
+            try:
+                yield cur
+            finally:
+                cur.close()
+
+    @contextmanager
+    def transaction(self):
+        """Run the block in one transaction: commit on success, roll back on error."""
+        if getattr(self._local, 'conn', None) is not None:
+            # already inside a transaction on this thread
+            yield self
+            return
+        self._begin()
+        try:
+            yield self
+        except BaseException:
+            self.rollback()
+            raise
+        else:
+            self.commit()
+
+    def _begin(self):
+        if getattr(self._local, 'conn', None) is None:
+            self._local.conn = self.pool.acquire()
+        return self._local.conn
+
+    def _end(self):
+        conn = self._local.conn
+        self._local.conn = None
+        self.pool.release(conn, reset=False)
+
+    def _invalidate(self, query):
+        table = written_table(query)
+        if table is not None:
+            self.cache.invalidate(table)
+            # again at commit, in case another thread cached pre-commit rows meanwhile
+            written = getattr(self._local, 'written', None)
+            if written is None:
+                written = self._local.written = set()
+            written.add(table)
 
     def execute_query(self, query, params=None):
-        self.cursor.execute(query, params or ())
-        return self.cursor
+        conn = self._begin()
+        cur = conn.cursor()
+        start = time.perf_counter()
+        try:
+            cur.execute(self.backend.translate(query), params or ())
+        except Exception as exc:
+            self._record(query, start, error=True)
+            if isinstance(exc, self.backend.ConnectionLost) and self.backend.connection_lost(exc):
+                self._local.conn = None
+                self.pool.discard(conn)
+            raise
+        self._record(query, start)
+        self._invalidate(query)
+        return cur
+
+    def execute_many(self, query, rows):
+        """Run one statement for many parameter rows (batched into a multi-row INSERT)."""
+        conn = self._begin()
+        cur = conn.cursor()
+        start = time.perf_counter()
+        try:
+            cur.executemany(self.backend.translate(query), rows)
+        except Exception as exc:
+            self._record(query, start, error=True)
+            if isinstance(exc, self.backend.ConnectionLost) and self.backend.connection_lost(exc):
+                self._local.conn = None
+                self.pool.discard(conn)
+            raise
+        self._record(query, start)
+        self._invalidate(query)
+        return cur
+
+    def publish(self, topic, delta=None):
+        """Publish a change on the event bus once this thread's transaction
+        commits (right away outside one); dropped on rollback."""
+        if getattr(self._local, 'conn', None) is None:
+            self.events.publish(topic, delta)
+            return
+        pending = getattr(self._local, 'pending', None)
+        if pending is None:
+            pending = self._local.pending = []
+        pending.append((topic, delta))
 
     def commit(self):
-        self.db.commit()
-
-    def fetch_one(self, query, params=None):
-        self.cursor.execute(query, params or ())
-        return self.cursor.fetchone()
-
-    def fetch_all(self, query, params=None):
-        self.cursor.execute(query, params or ())
-        return self.cursor.fetchall()
-
-db = Database()
-
-# Ensure assignments and projects tables exist
-db.execute_query('''
-CREATE TABLE IF NOT EXISTS assignments (
-    id INT AUTO_INCREMENT PRIMARY KEY,
-    title VARCHAR(255),
-    description TEXT,
-    due_date DATE,
-    created_by INT
-)
-''')
-db.execute_query('''
-CREATE TABLE IF NOT EXISTS projects (
-    id INT AUTO_INCREMENT PRIMARY KEY,
-    title VARCHAR(255),
-    description TEXT,
-    due_date DATE,
-    created_by INT
-)
-''')
-db.commit()
+        if getattr(self._local, 'conn', None) is None:
+            return
+        pending = getattr(self._local, 'pending', None) or ()
+        self._local.pending = None
+        try:
+            self._local.conn.commit()
+        except BaseException:
+            pending = ()
+            raise
+        finally:
+            self._end()
+            self.cache.invalidate(*(getattr(self._local, 'written', None) or ()))
+            self._local.written = None
+            for topic, delta in pending:
+                self.events.publish(topic, delta)
+
+    def rollback(self):
+        if getattr(self._local, 'conn', None) is None:
+            return
+        try:
+            self._local.conn.rollback()
+        finally:
+            self._end()
+            self._local.written = None
+            self._local.pending = None
+
+    def fetch_one(self, query, params=None, cached=False, prepared=False):
+        """First row of the result; cached=True serves it from the result cache,
+        prepared=True runs it as a prepared statement (for hot lookups)."""
+        if cached:
+            return self._cached(self.fetch_one, query, params)
+        if prepared:
+            rows = self._prepared(query, params)
+            return rows[0] if rows else None
+        start = time.perf_counter()
+        try:
+            with self.cursor() as cur:
+                cur.execute(self.backend.translate(query), params or ())
+                row = cur.fetchone()
+                cur.fetchall()  # drain so the connection is clean for the next user
+        except Exception:
+            self._record(query, start, error=True)
+            raise
+        self._record(query, start, 0 if row is None else 1)
+        return row
+
+    def fetch_all(self, query, params=None, cached=False):
+        """All rows of the result; cached=True serves them from the result cache."""
+        if cached:
+            return list(self._cached(self.fetch_all, query, params))
+        start = time.perf_counter()
+        try:
+            with self.cursor() as cur:
+                cur.execute(self.backend.translate(query), params or ())
+                rows = cur.fetchall()
+        except Exception:
+            self._record(query, start, error=True)
+            raise
+        self._record(query, start, len(rows))
+        return rows
+
+    def stream(self, query, params=None, batch_size=1000):
+        """Yield the result in lists of up to `batch_size` rows.
+
+        Reads through an unbuffered cursor on a connection of its own, so
+        only one batch is in memory at a time. The connection is held until
+        the generator is exhausted or closed; one closed early is dropped
+        rather than drained.
+        """
+        conn = self.pool.acquire()
+        elapsed = 0.0  # time in the driver only, not in the consumer
+        rows = 0
+        finished = failed = False
+        try:
+            start = time.perf_counter()
+            cur = self.backend.stream_cursor(conn)
+            cur.execute(self.backend.translate(query), params or ())
+            while True:
+                batch = cur.fetchmany(batch_size)
+                elapsed += time.perf_counter() - start
+                if not batch:
+                    break
+                rows += len(batch)
+                yield batch
+                start = time.perf_counter()
+            cur.close()
+            finished = True
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self._record(query, time.perf_counter() - elapsed, rows, failed)
+            if finished:
+                self.pool.release(conn)
+            else:
+                self.pool.discard(conn)
+
+    def _prepared(self, query, params):
+        start = time.perf_counter()
+        try:
+            with self.connection() as conn:
+                rows = self.backend.execute_prepared(conn, query, params or ())
+        except Exception:
+            self._record(query, start, error=True)
+            raise
+        self._record(query, start, len(rows))
+        return rows
+
+    def _cached(self, fetch, query, params):
+        key = cache_key(query, params)
+        hit, value = self.cache.get(key)
+        if not hit:
+            tags = read_tables(query)
+            generation = self.cache.generation(tags)
+            value = fetch(query, params)
+            if isinstance(value, list):
+                value = tuple(value)
+            if getattr(self._local, 'conn', None) is None:
+                # don't cache what an open transaction can see but others can't
+                # nor what a commit invalidated while the query was running
+                self.cache.put(key, value, tags, generation)
+        return value
+
+    def pool_stats(self):
+        return self.pool.stats()
+
+    def cache_stats(self):
+        return self.cache.stats()
+
+    def counters(self):
+        return {'statements': self.statements, 'rows_returned': self.rows_returned}
+
+    def close(self):
+        self.pool.close()
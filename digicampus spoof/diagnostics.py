@@ -0,0 +1,90 @@
+"""Hidden Diagnostics window (Ctrl+Shift+D on the teacher dashboard)."""
+import tkinter as tk
+from datetime import datetime
+from tkinter import ttk
+
+COLUMNS = ("Statement", "Count", "Total ms", "Avg ms", "~p95 ms", "Max ms", "Rows", "Errors", "On Tk thread",
+           "Called from")
+
+
+class DiagnosticsWindow:
+    def __init__(self, parent, db):
+        self.db = db
+        self.top = tk.Toplevel(parent)
+        # name callers of every statement while the window is open, not just slow ones
+        tracked = db.recorder.track_callers
+        db.recorder.track_callers = True
+        self.top.bind("<Destroy>", lambda e: self.stop_tracking(tracked) if e.widget is self.top else None,
+                      add="+")
+        self.top.title("Diagnostics")
+        self.top.geometry("1100x550")
+
+        header = ttk.Frame(self.top)
+        header.pack(fill="x", padx=10, pady=10)
+        ttk.Label(header, text="Query Diagnostics", style="Header.TLabel").pack(side="left")
+        ttk.Button(header, text="Reset", command=self.reset).pack(side="right")
+        ttk.Button(header, text="Refresh", command=self.refresh).pack(side="right", padx=5)
+        self.pool_label = ttk.Label(self.top, text="")
+        self.pool_label.pack(anchor="w", padx=10)
+        self.cache_label = ttk.Label(self.top, text="")
+        self.cache_label.pack(anchor="w", padx=10)
+
+        notebook = ttk.Notebook(self.top)
+        notebook.pack(fill="both", expand=True, padx=10, pady=10)
+        self.by_total = self.make_tree(notebook, "Top by total time")
+        self.by_count = self.make_tree(notebook, "Top by count")
+        self.slow = self.make_tree(notebook, "Slow queries", ("When", "Statement", "ms", "Rows", "Called from"))
+
+        self.refresh()
+
+    def make_tree(self, notebook, title, columns=COLUMNS):
+        frame = ttk.Frame(notebook)
+        notebook.add(frame, text=title)
+        tree = ttk.Treeview(frame, columns=columns, show="headings")
+        for col in columns:
+            tree.heading(col, text=col)
+            wide = col in ("Statement", "Called from")
+            tree.column(col, width=320 if wide else 80, anchor="w" if wide else "e")
+        vsb = ttk.Scrollbar(frame, orient="vertical", command=tree.yview)
+        tree.configure(yscrollcommand=vsb.set)
+        tree.pack(side="left", fill="both", expand=True)
+        vsb.pack(side="right", fill="y")
+        return tree
+
+    def fill(self, tree, stats):
+        tree.delete(*tree.get_children())
+        for s in stats:
+            tree.insert("", "end", values=(
+                s.sql, s.count, f"{s.total * 1000:.1f}", f"{s.total / s.count * 1000:.2f}",
+                f"{s.percentile_ms(0.95):.1f}", f"{s.max * 1000:.1f}", s.rows, s.errors, s.main_thread,
+                ", ".join(sorted(s.callers))))
+
+    def refresh(self):
+        recorder = self.db.recorder
+        self.fill(self.by_total, recorder.top("total"))
+        self.fill(self.by_count, recorder.top("count"))
+
+        self.slow.delete(*self.slow.get_children())
+        for event in reversed(recorder.slow_events()):
+            self.slow.insert("", "end", values=(
+                datetime.fromtimestamp(event.at).strftime("%H:%M:%S"), event.sql,
+                f"{event.seconds * 1000:.1f}", event.rows, event.caller))
+
+        pool = self.db.pool_stats()
+        self.pool_label.config(
+            text=f"Pool: {pool['opened']}/{pool['size']} open, {pool['idle']} idle, "
+                 f"{pool['checkouts']} checkouts, avg wait {pool['avg_wait'] * 1000:.2f} ms, "
+                 f"max wait {pool['max_wait'] * 1000:.1f} ms   "
+                 f"Slow threshold: {recorder.slow_threshold * 1000:.0f} ms")
+        cache = self.db.cache_stats()
+        self.cache_label.config(
+            text=f"Cache: {cache['entries']} entries, {cache['hits']} hits, {cache['misses']} misses, "
+                 f"{cache['evictions']} evictions, {cache['expirations']} expired, "
+                 f"{cache['invalidations']} invalidated")
+
+    def stop_tracking(self, previous):
+        self.db.recorder.track_callers = previous
+
+    def reset(self):
+        self.db.recorder.reset()
+        self.refresh()
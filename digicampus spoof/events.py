@@ -0,0 +1,103 @@
+"""In-process change notifications for the dashboards.
+
+Writes publish a small delta on a topic named after the table they
+changed, once their transaction commits (see Database.publish):
+
+    'attendance'  [(student_id, date, status), ...] rows inserted
+    'users'       [(id, name, role), ...] accounts created
+
+A delta of None means "changed, but I don't know how": re-read. That is
+what ChangePoller publishes when another process writes, which it spots
+with a cheap MAX(id) check on an interval. Subscribers run on the
+publishing thread; Tk code subscribes through QueryExecutor.reporter().
+"""
+import logging
+import threading
+
+log = logging.getLogger("digicampus.events")
+
+# tables kept in step with a polled table by the same writes; another
+# process moving the polled table has moved these too
+DERIVED = {'attendance': ('attendance_summary', 'attendance_monthly')}
+
+
+class EventBus:
+    def __init__(self):
+        self._subscribers = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, topic, fn):
+        """Call fn(delta) for every change on `topic`; returns an unsubscribe function."""
+        with self._lock:
+            self._subscribers.setdefault(topic, []).append(fn)
+
+        def unsubscribe():
+            with self._lock:
+                subscribers = self._subscribers.get(topic, [])
+                if fn in subscribers:
+                    subscribers.remove(fn)
+        return unsubscribe
+
+    def publish(self, topic, delta=None):
+        with self._lock:
+            subscribers = list(self._subscribers.get(topic, ()))
+        for fn in subscribers:
+            try:
+                fn(delta)
+            except Exception:
+                # a broken subscriber must not fail the write that published
+                log.exception("subscriber to %r failed", topic)
+
+
+class ChangePoller:
+    """Publishes None on a table's topic when its MAX(id) moves.
+
+    Catches inserts made by other processes (another teacher's app, the
+    import command). MAX(id) only grows on INSERT, so an UPDATE or DELETE
+    elsewhere goes unnoticed until the cached reads of that table expire
+    (QueryCache ttl). In-process writes are published directly, and also
+    trigger one poll-driven re-read.
+    """
+
+    def __init__(self, db, executor, tables=("attendance", "users"), interval_ms=5000):
+        self.db = db
+        self.executor = executor
+        self.tables = tables
+        self.interval_ms = interval_ms
+        self.latest = None
+        self.running = False
+
+    def start(self):
+        self.running = True
+        self._schedule()
+
+    def stop(self):
+        self.running = False
+
+    def _schedule(self):
+        if self.running:
+            self.executor.root.after(self.interval_ms, self._poll)
+
+    def _poll(self):
+        if not self.running:
+            return
+        self.executor.submit(self.latest_ids, on_done=self._compare, on_error=self._failed)
+
+    def latest_ids(self):
+        # one transaction, committed after the reads, so the poll never runs
+        # in a snapshot older than itself and never leaves one open
+        with self.db.transaction():
+            return {table: self.db.fetch_one(f"SELECT MAX(id) FROM {table}")[0] for table in self.tables}
+
+    def _compare(self, latest):
+        previous, self.latest = self.latest, latest
+        if previous is not None:
+            for table in self.tables:
+                if latest[table] != previous[table]:
+                    self.db.cache.invalidate(table, *DERIVED.get(table, ()))
+                    self.db.events.publish(table, None)
+        self._schedule()
+
+    def _failed(self, exc):
+        log.warning("change poll failed: %s", exc)
+        self._schedule()
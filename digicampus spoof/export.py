@@ -0,0 +1,74 @@
+"""Streaming CSV export of attendance records and reports (no Tk in here).
+
+Rows are read with Database.stream and written as they arrive, so memory
+use is one batch whatever the date range. Files are written under a
+temporary name and renamed at the end; a cancelled or failed export
+leaves nothing behind.
+"""
+import csv
+import gzip
+import os
+
+import queries
+from attendance import report_query
+
+RECORD_HEADER = ("Student ID", "Student", "Date", "Status")
+REPORT_HEADER = ("Student", "Present", "Absent", "Total", "Percentage")
+
+
+class ExportCancelled(Exception):
+    pass
+
+
+def _open(path, compress):
+    # utf-8-sig so Excel detects the encoding of student names
+    if compress:
+        return gzip.open(path, "wt", newline="", encoding="utf-8-sig")
+    return open(path, "w", newline="", encoding="utf-8-sig")
+
+
+def write_csv(db, path, query, params, header, batch_size=5000, compress=None, total=None,
+              progress=None, stop=None):
+    """Stream `query` into a CSV file at `path`; returns the rows written.
+
+    compress=None gzips when the path ends in .gz. progress(done, total)
+    is called after each batch; stop() returning true cancels the export
+    with ExportCancelled.
+    """
+    if compress is None:
+        compress = path.endswith(".gz")
+    partial = path + ".part"
+    done = 0
+    try:
+        with _open(partial, compress) as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            batches = db.stream(query, params, batch_size=batch_size)
+            try:
+                for batch in batches:
+                    if stop is not None and stop():
+                        raise ExportCancelled(f"Export cancelled after {done} rows")
+                    writer.writerows(batch)
+                    done += len(batch)
+                    if progress is not None:
+                        progress(done, total)
+            finally:
+                batches.close()
+        os.replace(partial, path)
+    except BaseException:
+        if os.path.exists(partial):
+            os.remove(partial)
+        raise
+    return done
+
+
+def export_records(db, path, from_date, to_date, **options):
+    """Every attendance record between the dates, oldest first."""
+    total = db.fetch_one(queries.EXPORT_COUNT, (from_date, to_date))[0]
+    return write_csv(db, path, queries.EXPORT_RECORDS, (from_date, to_date), RECORD_HEADER,
+                     total=total, **options)
+
+
+def export_report(db, path, from_date, to_date, **options):
+    """The per-student report for the range, as shown by Generate Report."""
+    return write_csv(db, path, *report_query(from_date, to_date), REPORT_HEADER, **options)
@@ -0,0 +1,108 @@
+"""Bulk attendance import from card-reader CSV files (no Tk in here).
+
+The file is read a row at a time and handed to record_attendance in
+batches, so imported rows go through the same unique-key de-duplication
+(and summary/rollup upkeep) as rows marked by hand, one transaction per
+batch. Expected columns are student_id, date (YYYY-MM-DD) and an optional
+status (present/absent, default present); a header row naming them may
+come first and set their order. .gz files are read compressed.
+"""
+import csv
+import gzip
+import time
+from datetime import date as Date
+
+import queries
+from attendance import record_attendance
+
+STATUSES = ("present", "absent")
+MAX_REJECTS = 100
+
+
+class ImportCancelled(Exception):
+    pass
+
+
+def student_ids(db):
+    """Ids of every student, from the cached roster query."""
+    return {row[0] for row in db.fetch_all(queries.ROSTER, cached=True)}
+
+
+def _open(path):
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", newline="", encoding="utf-8-sig")
+    return open(path, newline="", encoding="utf-8-sig")
+
+
+def _parse(record, columns, known):
+    """(student_id, date, status) or raise ValueError with the reason."""
+    try:
+        student_id = int(record[columns['student_id']])
+    except (IndexError, ValueError):
+        raise ValueError("bad student id") from None
+    if student_id not in known:
+        raise ValueError(f"unknown student {student_id}")
+    try:
+        day = Date.fromisoformat(record[columns['date']].strip()).isoformat()
+    except (IndexError, ValueError):
+        raise ValueError("bad date") from None
+    status = "present"
+    if 'status' in columns and columns['status'] < len(record):
+        status = record[columns['status']].strip().lower() or status
+    if status not in STATUSES:
+        raise ValueError(f"bad status {status!r}")
+    return student_id, day, status
+
+
+def import_csv(db, path, batch_size=1000, progress=None, stop=None):
+    """Import one file; returns a dict of counts and timing.
+
+    progress(stats) is called after each batch with the running totals;
+    stop() returning true cancels with ImportCancelled (batches already
+    committed stay committed). Up to MAX_REJECTS rejected lines are kept
+    as (line number, reason).
+    """
+    known = student_ids(db)
+    stats = {'rows': 0, 'inserted': 0, 'duplicates': 0, 'rejected': 0, 'rejects': [],
+             'seconds': 0.0, 'rows_per_sec': 0.0}
+    start = time.perf_counter()
+
+    def flush(batch):
+        inserted, skipped = record_attendance(db, batch)
+        stats['inserted'] += inserted
+        stats['duplicates'] += skipped
+        stats['seconds'] = time.perf_counter() - start
+        stats['rows_per_sec'] = stats['rows'] / stats['seconds'] if stats['seconds'] else 0.0
+        if progress is not None:
+            progress(dict(stats, rejects=list(stats['rejects'])))
+
+    columns = {'student_id': 0, 'date': 1, 'status': 2}
+    batch = []
+    with _open(path) as f:
+        reader = csv.reader(f)
+        end = 0
+        for record in reader:
+            # physical line the record starts on (a quoted field may span lines)
+            line, end = end + 1, reader.line_num
+            if not record or not any(field.strip() for field in record):
+                continue
+            if line == 1 and not record[0].strip().isdigit():
+                names = [field.strip().lower() for field in record]
+                if 'student_id' in names and 'date' in names:
+                    columns = {name: names.index(name) for name in ('student_id', 'date', 'status')
+                               if name in names}
+                    continue
+            stats['rows'] += 1
+            try:
+                batch.append(_parse(record, columns, known))
+            except ValueError as exc:
+                stats['rejected'] += 1
+                if len(stats['rejects']) < MAX_REJECTS:
+                    stats['rejects'].append((line, str(exc)))
+            if len(batch) >= batch_size:
+                if stop is not None and stop():
+                    raise ImportCancelled(f"Import cancelled after {stats['inserted']} rows")
+                flush(batch)
+                batch = []
+    flush(batch)
+    return stats
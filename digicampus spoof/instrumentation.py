@@ -0,0 +1,179 @@
+"""Per-statement timing for Database, shown in the teacher's Diagnostics window.
+
+Every statement is recorded with its normalized SQL, wall time, rows
+returned, whether it failed and whether it ran on the Tk main thread.
+Recent events go in a ring buffer; per-statement totals and a latency
+histogram are kept for the lifetime of the process. Statements slower
+than `slow_threshold` are also logged.
+
+The dashboard method that asked for a statement costs a stack walk, so
+it is only looked up for slow or failed statements, unless
+`track_callers` is set (the Diagnostics window sets it when opened).
+Background tasks name their submitter through context() for free.
+"""
+import logging
+import re
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import deque, namedtuple
+from contextlib import contextmanager
+from functools import lru_cache
+
+log = logging.getLogger("digicampus.slow_queries")
+
+# histogram bucket upper bounds, in milliseconds
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, float("inf"))
+
+QueryEvent = namedtuple("QueryEvent", "at sql caller seconds rows main_thread error")
+
+_STRING = re.compile(r"'(?:[^'\\]|\\.)*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_ROW_LIST = re.compile(r"\(\s*\(\?, \?\)(?:\s*,\s*\(\?, \?\))*\s*\)")
+_SPACE = re.compile(r"\s+")
+
+_INTERNAL_FILES = ("database.py", "instrumentation.py", "background.py", "contextlib.py", "threading.py")
+_UI_FILES = ("_dashboard.py", "login_page.py", "_view.py", "diagnostics.py")
+
+_context = threading.local()
+
+
+@lru_cache(maxsize=1024)
+def normalize_sql(sql):
+    """SQL text with literals and placeholder lists collapsed, for grouping."""
+    sql = sql.replace("%s", "?")
+    sql = _STRING.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _SPACE.sub(" ", sql).strip()
+    sql = _ROW_LIST.sub("((?, ?), ...)", sql)
+    return _IN_LIST.sub("(?, ...)", sql)
+
+
+def caller_name():
+    """module.Class.method that issued the statement.
+
+    Prefers the nearest dashboard/login/view frame, else the nearest frame
+    outside the database plumbing.
+    """
+    frame = sys._getframe(1)
+    fallback = None
+    while frame is not None:
+        code = frame.f_code
+        if not code.co_filename.endswith(_INTERNAL_FILES):
+            name = f"{frame.f_globals.get('__name__', '?')}.{getattr(code, 'co_qualname', code.co_name)}"
+            if code.co_filename.endswith(_UI_FILES):
+                return name
+            fallback = fallback or name
+        frame = frame.f_back
+    return fallback or "?"
+
+
+@contextmanager
+def context(label):
+    """Attribute statements run inside the block to `label` (e.g. the method
+    that submitted a background task)."""
+    previous = getattr(_context, "label", None)
+    _context.label = label
+    try:
+        yield
+    finally:
+        _context.label = previous
+
+
+class StatementStats:
+    __slots__ = ("sql", "count", "total", "max", "rows", "main_thread", "errors", "histogram", "callers")
+
+    def __init__(self, sql):
+        self.sql = sql
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rows = 0
+        self.main_thread = 0
+        self.errors = 0
+        self.histogram = [0] * len(BUCKETS_MS)
+        self.callers = set()
+
+    def add(self, seconds, rows, main_thread, caller, error=False):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.rows += rows
+        self.main_thread += main_thread
+        self.errors += error
+        self.histogram[bisect_left(BUCKETS_MS, seconds * 1000)] += 1
+        if caller is not None:
+            self.callers.add(caller)
+
+    def copy(self):
+        other = StatementStats(self.sql)
+        for name in self.__slots__[1:]:
+            setattr(other, name, getattr(self, name))
+        other.histogram = list(self.histogram)
+        other.callers = set(self.callers)
+        return other
+
+    def percentile_ms(self, fraction):
+        """Upper bucket bound holding the given fraction of calls."""
+        target = fraction * self.count
+        seen = 0
+        for bound, n in zip(BUCKETS_MS, self.histogram):
+            seen += n
+            if seen >= target:
+                return min(bound, self.max * 1000)
+        return self.max * 1000
+
+
+class QueryRecorder:
+    def __init__(self, capacity=2000, slow_threshold=0.2, track_callers=False):
+        self.events = deque(maxlen=capacity)
+        self.slow = deque(maxlen=200)
+        self.slow_threshold = slow_threshold
+        self.track_callers = track_callers
+        self.stats = {}
+        self._lock = threading.Lock()
+
+    def record(self, sql, seconds, rows, error=False):
+        slow = seconds >= self.slow_threshold
+        caller = getattr(_context, "label", None)
+        if caller is None and (self.track_callers or slow or error):
+            caller = caller_name()
+        main_thread = threading.current_thread() is threading.main_thread()
+        normalized = normalize_sql(sql)
+        event = QueryEvent(time.time(), normalized, caller, seconds, rows, main_thread, error)
+
+        with self._lock:
+            self.events.append(event)
+            stats = self.stats.get(normalized)
+            if stats is None:
+                stats = self.stats[normalized] = StatementStats(normalized)
+            stats.add(seconds, rows, main_thread, caller, error)
+            if slow:
+                self.slow.append(event)
+
+        if slow:
+            log.warning("slow %squery %.1f ms (%d rows) from %s%s: %s", "failed " if error else "",
+                        seconds * 1000, rows, caller, " on the Tk thread" if main_thread else "", normalized)
+
+    def top(self, key="total", limit=20):
+        """Statements sorted by 'total' time or 'count', largest first (copies,
+        safe to read while statements keep being recorded)."""
+        with self._lock:
+            stats = [s.copy() for s in self.stats.values()]
+        return sorted(stats, key=lambda s: getattr(s, key), reverse=True)[:limit]
+
+    def recent(self):
+        with self._lock:
+            return list(self.events)
+
+    def slow_events(self):
+        with self._lock:
+            return list(self.slow)
+
+    def reset(self):
+        with self._lock:
+            self.events.clear()
+            self.slow.clear()
+            self.stats.clear()
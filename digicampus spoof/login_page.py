@@ -1,11 +1,15 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime
-import mysql.connector
+from student_dashboard import StudentDashboard
+from teacher_dashboard import TeacherDashboard
+from auth import authenticate, create_user
 
 class LoginSignupWindow:
-    def __init__(self, root):
+    def __init__(self, root, db, executor):
         self.root = root
+        self.db = db
+        self.executor = executor
         self.root.title("DigiCampus - Login/Signup")
         self.root.geometry("400x400")
         self.setup_login()
@@ -26,7 +30,8 @@ class LoginSignupWindow:
         self.password_entry.pack(pady=10)
         self.password_entry.insert(0, "Password")
 
-        ttk.Button(self.root, text="Login", command=self.login).pack(pady=10)
+        self.login_button = ttk.Button(self.root, text="Login", command=self.login)
+        self.login_button.pack(pady=10)
         ttk.Button(self.root, text="New user? Sign Up", command=self.setup_signup).pack()
 
     def setup_signup(self):
@@ -49,24 +54,35 @@ class LoginSignupWindow:
         self.confirm_password_entry.pack(pady=10)
         self.confirm_password_entry.insert(0, "Confirm Password")
 
-        ttk.Button(self.root, text="Sign Up", command=self.signup).pack(pady=10)
+        self.signup_button = ttk.Button(self.root, text="Sign Up", command=self.signup)
+        self.signup_button.pack(pady=10)
         ttk.Button(self.root, text="Already have account? Login", command=self.setup_login).pack()
 
     def login(self):
         email = self.email_entry.get()
         password = self.password_entry.get()
 
-        user = db.fetch_one("SELECT * FROM users WHERE email = %s AND password = %s", (email, password))
-        if user:
+        # the password check is deliberately slow; keep it off the Tk thread
+        self.login_button.state(["disabled"])
+        self.executor.submit(authenticate, self.db, email, password,
+                             on_done=self.logged_in, on_error=self.login_failed,
+                             owner=self.login_button, busy=self.root)
+
+    def logged_in(self, user_data):
+        self.login_button.state(["!disabled"])
+        if user_data:
             self.root.withdraw()
-            user_data = {'id': user[0], 'name': user[1], 'email': user[2], 'role': user[4]}
             if user_data['role'] == "student":
-                StudentDashboard(tk.Toplevel(), user_data, self.root)
+                StudentDashboard(tk.Toplevel(), self.db, user_data, self.root, self.executor)
             else:
-                TeacherDashboard(tk.Toplevel(), user_data, self.root)
+                TeacherDashboard(tk.Toplevel(), self.db, user_data, self.root, self.executor)
         else:
             messagebox.showerror("Login Failed", "Invalid email or password.")
 
+    def login_failed(self, exc):
+        self.login_button.state(["!disabled"])
+        messagebox.showerror("Database Error", str(exc))
+
     def signup(self):
         name = self.name_entry.get()
         email = self.email_entry.get()
@@ -77,11 +93,20 @@ class LoginSignupWindow:
             messagebox.showerror("Error", "Passwords do not match!")
             return
 
-        try:
-            db.execute_query("INSERT INTO users (name, email, password, role) VALUES (%s, %s, %s, 'student')",
-                             (name, email, password))
-            db.commit()
-            messagebox.showinfo("Success", "Account created! You can now log in.")
-            self.setup_login()
-        except mysql.connector.errors.IntegrityError:
+        self.signup_button.state(["disabled"])
+        self.executor.submit(create_user, self.db, name, email, password,
+                             on_done=self.signed_up, on_error=self.signup_failed,
+                             owner=self.signup_button, busy=self.root)
+
+    def signed_up(self, _):
+        messagebox.showinfo("Success", "Account created! You can now log in.")
+        self.setup_login()
+
+    def signup_failed(self, exc):
+        self.signup_button.state(["!disabled"])
+        if isinstance(exc, self.db.IntegrityError):
             messagebox.showerror("Error", "Email already exists!")
+        else:
+            messagebox.showerror("Database Error", str(exc))
+
+LoginPage = LoginSignupWindow
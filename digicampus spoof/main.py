@@ -1,7 +1,13 @@
+import os
 import tkinter as tk
 from tkinter import ttk
 from database import Database
+from backends import SQLiteBackend
 from login_page import LoginPage
+from migrations import migrate
+from background import QueryExecutor
+from events import ChangePoller
+import auth
 
 def configure_styles():
     style = ttk.Style()
@@ -19,7 +25,20 @@ if __name__ == "__main__":
     root = tk.Tk()
     configure_styles()
     
-    db = Database()
-    login_page = LoginPage(root, db)
+    # DIGICAMPUS_SQLITE=path/to/file.db runs without a MySQL server
+    sqlite_path = os.environ.get("DIGICAMPUS_SQLITE")
+    db = Database(pool_size=5, backend=SQLiteBackend(sqlite_path) if sqlite_path else None)
+    db.recorder.slow_threshold = float(os.environ.get("DIGICAMPUS_SLOW_QUERY_MS", 200)) / 1000
+    # pick with bench_login.py; existing hashes are upgraded as users log in
+    auth.ITERATIONS = int(os.environ.get("DIGICAMPUS_KDF_ITERATIONS", auth.ITERATIONS))
+    migrate(db)
+    executor = QueryExecutor(root)
+    # picks up writes from other processes; in-process writes are published directly
+    poller = ChangePoller(db, executor, interval_ms=int(os.environ.get("DIGICAMPUS_POLL_MS", 5000)))
+    poller.start()
+    login_page = LoginPage(root, db, executor)
     
-    root.mainloop()
\ No newline at end of file
+    root.mainloop()
+    poller.stop()
+    executor.shutdown()
+    db.close()
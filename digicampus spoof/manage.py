@@ -0,0 +1,105 @@
+"""Maintenance commands: python manage.py <command>"""
+import argparse
+
+from database import Database
+from backends import SQLiteBackend
+from attendance import rebuild_summaries, rebuild_rollups
+from migrations import MigrationError, migrate, check_query_plans
+import auth
+from importer import import_csv
+
+
+def cmd_migrate(db, args):
+    try:
+        applied = migrate(db, target=args.target)
+    except MigrationError as exc:
+        print(exc)
+        return 1
+    if applied:
+        print("Applied migrations:", ", ".join(map(str, applied)))
+    else:
+        print("Schema is up to date.")
+
+
+def cmd_check_plans(db, args):
+    findings = check_query_plans(db)
+    for name, table, rows in findings:
+        print(f"FULL SCAN  {name}: table {table} (~{rows} rows)")
+    if not findings:
+        print("No dashboard query does a full table scan.")
+    return 1 if findings else 0
+
+
+def cmd_rebuild_summaries(db, args):
+    rebuild_summaries(db)
+    count = db.fetch_one("SELECT COUNT(*) FROM attendance_summary")[0]
+    print(f"Rebuilt attendance summaries for {count} students.")
+
+
+def cmd_rebuild_rollups(db, args):
+    rebuild_rollups(db)
+    count = db.fetch_one("SELECT COUNT(*) FROM attendance_monthly")[0]
+    print(f"Rebuilt {count} monthly attendance rollup rows.")
+
+
+def cmd_rehash_passwords(db, args):
+    if args.iterations:
+        auth.ITERATIONS = args.iterations
+    count = auth.rehash_plaintext(db, batch_size=args.batch_size, workers=args.workers,
+                                  progress=lambda done: print(f"  {done} passwords hashed", end="\r"))
+    print(f"Hashed {count} plaintext passwords at {auth.ITERATIONS} iterations.")
+
+
+def cmd_import_attendance(db, args):
+    for path in args.files:
+        stats = import_csv(db, path, batch_size=args.batch_size,
+                           progress=lambda s: print(f"  {s['rows']:,} rows, {s['rows_per_sec']:,.0f} rows/s",
+                                                    end="\r"))
+        print(f"{path}: {stats['rows']:,} rows in {stats['seconds']:.1f}s ({stats['rows_per_sec']:,.0f} rows/s), "
+              f"{stats['inserted']:,} inserted, {stats['duplicates']:,} duplicates skipped, "
+              f"{stats['rejected']:,} rejected")
+        for line, reason in stats['rejects'][:20]:
+            print(f"  line {line}: {reason}")
+        if stats['rejected'] > 20:
+            print(f"  ... and {stats['rejected'] - 20:,} more rejected lines")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="DigiCampus maintenance")
+    parser.add_argument("--sqlite", metavar="PATH", help="use this SQLite file instead of MySQL")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("migrate", help="apply pending schema migrations")
+    p.add_argument("--target", type=int, help="stop at this version")
+    p.set_defaults(func=cmd_migrate)
+
+    p = sub.add_parser("check-plans", help="flag dashboard queries whose EXPLAIN shows a full scan")
+    p.set_defaults(func=cmd_check_plans)
+
+    p = sub.add_parser("rebuild-summaries", help="recompute attendance_summary from attendance")
+    p.set_defaults(func=cmd_rebuild_summaries)
+
+    p = sub.add_parser("rebuild-rollups", help="recompute attendance_monthly from attendance")
+    p.set_defaults(func=cmd_rebuild_rollups)
+
+    p = sub.add_parser("rehash-passwords", help="replace legacy plaintext passwords with salted hashes")
+    p.add_argument("--iterations", type=int, help=f"KDF cost (default {auth.ITERATIONS})")
+    p.add_argument("--batch-size", type=int, default=500)
+    p.add_argument("--workers", type=int, help="hashing threads (default: CPU count)")
+    p.set_defaults(func=cmd_rehash_passwords)
+
+    p = sub.add_parser("import-attendance", help="bulk import attendance from card-reader CSV files")
+    p.add_argument("files", nargs="+", help="CSV files (student_id, date, status); .gz is read compressed")
+    p.add_argument("--batch-size", type=int, default=1000, help="rows per transaction")
+    p.set_defaults(func=cmd_import_attendance)
+
+    args = parser.parse_args(argv)
+    db = Database(pool_size=1, backend=SQLiteBackend(args.sqlite) if args.sqlite else None)
+    try:
+        return args.func(db, args) or 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
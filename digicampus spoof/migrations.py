@@ -0,0 +1,222 @@
+"""Versioned schema migrations and a query-plan check for the dashboard SQL.
+
+Each migration is a function taking the Database; the highest applied
+version is kept in the schema_version table and only newer ones run.
+
+On SQLite a migration and its schema_version row commit together. MySQL
+commits every CREATE/ALTER on its own, so a migration that fails there
+can leave part of its changes behind without recording its version;
+steps check before they act (IF NOT EXISTS, _index_exists) so the next
+run picks up where it stopped. Checks that can fail on existing data run
+before any DDL.
+"""
+import logging
+from datetime import datetime
+
+from attendance import rebuild_summaries, rebuild_rollups
+from queries import dashboard_queries
+
+log = logging.getLogger("digicampus.migrations")
+
+
+class MigrationError(Exception):
+    pass
+
+
+def _index_exists(db, table, index_name):
+    if db.dialect == 'sqlite':
+        return db.fetch_one(
+            "SELECT COUNT(*) FROM sqlite_master WHERE type = 'index' AND tbl_name = %s AND name = %s",
+            (table, index_name))[0] > 0
+    return db.fetch_one('''
+    SELECT COUNT(*) FROM information_schema.statistics
+    WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s
+    ''', (table, index_name))[0] > 0
+
+
+def _add_index(db, table, index_name, columns, unique=False):
+    if _index_exists(db, table, index_name):
+        return
+    if db.dialect == 'sqlite':
+        kind = "UNIQUE INDEX" if unique else "INDEX"
+        db.execute_query(f"CREATE {kind} {index_name} ON {table} ({columns})")
+    else:
+        kind = "UNIQUE KEY" if unique else "INDEX"
+        db.execute_query(f"ALTER TABLE {table} ADD {kind} {index_name} ({columns})")
+
+
+def _base_tables(db):
+    db.execute_query('''
+    CREATE TABLE IF NOT EXISTS users (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        name VARCHAR(100) NOT NULL,
+        email VARCHAR(255) NOT NULL,
+        password VARCHAR(255) NOT NULL,
+        role VARCHAR(20) NOT NULL DEFAULT 'student'
+    )
+    ''')
+    db.execute_query('''
+    CREATE TABLE IF NOT EXISTS attendance (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        student_id INT NOT NULL,
+        date DATE NOT NULL,
+        status VARCHAR(10) NOT NULL
+    )
+    ''')
+    db.execute_query('''
+    CREATE TABLE IF NOT EXISTS assignments (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        title VARCHAR(255),
+        description TEXT,
+        due_date DATE,
+        created_by INT
+    )
+    ''')
+    db.execute_query('''
+    CREATE TABLE IF NOT EXISTS projects (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        title VARCHAR(255),
+        description TEXT,
+        due_date DATE,
+        created_by INT
+    )
+    ''')
+
+
+def _dashboard_indexes(db):
+    if not _index_exists(db, 'users', 'uq_users_email'):
+        duplicates = db.fetch_all(
+            "SELECT email, COUNT(*) FROM users GROUP BY email HAVING COUNT(*) > 1 ORDER BY email")
+        if duplicates:
+            shown = ", ".join(f"{email} ({count})" for email, count in duplicates[:10])
+            more = f" and {len(duplicates) - 10} more" if len(duplicates) > 10 else ""
+            raise MigrationError(f"Can't add the unique email index: {len(duplicates)} email(s) belong "
+                                 f"to more than one account: {shown}{more}. Merge or fix those accounts "
+                                 f"and run the migration again.")
+    if not _index_exists(db, 'attendance', 'uq_attendance_student_date'):
+        conflicts = db.fetch_all('''
+        SELECT student_id, date, COUNT(*) FROM attendance
+        GROUP BY student_id, date HAVING COUNT(DISTINCT status) > 1
+        ORDER BY student_id, date
+        ''')
+        if conflicts:
+            shown = ", ".join(f"student {student_id} on {day} ({count} rows)"
+                              for student_id, day, count in conflicts[:10])
+            more = f" and {len(conflicts) - 10} more" if len(conflicts) > 10 else ""
+            raise MigrationError(f"Can't add the unique attendance key: {len(conflicts)} student-day(s) have "
+                                 f"rows with different statuses: {shown}{more}. Keep the right row for each "
+                                 f"and run the migration again.")
+        # what's left are exact repeats: keep the earliest row of each
+        if db.dialect == 'sqlite':
+            removed = db.execute_query('''
+            DELETE FROM attendance WHERE id NOT IN (
+                SELECT MIN(id) FROM attendance GROUP BY student_id, date)
+            ''').rowcount
+        else:
+            removed = db.execute_query('''
+            DELETE a1 FROM attendance a1
+            JOIN attendance a2 ON a1.student_id = a2.student_id
+             AND a1.date = a2.date AND a1.id > a2.id
+            ''').rowcount
+        if removed:
+            log.warning("removed %d repeated attendance rows before adding uq_attendance_student_date",
+                        removed)
+    # (student_id, date): stats, my records, today's status, marking de-dup
+    _add_index(db, 'attendance', 'uq_attendance_student_date', "student_id, date", unique=True)
+    # (date, student_id): today's records, date-range report, all records
+    _add_index(db, 'attendance', 'idx_attendance_date_student', "date, student_id")
+    _add_index(db, 'users', 'uq_users_email', "email", unique=True)
+    _add_index(db, 'users', 'idx_users_role', "role")
+
+
+def _attendance_summary(db):
+    db.execute_query('''
+    CREATE TABLE IF NOT EXISTS attendance_summary (
+        student_id INT PRIMARY KEY,
+        total INT NOT NULL DEFAULT 0,
+        present INT NOT NULL DEFAULT 0,
+        last_date DATE
+    )
+    ''')
+    rebuild_summaries(db)
+
+
+def _attendance_monthly(db):
+    db.execute_query('''
+    CREATE TABLE IF NOT EXISTS attendance_monthly (
+        month DATE NOT NULL,
+        student_id INT NOT NULL,
+        present INT NOT NULL DEFAULT 0,
+        absent INT NOT NULL DEFAULT 0,
+        total INT NOT NULL DEFAULT 0,
+        PRIMARY KEY (month, student_id)
+    )
+    ''')
+    rebuild_rollups(db)
+
+
+MIGRATIONS = [
+    (1, "base tables", _base_tables),
+    (2, "indexes for dashboard queries", _dashboard_indexes),
+    (3, "per-student attendance summary", _attendance_summary),
+    (4, "monthly attendance rollup", _attendance_monthly),
+]
+
+
+def current_version(db):
+    db.execute_query('''
+    CREATE TABLE IF NOT EXISTS schema_version (
+        version INT PRIMARY KEY,
+        description VARCHAR(255),
+        applied_at DATETIME
+    )
+    ''')
+    db.commit()
+    return db.fetch_one("SELECT COALESCE(MAX(version), 0) FROM schema_version")[0]
+
+
+def migrate(db, target=None):
+    """Apply pending migrations in order; returns the versions applied."""
+    version = current_version(db)
+    applied = []
+    for number, description, step in MIGRATIONS:
+        if number <= version or (target is not None and number > target):
+            continue
+        with db.transaction():
+            step(db)
+            db.execute_query(
+                "INSERT INTO schema_version (version, description, applied_at) VALUES (%s, %s, %s)",
+                (number, description, datetime.now()))
+        applied.append(number)
+    return applied
+
+
+def _full_scans(db, sql, params):
+    """Tables a statement reads with a full scan, as (table, estimated rows)."""
+    with db.cursor() as cur:
+        if db.dialect == 'sqlite':
+            cur.execute("EXPLAIN QUERY PLAN " + db.backend.translate(sql), params)
+            details = [row[3] for row in cur.fetchall()]
+            # subqueries show up as "MATERIALIZE r" / "CO-ROUTINE r" and then "SCAN r"
+            derived = {d.split()[1] for d in details if d.startswith(("MATERIALIZE ", "CO-ROUTINE "))}
+            # "SCAN a" is a table scan; "SCAN a USING (COVERING) INDEX ..." is not
+            return [(d.split()[1], None) for d in details
+                    if d.startswith("SCAN ") and " USING " not in d and d.split()[1] not in derived]
+
+        cur.execute("EXPLAIN " + sql, params)
+        columns = [d[0].lower() for d in cur.description]
+        plans = [dict(zip(columns, row)) for row in cur.fetchall()]
+        return [(plan.get('table'), plan.get('rows')) for plan in plans
+                if plan.get('type') == 'ALL' and not str(plan.get('table')).startswith('<derived')]
+
+
+def check_query_plans(db, queries=None):
+    """EXPLAIN every dashboard query and return the ones doing a full table scan.
+
+    Each finding is (query name, table, rows examined estimate).
+    """
+    findings = []
+    for name, (sql, params) in (queries or dashboard_queries()).items():
+        for table, rows in _full_scans(db, sql, params):
+            findings.append((name, table, rows))
+    return findings
@@ -0,0 +1,154 @@
+"""Treeview that loads rows a page at a time as the user scrolls.
+
+Only a bounded window of rows is kept in the widget: scrolling down
+fetches the next page and drops rows off the top, scrolling back up
+fetches the previous page and drops rows off the bottom. refresh() patches
+the first page in place after a change. Rows come from a
+source with page(key, forward, limit), see attendance.KeysetSource and
+attendance.OffsetSource.
+"""
+from tkinter import ttk
+
+
+class PagedTreeview(ttk.Frame):
+    def __init__(self, parent, columns, source, page_size=200, max_rows=1000, widths=None, anchors=None,
+                 executor=None):
+        super().__init__(parent)
+        self.source = source
+        self.executor = executor
+        self.page_size = page_size
+        self.max_rows = max(max_rows, 2 * page_size)
+        self.keys = {}
+        self.at_start = True
+        self.at_end = False
+        self.loading = False
+        self.stale = False
+
+        self.tree = ttk.Treeview(self, columns=columns, show="headings")
+        for col in columns:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=(widths or {}).get(col, 150), anchor=(anchors or {}).get(col, "center"))
+
+        self.vsb = ttk.Scrollbar(self, orient="vertical", command=self.tree.yview)
+        hsb = ttk.Scrollbar(self, orient="horizontal", command=self.tree.xview)
+        self.tree.configure(yscrollcommand=self.on_scroll, xscrollcommand=hsb.set)
+
+        self.tree.grid(row=0, column=0, sticky="nsew")
+        self.vsb.grid(row=0, column=1, sticky="ns")
+        hsb.grid(row=1, column=0, sticky="ew")
+        self.status = ttk.Label(self, text="")
+        self.status.grid(row=2, column=0, sticky="w")
+
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        self.load(forward=True)
+
+    def on_scroll(self, first, last):
+        self.vsb.set(first, last)
+        if self.loading:
+            return
+        if self.stale and self.at_start and float(first) == 0:
+            self.refresh()
+            return
+        if float(last) > 0.9 and not self.at_end:
+            self.load(forward=True)
+        elif float(first) < 0.1 and not self.at_start:
+            self.load(forward=False)
+
+    def load(self, forward):
+        items = self.tree.get_children()
+        if forward:
+            key = self.keys[items[-1]] if items else None
+        else:
+            key = self.keys[items[0]]
+        self.loading = True
+        if self.executor is None:
+            self.loaded(self.source.page(key, forward, self.page_size), forward)
+            return
+        self.status.config(text="Loading...")
+        self.executor.submit(self.source.page, key, forward, self.page_size,
+                             on_done=lambda rows: self.loaded(rows, forward),
+                             on_error=self.load_failed, owner=self)
+
+    def loaded(self, rows, forward):
+        self.status.config(text="")
+        try:
+            self.show_page(rows, forward)
+        finally:
+            self.loading = False
+
+    def load_failed(self, exc):
+        self.loading = False
+        self.status.config(text=f"Could not load records: {exc}")
+
+    def refresh(self):
+        """Re-read the first page after a change and patch just the rows that
+        differ. Deferred until the user scrolls back to the top."""
+        if self.loading or not self.at_start:
+            self.stale = True
+            self.status.config(text="Records changed; scroll to the top to update")
+            return
+        self.stale = False
+        self.loading = True
+        if self.executor is None:
+            self.patched(self.source.page(None, True, self.page_size))
+            return
+        self.executor.submit(self.source.page, None, True, self.page_size,
+                             on_done=self.patched, on_error=self.load_failed, owner=self)
+
+    def patched(self, rows):
+        self.loading = False
+        self.status.config(text="")
+        by_key = {key: item for item, key in self.keys.items()}
+        for position, (key, values) in enumerate(rows):
+            item = by_key.get(key)
+            if item is None:
+                self.keys[self.tree.insert("", position, values=values)] = key
+                continue
+            if self.tree.index(item) != position:
+                self.tree.move(item, "", position)
+            if tuple(map(str, self.tree.item(item, "values"))) != tuple(map(str, values)):
+                self.tree.item(item, values=values)
+        if len(rows) < self.page_size:
+            # the whole result fits on one page: anything else is gone
+            keys = {key for key, _ in rows}
+            stale = [item for item in self.tree.get_children() if self.keys[item] not in keys]
+            for item in stale:
+                del self.keys[item]
+            if stale:
+                self.tree.delete(*stale)
+            self.at_end = True
+        self.trim(from_top=False)
+
+    def show_page(self, rows, forward):
+        # the top visible row, to scroll back to once rows are added and dropped
+        items = self.tree.get_children()
+        anchor = items[min(int(self.tree.yview()[0] * len(items)), len(items) - 1)] if items else None
+        if forward:
+            for key, values in rows:
+                self.keys[self.tree.insert("", "end", values=values)] = key
+            self.at_end = len(rows) < self.page_size
+        else:
+            for key, values in reversed(rows):
+                self.keys[self.tree.insert("", 0, values=values)] = key
+            self.at_start = len(rows) < self.page_size
+        self.trim(from_top=forward)
+
+        if anchor and self.tree.exists(anchor):
+            items = self.tree.get_children()
+            self.tree.yview_moveto(self.tree.index(anchor) / max(len(items), 1))
+
+    def trim(self, from_top):
+        items = self.tree.get_children()
+        extra = len(items) - self.max_rows
+        if extra <= 0:
+            return
+        dropped = items[:extra] if from_top else items[-extra:]
+        for item in dropped:
+            del self.keys[item]
+        self.tree.delete(*dropped)
+        if from_top:
+            self.at_start = False
+        else:
+            self.at_end = False
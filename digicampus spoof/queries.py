@@ -0,0 +1,106 @@
+"""SQL issued by the login page and dashboards, kept in one place so the
+migration plan check and the tools can run exactly what the UI runs."""
+
+# by the unique email index; the password hash is checked in auth.py
+LOGIN = "SELECT id, name, email, role, password FROM users WHERE email = %s"
+
+SIGNUP = "INSERT INTO users (name, email, password, role) VALUES (%s, %s, %s, 'student')"
+
+STUDENT_STATS = """
+SELECT COUNT(*), COUNT(CASE WHEN status = 'present' THEN 1 END)
+FROM attendance WHERE student_id = %s
+"""
+
+STUDENT_SUMMARY = "SELECT total, present FROM attendance_summary WHERE student_id = %s"
+
+# Keyset-paged record views: displayed columns, then the (date, student_id) key.
+STUDENT_RECORDS_SELECT = "SELECT a.date, a.status, a.date, a.student_id FROM attendance a"
+
+STUDENT_RECORDS_CONDITION = "a.student_id = %s"
+
+STUDENT_TODAY = "SELECT status FROM attendance WHERE student_id = %s AND date = %s"
+
+ROSTER = "SELECT id, name FROM users WHERE role = 'student'"
+
+ALL_RECORDS_SELECT = """
+SELECT u.name, a.date, a.status, a.date, a.student_id
+FROM attendance a
+JOIN users u ON a.student_id = u.id
+"""
+
+FIRST_PAGE = " ORDER BY a.date DESC, a.student_id DESC LIMIT %s"
+
+TODAYS_RECORDS = """
+SELECT u.name, a.status
+FROM attendance a
+JOIN users u ON a.student_id = u.id
+WHERE a.date = %s
+ORDER BY u.name, u.id
+"""
+
+# Every record in a date range, for CSV export; walks idx_attendance_date_student.
+EXPORT_RECORDS = """
+SELECT a.student_id, u.name, a.date, a.status
+FROM attendance a
+JOIN users u ON a.student_id = u.id
+WHERE a.date BETWEEN %s AND %s
+ORDER BY a.date, a.student_id
+"""
+
+EXPORT_COUNT = "SELECT COUNT(*) FROM attendance WHERE date BETWEEN %s AND %s"
+
+# "* 1.0" keeps the division fractional on SQLite; MySQL still rounds the
+# quotient to 4 places first, exactly as a plain "/" does.
+REPORT = """
+SELECT u.name,
+       COUNT(CASE WHEN a.status = 'present' THEN 1 END) as present,
+       COUNT(CASE WHEN a.status = 'absent' THEN 1 END) as absent,
+       COUNT(*) as total,
+       ROUND(COUNT(CASE WHEN a.status = 'present' THEN 1 END) / (COUNT(*) * 1.0) * 100, 2) as percentage
+FROM attendance a
+JOIN users u ON a.student_id = u.id
+WHERE a.date BETWEEN %s AND %s
+GROUP BY u.name
+ORDER BY percentage DESC, u.name
+"""
+
+# Same report, reading whole months from attendance_monthly and only the
+# edge days before/after them from attendance.
+REPORT_ROLLUP = """
+SELECT u.name,
+       SUM(r.present) as present,
+       SUM(r.absent) as absent,
+       SUM(r.total) as total,
+       ROUND(SUM(r.present) / (SUM(r.total) * 1.0) * 100, 2) as percentage
+FROM (
+    SELECT student_id, present, absent, total
+    FROM attendance_monthly
+    WHERE month BETWEEN %s AND %s
+    UNION ALL
+    SELECT student_id, status = 'present', status = 'absent', 1
+    FROM attendance
+    WHERE date BETWEEN %s AND %s OR date BETWEEN %s AND %s
+) r
+JOIN users u ON r.student_id = u.id
+GROUP BY u.name
+ORDER BY percentage DESC, u.name
+"""
+
+
+def dashboard_queries(student_id=1, day="2024-01-01", from_date="2024-01-01", to_date="2024-12-31"):
+    """Every read path of the app as name -> (sql, sample params)."""
+    return {
+        'login': (LOGIN, ("someone@example.com",)),
+        'student.stats': (STUDENT_STATS, (student_id,)),
+        'student.summary': (STUDENT_SUMMARY, (student_id,)),
+        'student.records': (STUDENT_RECORDS_SELECT + " WHERE " + STUDENT_RECORDS_CONDITION + FIRST_PAGE,
+                            (student_id, 200)),
+        'student.today': (STUDENT_TODAY, (student_id, day)),
+        'teacher.roster': (ROSTER, ()),
+        'teacher.all_records': (ALL_RECORDS_SELECT + FIRST_PAGE, (200,)),
+        'teacher.todays_records': (TODAYS_RECORDS, (day,)),
+        'teacher.export': (EXPORT_RECORDS, (from_date, to_date)),
+        'teacher.report': (REPORT, (from_date, to_date)),
+        'teacher.report_rollup': (REPORT_ROLLUP, ("2024-02-01", "2024-11-01", "2024-01-15", "2024-01-31",
+                                                  "2024-12-01", "2024-12-15")),
+    }
@@ -0,0 +1,194 @@
+"""Student roster for marking attendance that scales to thousands of students.
+
+RosterModel keeps the roster and the teacher's choices in flat arrays;
+RosterView only creates widgets for the rows that fit on screen and
+re-points them at different students as the list scrolls or is filtered.
+"""
+import tkinter as tk
+from array import array
+from tkinter import ttk
+
+
+class RosterModel:
+    def __init__(self, students):
+        self.ids = array('i', (student[0] for student in students))
+        self.names = [student[1] for student in students]
+        self.search_names = [name.lower() for name in self.names]
+        self.checked = bytearray(len(self.ids))
+        self.absent = bytearray(len(self.ids))
+        self.visible = array('i', range(len(self.ids)))
+
+    def __len__(self):
+        return len(self.visible)
+
+    def add(self, students):
+        """Append students not already on the roster, keeping every choice made so far."""
+        known = set(self.ids)
+        added = 0
+        for student_id, name in students:
+            if student_id in known:
+                continue
+            known.add(student_id)
+            self.ids.append(student_id)
+            self.names.append(name)
+            self.search_names.append(name.lower())
+            self.checked.append(0)
+            self.absent.append(0)
+            added += 1
+        return added
+
+    def set_filter(self, text):
+        text = text.strip().lower()
+        if not text:
+            self.visible = array('i', range(len(self.ids)))
+        else:
+            self.visible = array('i', (i for i, name in enumerate(self.search_names) if text in name))
+
+    def status(self, row):
+        return "absent" if self.absent[row] else "present"
+
+    def marked_rows(self, date):
+        """(student_id, date, status) for every checked student, filtered out or not."""
+        return [(self.ids[row], date, self.status(row))
+                for row in range(len(self.ids)) if self.checked[row]]
+
+
+class _RowSlot:
+    def __init__(self, parent, view):
+        self.view = view
+        self.row = None
+        self.frame = ttk.Frame(parent, height=view.ROW_HEIGHT)
+        self.checked = tk.IntVar()
+        self.status = tk.StringVar(value="present")
+
+        self.check = ttk.Checkbutton(self.frame, variable=self.checked, command=self.on_check)
+        self.check.pack(side="left")
+        present = ttk.Radiobutton(self.frame, text="Present", variable=self.status, value="present",
+                                  command=self.on_status)
+        present.pack(side="left", padx=(10, 5))
+        absent = ttk.Radiobutton(self.frame, text="Absent", variable=self.status, value="absent",
+                                 command=self.on_status)
+        absent.pack(side="left")
+        for widget in (self.frame, self.check, present, absent):
+            view.scroll_with_wheel(widget)
+
+    def show(self, model, row, position):
+        self.row = row
+        self.check.config(text=model.names[row])
+        self.checked.set(model.checked[row])
+        self.status.set(model.status(row))
+        self.frame.grid(row=position, column=0, sticky="ew", pady=2)
+
+    def hide(self):
+        self.row = None
+        self.frame.grid_remove()
+
+    def on_check(self):
+        if self.row is not None:
+            self.view.model.checked[self.row] = self.checked.get()
+
+    def on_status(self):
+        if self.row is not None:
+            self.view.model.absent[self.row] = self.status.get() == "absent"
+
+
+class RosterView(ttk.Frame):
+    ROW_HEIGHT = 30
+    WHEEL_ROWS = 3  # rows per wheel notch
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.model = RosterModel([])
+        self.slots = []
+        self.top = 0
+
+        search_frame = ttk.Frame(self)
+        search_frame.pack(fill="x", pady=(0, 5))
+        ttk.Label(search_frame, text="Search:").pack(side="left")
+        self.search_var = tk.StringVar()
+        self.search_var.trace_add("write", lambda *_: self.apply_filter())
+        ttk.Entry(search_frame, textvariable=self.search_var).pack(side="left", fill="x", expand=True, padx=5)
+        self.count_label = ttk.Label(search_frame, text="")
+        self.count_label.pack(side="right")
+
+        self.body = ttk.Frame(self)
+        self.body.pack(side="left", fill="both", expand=True)
+        self.body.grid_columnconfigure(0, weight=1)
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.body.bind("<Configure>", self.on_resize)
+        # one bindtag for the view, the body and every row widget, so the
+        # wheel scrolls wherever the pointer is over the list
+        self.wheel_tag = f"RosterWheel{id(self)}"
+        self.bind_class(self.wheel_tag, "<MouseWheel>", self.on_wheel)
+        self.bind_class(self.wheel_tag, "<Button-4>", lambda e: self.scroll_to(self.top - self.WHEEL_ROWS))
+        self.bind_class(self.wheel_tag, "<Button-5>", lambda e: self.scroll_to(self.top + self.WHEEL_ROWS))
+        for widget in (self.body, self):
+            self.scroll_with_wheel(widget)
+
+    def on_wheel(self, event):
+        # by sign only: Windows sends multiples of 120, macOS sends +-1
+        if event.delta:
+            self.scroll_to(self.top + (-1 if event.delta > 0 else 1) * self.WHEEL_ROWS)
+
+    def scroll_with_wheel(self, widget):
+        widget.bindtags((self.wheel_tag,) + widget.bindtags())
+
+    def destroy(self):
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.unbind_class(self.wheel_tag, sequence)
+        super().destroy()
+
+    def set_students(self, students):
+        self.model = RosterModel(students)
+        self.model.set_filter(self.search_var.get())
+        self.top = 0
+        self.refresh()
+
+    def add_students(self, students):
+        if self.model.add(students):
+            self.model.set_filter(self.search_var.get())
+            self.refresh()
+
+    def apply_filter(self):
+        self.model.set_filter(self.search_var.get())
+        self.top = 0
+        self.refresh()
+
+    def on_resize(self, event):
+        needed = max(1, event.height // self.ROW_HEIGHT)
+        while len(self.slots) < needed:
+            self.slots.append(_RowSlot(self.body, self))
+        self.refresh()
+
+    def on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self.scroll_to(int(float(amount) * len(self.model)))
+        elif unit == "pages":
+            self.scroll_to(self.top + int(amount) * max(1, self.page_rows()))
+        else:
+            self.scroll_to(self.top + int(amount))
+
+    def page_rows(self):
+        return max(1, self.body.winfo_height() // self.ROW_HEIGHT)
+
+    def scroll_to(self, top):
+        self.top = max(0, min(top, len(self.model) - self.page_rows()))
+        self.refresh()
+
+    def refresh(self):
+        total = len(self.model)
+        shown = min(len(self.slots), self.page_rows())
+        for position, slot in enumerate(self.slots):
+            index = self.top + position
+            if position < shown and index < total:
+                slot.show(self.model, self.model.visible[index], position)
+            else:
+                slot.hide()
+
+        if total:
+            self.scrollbar.set(self.top / total, min(1.0, (self.top + shown) / total))
+        else:
+            self.scrollbar.set(0, 1)
+        self.count_label.config(text=f"{total} of {len(self.model.ids)} students")
@@ -1,11 +1,15 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime
+import queries
+from attendance import student_stats, KeysetSource
+from paged_view import PagedTreeview
 
 class StudentDashboard:
-    def __init__(self, root, db, current_user, login_window):
+    def __init__(self, root, db, current_user, login_window, executor):
         self.root = root
         self.db = db
+        self.executor = executor
         self.current_user = current_user
         self.login_window = login_window
         
@@ -40,18 +44,37 @@ class StudentDashboard:
     def display_stats(self, parent):
         student_id = self.current_user['id']
         
-        total = self.db.fetch_one("SELECT COUNT(*) FROM attendance WHERE student_id = %s", (student_id,))[0]
-        present = self.db.fetch_one(
-            "SELECT COUNT(*) FROM attendance WHERE student_id = %s AND status = 'present'", 
-            (student_id,))[0]
-        
+        self.total_label = ttk.Label(parent, text="Total Classes Attended: ...")
+        self.total_label.pack(anchor="w", pady=5)
+        self.present_label = ttk.Label(parent, text="Present: ...")
+        self.present_label.pack(anchor="w", pady=5)
+        self.absent_label = ttk.Label(parent, text="Absent: ...")
+        self.absent_label.pack(anchor="w", pady=5)
+        self.percentage_label = ttk.Label(parent, text="Loading statistics...", font=("Arial", 12, "bold"))
+        self.percentage_label.pack(anchor="w", pady=10)
+        
+        self.stats = None
+        self.executor.submit(student_stats, self.db, student_id,
+                             on_done=self.show_stats, owner=parent, busy=self.root)
+        self.executor.subscribe(self.db.events, 'attendance', self.attendance_changed, parent)
+    
+    def attendance_changed(self, rows):
+        student_id = self.current_user['id']
+        # re-read rather than patch: a load still in flight, or one that ran
+        # after the commit but landed before this delta, may already count
+        # these rows (it's one summary-row lookup)
+        if rows is None or any(row_student == student_id for row_student, _, _ in rows):
+            self.executor.submit(student_stats, self.db, student_id, on_done=self.show_stats, owner=self.root)
+    
+    def show_stats(self, stats):
+        self.stats = stats
+        total, present = stats
         percentage = (present / total * 100) if total > 0 else 0
         
-        ttk.Label(parent, text=f"Total Classes Attended: {total}").pack(anchor="w", pady=5)
-        ttk.Label(parent, text=f"Present: {present}").pack(anchor="w", pady=5)
-        ttk.Label(parent, text=f"Absent: {total - present}").pack(anchor="w", pady=5)
-        ttk.Label(parent, text=f"Attendance Percentage: {percentage:.1f}%", 
-                 font=("Arial", 12, "bold")).pack(anchor="w", pady=10)
+        self.total_label.config(text=f"Total Classes Attended: {total}")
+        self.present_label.config(text=f"Present: {present}")
+        self.absent_label.config(text=f"Absent: {total - present}")
+        self.percentage_label.config(text=f"Attendance Percentage: {percentage:.1f}%")
     
     def view_attendance(self):
         top = tk.Toplevel(self.root)
@@ -60,39 +83,25 @@ class StudentDashboard:
         
         ttk.Label(top, text="My Attendance Records", style="Header.TLabel").pack(pady=10)
         
-        tree_frame = ttk.Frame(top)
-        tree_frame.pack(fill="both", expand=True, padx=20, pady=10)
-        
-        tree = ttk.Treeview(tree_frame, columns=("Date", "Status"), show="headings")
-        tree.heading("Date", text="Date")
-        tree.heading("Status", text="Status")
-        tree.column("Date", width=150, anchor="center")
-        tree.column("Status", width=100, anchor="center")
-        
-        vsb = ttk.Scrollbar(tree_frame, orient="vertical", command=tree.yview)
-        hsb = ttk.Scrollbar(tree_frame, orient="horizontal", command=tree.xview)
-        tree.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
+        records = PagedTreeview(
+            top, ("Date", "Status"),
+            KeysetSource(self.db, queries.STUDENT_RECORDS_SELECT,
+                         queries.STUDENT_RECORDS_CONDITION, (self.current_user['id'],)),
+            executor=self.executor)
+        records.pack(fill="both", expand=True, padx=20, pady=10)
         
-        tree.grid(row=0, column=0, sticky="nsew")
-        vsb.grid(row=0, column=1, sticky="ns")
-        hsb.grid(row=1, column=0, sticky="ew")
-        
-        tree_frame.grid_rowconfigure(0, weight=1)
-        tree_frame.grid_columnconfigure(0, weight=1)
-        
-        records = self.db.fetch_all(
-            "SELECT date, status FROM attendance WHERE student_id = %s ORDER BY date DESC",
-            (self.current_user['id'],))
-        
-        for record in records:
-            tree.insert("", "end", values=record)
+        student_id = self.current_user['id']
+        self.executor.subscribe(
+            self.db.events, 'attendance',
+            lambda rows: records.refresh() if rows is None or any(row[0] == student_id for row in rows) else None,
+            records)
     
     def view_todays_status(self):
         today = datetime.now().strftime("%Y-%m-%d")
-        result = self.db.fetch_one(
-            "SELECT status FROM attendance WHERE student_id = %s AND date = %s",
-            (self.current_user['id'], today))
-        
+        self.executor.submit(self.db.fetch_one, queries.STUDENT_TODAY, (self.current_user['id'], today),
+                             cached=True, on_done=self.show_todays_status, owner=self.root, busy=self.root)
+    
+    def show_todays_status(self, result):
         status = result[0] if result else "Not marked yet"
         messagebox.showinfo("Today's Status", f"Your attendance status for today:\n{status}")
     
@@ -0,0 +1,85 @@
+"""Synthetic users/attendance data and database setup for benchmarks."""
+import random
+from datetime import date, timedelta
+
+from attendance import rebuild_summaries, rebuild_rollups
+from auth import hash_password
+from backends import SQLiteBackend
+from database import Database
+
+INSERT_USER = "INSERT INTO users (name, email, password, role) VALUES (%s, %s, %s, %s)"
+
+INSERT_ROW = "INSERT INTO attendance (student_id, date, status) VALUES (%s, %s, %s)"
+
+
+def school_days(start, count):
+    """The first `count` weekdays from `start`."""
+    days = []
+    day = start
+    while len(days) < count:
+        if day.weekday() < 5:
+            days.append(day)
+        day += timedelta(days=1)
+    return days
+
+
+def _batched(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def populate(db, students, days, start=date(2024, 1, 1), present_rate=0.85, teachers=5,
+             seed=42, batch_size=10000):
+    """Create `students` students with one attendance row per school day.
+
+    Returns (student ids, list of days). Every user's password is
+    "password". Summaries and rollups are rebuilt once at the end rather
+    than maintained row by row.
+    """
+    rng = random.Random(seed)
+    # one hash shared by every synthetic user: hashing each would dominate setup
+    password = hash_password("password")
+    users = [(f"Student {i}", f"student{i}@example.com", password, "student") for i in range(students)]
+    users += [(f"Teacher {i}", f"teacher{i}@example.com", password, "teacher") for i in range(teachers)]
+    for batch in _batched(users, batch_size):
+        db.execute_many(INSERT_USER, batch)
+        db.commit()
+
+    student_ids = [row[0] for row in db.fetch_all(
+        "SELECT id FROM users WHERE role = 'student' AND email LIKE 'student%@example.com' ORDER BY id")]
+    day_list = school_days(start, days)
+
+    rows = ((student_id, day, "present" if rng.random() < present_rate else "absent")
+            for day in day_list for student_id in student_ids)
+    for batch in _batched(rows, batch_size):
+        db.execute_many(INSERT_ROW, batch)
+        db.commit()
+
+    rebuild_summaries(db)
+    rebuild_rollups(db)
+    return student_ids, day_list
+
+
+def add_database_arguments(parser, default_database="attendance_bench"):
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--user", default="root")
+    parser.add_argument("--password", default="your_password_here")
+    parser.add_argument("--database", default=default_database)
+    parser.add_argument("--sqlite", metavar="PATH", help="use this SQLite file instead of MySQL")
+
+
+def open_database(args, pool_size=1):
+    """Database for the parsed arguments, creating the MySQL schema if needed."""
+    if args.sqlite:
+        return Database(pool_size=pool_size, backend=SQLiteBackend(args.sqlite))
+    admin = Database(args.host, args.user, args.password, database=None, pool_size=1)
+    admin.execute_query(f"CREATE DATABASE IF NOT EXISTS {args.database}")
+    admin.commit()
+    admin.close()
+    return Database(args.host, args.user, args.password, args.database, pool_size=pool_size)
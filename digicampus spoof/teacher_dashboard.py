@@ -1,11 +1,20 @@
+import threading
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 from datetime import datetime
+from attendance import record_attendance, report_query, KeysetSource, OffsetSource
+from export import export_records, export_report, ExportCancelled
+from importer import import_csv, ImportCancelled
+import queries
+from paged_view import PagedTreeview
+from roster_view import RosterView
+from diagnostics import DiagnosticsWindow
 
 class TeacherDashboard:
-    def __init__(self, root, db, current_user, login_window):
+    def __init__(self, root, db, current_user, login_window, executor):
         self.root = root
         self.db = db
+        self.executor = executor
         self.current_user = current_user
         self.login_window = login_window
         
@@ -14,6 +23,7 @@ class TeacherDashboard:
         self.setup_ui()
         
         self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.root.bind("<Control-Shift-D>", lambda e: self.show_diagnostics())
     
     def setup_ui(self):
         header_frame = ttk.Frame(self.root)
@@ -37,111 +47,73 @@ class TeacherDashboard:
         ttk.Button(right_frame, text="View All Records", command=self.view_all_attendance, width=25).pack(pady=10)
         ttk.Button(right_frame, text="View Today's Records", command=self.view_todays_attendance, width=25).pack(pady=10)
         ttk.Button(right_frame, text="Generate Report", command=self.generate_report, width=25).pack(pady=10)
+        ttk.Button(right_frame, text="Export to CSV", command=self.export_dialog, width=25).pack(pady=10)
+        ttk.Button(right_frame, text="Import from CSV", command=self.import_dialog, width=25).pack(pady=10)
     
     def setup_attendance_marking(self, parent):
-        scroll_frame = ttk.Frame(parent)
-        scroll_frame.pack(fill="both", expand=True)
-        
-        canvas = tk.Canvas(scroll_frame)
-        scrollbar = ttk.Scrollbar(scroll_frame, orient="vertical", command=canvas.yview)
-        scrollable_frame = ttk.Frame(canvas)
-        
-        scrollable_frame.bind("<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-        
-        canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
-        
-        ttk.Label(scrollable_frame, text="Select Students", font=("Arial", 10, "bold")).pack(pady=(0, 10))
-        
-        students = self.db.fetch_all("SELECT id, name FROM users WHERE role = 'student'")
-        self.student_vars = []
-        self.status_vars = []
-        
-        for student in students:
-            frame = ttk.Frame(scrollable_frame)
-            frame.pack(fill="x", pady=2)
-            
-            var = tk.IntVar()
-            self.student_vars.append((student[0], var))
-            
-            ttk.Checkbutton(frame, text=student[1], variable=var).pack(side="left")
-            
-            status_var = tk.StringVar(value="present")
-            self.status_vars.append(status_var)
-            
-            ttk.Radiobutton(frame, text="Present", variable=status_var, value="present").pack(side="left", padx=(10, 5))
-            ttk.Radiobutton(frame, text="Absent", variable=status_var, value="absent").pack(side="left")
-        
-        ttk.Button(parent, text="Submit Attendance", command=self.submit_attendance_batch).pack(pady=10)
+        ttk.Label(parent, text="Select Students", font=("Arial", 10, "bold")).pack(pady=(0, 10))
+        self.roster_loading = ttk.Label(parent, text="Loading students...")
+        self.roster_loading.pack()
+        
+        self.roster = RosterView(parent)
+        
+        self.executor.submit(self.db.fetch_all, queries.ROSTER, cached=True,
+                             on_done=self.show_roster, owner=self.roster, busy=self.root)
+        self.executor.subscribe(self.db.events, 'users', self.users_changed, self.roster)
+        
+        ttk.Button(parent, text="Submit Attendance", command=self.submit_attendance_batch).pack(side="bottom", pady=10)
+        self.roster.pack(fill="both", expand=True)
+    
+    def show_roster(self, students):
+        self.roster_loading.destroy()
+        self.roster.set_students(students)
+    
+    def users_changed(self, users):
+        if users is None:
+            self.executor.submit(self.db.fetch_all, queries.ROSTER, cached=True,
+                                 on_done=self.roster.add_students, owner=self.roster)
+        else:
+            self.roster.add_students([(user_id, name) for user_id, name, role in users if role == "student"])
     
     def submit_attendance_batch(self):
         date = datetime.now().strftime("%Y-%m-%d")
         
-        for student_id, var in self.student_vars:
-            if var.get():
-                status = self.status_vars[self.student_vars.index((student_id, var))].get()
-                
-                query = "SELECT * FROM attendance WHERE student_id = %s AND date = %s"
-                if self.db.fetch_one(query, (student_id, date)):
-                    continue
-                
-                query = "INSERT INTO attendance (student_id, date, status) VALUES (%s, %s, %s)"
-                self.db.execute_query(query, (student_id, date, status))
+        rows = self.roster.model.marked_rows(date)
         
-        self.db.commit()
-        messagebox.showinfo("Success", "Attendance marked successfully")
+        self.executor.submit(record_attendance, self.db, rows,
+                             on_done=self.attendance_submitted, owner=self.root, busy=self.root)
+    
+    def attendance_submitted(self, counts):
+        inserted, skipped = counts
+        messagebox.showinfo("Success", f"Attendance marked successfully\n"
+                                       f"Marked: {inserted}  Already marked: {skipped}")
     
     def view_all_attendance(self):
-        self.show_attendance_records("All Attendance Records", """
-        SELECT u.name, a.date, a.status 
-        FROM attendance a
-        JOIN users u ON a.student_id = u.id
-        ORDER BY a.date DESC, u.name
-        """)
+        self.show_attendance_records("All Attendance Records", ("Student", "Date", "Status"),
+                                     KeysetSource(self.db, queries.ALL_RECORDS_SELECT))
     
     def view_todays_attendance(self):
         today = datetime.now().strftime("%Y-%m-%d")
-        self.show_attendance_records(f"Today's Attendance ({today})", """
-        SELECT u.name, a.status 
-        FROM attendance a
-        JOIN users u ON a.student_id = u.id
-        WHERE a.date = %s
-        ORDER BY u.name
-        """, (today,))
-    
-    def show_attendance_records(self, title, query, params=None):
+        self.show_attendance_records(f"Today's Attendance ({today})", ("Student", "Status"),
+                                     OffsetSource(self.db, queries.TODAYS_RECORDS, (today,), cached=True),
+                                     relevant=lambda rows: any(str(row[1]) == today for row in rows))
+    
+    def show_attendance_records(self, title, columns, source, relevant=None):
         top = tk.Toplevel(self.root)
         top.title(title)
         top.geometry("800x500")
         
         ttk.Label(top, text=title, style="Header.TLabel").pack(pady=10)
         
-        tree_frame = ttk.Frame(top)
-        tree_frame.pack(fill="both", expand=True, padx=20, pady=10)
-        
-        columns = ("Student", "Date", "Status") if "date" in query.lower() else ("Student", "Status")
-        tree = ttk.Treeview(tree_frame, columns=columns, show="headings")
-        
-        for col in columns:
-            tree.heading(col, text=col)
-            tree.column(col, width=200 if col == "Student" else 150, anchor="w" if col == "Student" else "center")
+        records = PagedTreeview(top, columns, source, executor=self.executor,
+                                widths={"Student": 200}, anchors={"Student": "w"})
+        records.pack(fill="both", expand=True, padx=20, pady=10)
         
-        vsb = ttk.Scrollbar(tree_frame, orient="vertical", command=tree.yview)
-        hsb = ttk.Scrollbar(tree_frame, orient="horizontal", command=tree.xview)
-        tree.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
+        def attendance_changed(rows):
+            if rows is None or relevant is None or relevant(rows):
+                records.refresh()
         
-        tree.grid(row=0, column=0, sticky="nsew")
-        vsb.grid(row=0, column=1, sticky="ns")
-        hsb.grid(row=1, column=0, sticky="ew")
-        
-        tree_frame.grid_rowconfigure(0, weight=1)
-        tree_frame.grid_columnconfigure(0, weight=1)
-        
-        records = self.db.fetch_all(query, params or ())
-        for record in records:
-            tree.insert("", "end", values=record)
+        self.executor.subscribe(self.db.events, 'attendance', attendance_changed, records)
     
     def generate_report(self):
         top = tk.Toplevel(self.root)
@@ -171,25 +143,164 @@ class TeacherDashboard:
             messagebox.showerror("Error", "Please enter both dates")
             return
         
-        query = """
-        SELECT u.name, 
-               COUNT(CASE WHEN a.status = 'present' THEN 1 END) as present,
-               COUNT(CASE WHEN a.status = 'absent' THEN 1 END) as absent,
-               COUNT(*) as total,
-               ROUND(COUNT(CASE WHEN a.status = 'present' THEN 1 END) / COUNT(*) * 100, 2) as percentage
-        FROM attendance a
-        JOIN users u ON a.student_id = u.id
-        WHERE a.date BETWEEN %s AND %s
-        GROUP BY u.name
-        ORDER BY percentage DESC
-        """
-        
         self.show_attendance_records(
             f"Attendance Report ({from_date} to {to_date})",
-            query,
-            (from_date, to_date)
+            ("Student", "Present", "Absent", "Total", "Percentage"),
+            OffsetSource(self.db, *report_query(from_date, to_date)),
+            relevant=lambda rows: any(from_date <= str(row[1]) <= to_date for row in rows)
         )
     
+    def export_dialog(self):
+        top = tk.Toplevel(self.root)
+        top.title("Export Attendance")
+        top.geometry("420x300")
+        
+        ttk.Label(top, text="Export to CSV", style="Header.TLabel").pack(pady=10)
+        
+        form = ttk.Frame(top)
+        form.pack(pady=5)
+        
+        ttk.Label(form, text="From:").grid(row=0, column=0, padx=5, pady=5, sticky="e")
+        from_date = ttk.Entry(form)
+        from_date.grid(row=0, column=1, padx=5, pady=5)
+        
+        ttk.Label(form, text="To:").grid(row=1, column=0, padx=5, pady=5, sticky="e")
+        to_date = ttk.Entry(form)
+        to_date.grid(row=1, column=1, padx=5, pady=5)
+        
+        ttk.Label(form, text="Export:").grid(row=2, column=0, padx=5, pady=5, sticky="e")
+        kind = ttk.Combobox(form, values=("All records", "Report"), state="readonly")
+        kind.current(0)
+        kind.grid(row=2, column=1, padx=5, pady=5)
+        
+        compress = tk.BooleanVar(value=False)
+        ttk.Checkbutton(form, text="Compress (.csv.gz)", variable=compress).grid(row=3, column=1, sticky="w")
+        
+        progress = ttk.Progressbar(top, length=360)
+        progress.pack(pady=(10, 0))
+        status = ttk.Label(top, text="")
+        status.pack()
+        
+        stop = threading.Event()
+        top.bind("<Destroy>", lambda e: stop.set() if e.widget is top else None, add="+")
+        
+        buttons = ttk.Frame(top)
+        buttons.pack(pady=10)
+        start = ttk.Button(buttons, text="Export...")
+        start.pack(side="left", padx=5)
+        ttk.Button(buttons, text="Cancel", command=stop.set).pack(side="left", padx=5)
+        
+        def show_progress(done, total):
+            if total:
+                progress.configure(mode="determinate", maximum=total, value=done)
+                status.config(text=f"{done:,} of {total:,} rows")
+            else:
+                progress.configure(mode="indeterminate")
+                progress.step()
+                status.config(text=f"{done:,} rows")
+        
+        def finished(count, path):
+            start.state(["!disabled"])
+            status.config(text=f"Exported {count:,} rows to {path}")
+        
+        def failed(exc):
+            start.state(["!disabled"])
+            if isinstance(exc, ExportCancelled):
+                status.config(text=str(exc))
+            else:
+                messagebox.showerror("Export Failed", str(exc), parent=top)
+        
+        def run():
+            if not from_date.get() or not to_date.get():
+                messagebox.showerror("Error", "Please enter both dates", parent=top)
+                return
+            gz = compress.get()
+            path = filedialog.asksaveasfilename(
+                parent=top, defaultextension=".csv.gz" if gz else ".csv",
+                initialfile=f"attendance_{from_date.get()}_{to_date.get()}.csv" + (".gz" if gz else ""),
+                filetypes=[("Compressed CSV", "*.csv.gz")] if gz else [("CSV", "*.csv")])
+            if not path:
+                return
+            stop.clear()
+            start.state(["disabled"])
+            status.config(text="Exporting...")
+            export = export_records if kind.current() == 0 else export_report
+            self.executor.submit(export, self.db, path, from_date.get(), to_date.get(), compress=gz,
+                                 progress=self.executor.reporter(show_progress, owner=top), stop=stop.is_set,
+                                 on_done=lambda count: finished(count, path), on_error=failed, owner=top)
+        
+        start.configure(command=run)
+    
+    def import_dialog(self):
+        top = tk.Toplevel(self.root)
+        top.title("Import Attendance")
+        top.geometry("480x380")
+        
+        ttk.Label(top, text="Import from CSV", style="Header.TLabel").pack(pady=10)
+        ttk.Label(top, text="Columns: student_id, date (YYYY-MM-DD), status (present/absent)").pack()
+        
+        form = ttk.Frame(top)
+        form.pack(pady=5)
+        ttk.Label(form, text="Rows per batch:").grid(row=0, column=0, padx=5, pady=5)
+        batch_size = ttk.Spinbox(form, from_=100, to=50000, increment=100, width=8)
+        batch_size.set(1000)
+        batch_size.grid(row=0, column=1, padx=5, pady=5)
+        
+        status = ttk.Label(top, text="")
+        status.pack(pady=5)
+        rejects = tk.Listbox(top, height=8)
+        rejects.pack(fill="both", expand=True, padx=20)
+        
+        stop = threading.Event()
+        top.bind("<Destroy>", lambda e: stop.set() if e.widget is top else None, add="+")
+        
+        buttons = ttk.Frame(top)
+        buttons.pack(pady=10)
+        start = ttk.Button(buttons, text="Choose File...")
+        start.pack(side="left", padx=5)
+        ttk.Button(buttons, text="Cancel", command=stop.set).pack(side="left", padx=5)
+        
+        def show_stats(stats, done=False):
+            status.config(text=f"{'Imported' if done else 'Importing'}: {stats['rows']:,} rows, "
+                               f"{stats['rows_per_sec']:,.0f} rows/s\n"
+                               f"Inserted {stats['inserted']:,}  Duplicates skipped {stats['duplicates']:,}  "
+                               f"Rejected {stats['rejected']:,}")
+            rejects.delete(0, "end")
+            for line, reason in stats['rejects']:
+                rejects.insert("end", f"line {line}: {reason}")
+        
+        def finished(stats):
+            start.state(["!disabled"])
+            show_stats(stats, done=True)
+        
+        def failed(exc):
+            start.state(["!disabled"])
+            if isinstance(exc, ImportCancelled):
+                status.config(text=str(exc))
+            else:
+                messagebox.showerror("Import Failed", str(exc), parent=top)
+        
+        def run():
+            try:
+                size = int(batch_size.get())
+            except ValueError:
+                messagebox.showerror("Error", "Rows per batch must be a number", parent=top)
+                return
+            path = filedialog.askopenfilename(parent=top, filetypes=[("CSV", "*.csv *.csv.gz"), ("All files", "*")])
+            if not path:
+                return
+            stop.clear()
+            start.state(["disabled"])
+            status.config(text="Importing...")
+            self.executor.submit(import_csv, self.db, path, batch_size=max(1, size),
+                                 progress=self.executor.reporter(show_stats, owner=top), stop=stop.is_set,
+                                 on_done=finished, on_error=failed, owner=top, busy=top)
+        
+        start.configure(command=run)
+    
+    def show_diagnostics(self):
+        DiagnosticsWindow(self.root, self.db)
+    
     def logout(self):
         self.root.destroy()
         self.login_window.deiconify()
@@ -0,0 +1,51 @@
+from backends import SQLiteBackend
+from database import Database
+from events import ChangePoller
+from migrations import migrate
+
+
+class InlineExecutor:
+    """QueryExecutor stand-in: runs work inline and keeps after() callbacks."""
+
+    def __init__(self):
+        self.root = self
+        self.scheduled = []
+
+    def after(self, ms, fn):
+        self.scheduled.append(fn)
+
+    def submit(self, fn, *args, on_done=None, on_error=None, **kwargs):
+        try:
+            result = fn(*args)
+        except Exception as exc:
+            on_error(exc)
+        else:
+            on_done(result)
+
+
+def test_poller_publishes_inserts_from_another_connection(tmp_path):
+    path = str(tmp_path / "attendance.db")
+    db = Database(pool_size=1, backend=SQLiteBackend(path))
+    other = Database(pool_size=1, backend=SQLiteBackend(path))  # another app instance
+    migrate(db)
+    with other.transaction():
+        other.execute_query("INSERT INTO users (name, email, password) VALUES ('Ada', 'ada@example.com', 'x')")
+
+    published = []
+    db.events.subscribe('attendance', published.append)
+    executor = InlineExecutor()
+    poller = ChangePoller(db, executor, tables=("attendance",))
+    poller.start()
+    executor.scheduled.pop()()  # first poll only records the starting point
+    assert published == []
+
+    with other.transaction():
+        other.execute_query("INSERT INTO attendance (student_id, date, status) VALUES (1, '2024-01-02', 'present')")
+    executor.scheduled.pop()()
+    assert published == [None]
+
+    executor.scheduled.pop()()  # nothing new
+    assert published == [None]
+    poller.stop()
+    db.close()
+    other.close()